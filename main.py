@@ -1,15 +1,42 @@
 from fastapi import FastAPI
-from src.routers import router
+from fastapi.responses import ORJSONResponse
+from src.core.admission import UploadAdmissionMiddleware
+from src.core.db.query_stats import QueryStatsMiddleware
+from src.core.events import UploadProgressMiddleware
+from src.core.lifespan import lifespan
+from src.core.profiling import ProfilingMiddleware
+from src.routers import health, router
+from src.service.audio import FileValidator
+from src.settings import settings
 
 
 app = FastAPI(
     title="Yandex-auth uploader FastAPI",
     description="API для загрузки и удаления изображений",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 app.include_router(router)
+app.include_router(health, tags=["Health"])
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(
+    UploadProgressMiddleware,
+    paths={"/api/user/upload-audio/"},
+    prefix="/api/uploads/",
+)
+app.add_middleware(
+    UploadAdmissionMiddleware,
+    paths={"/api/user/upload-audio/"},
+    max_size=FileValidator.MAX_FILE_SIZE,
+)
+
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    from src.core.server import get_server_options
+
+    uvicorn.run("main:app", **get_server_options())
@@ -0,0 +1,144 @@
+"""Move existing audio files into the hash-sharded media layout.
+
+The migration is online and resumable. For each batch of rows the file is
+hard-linked (or copied across devices) to its sharded path, the batch of
+`AudioInfo.path` updates is committed, and only then the old paths are
+removed, so readers always find the file under the path stored in the
+database. Rows that already point to their sharded path are skipped, so
+the command can be stopped and restarted at any time. Every database
+shard is migrated in turn.
+
+Usage:
+    python -m src.commands.migrate_media_layout --batch-size 500 --pause 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+
+from sqlalchemy import bindparam, select, update
+
+from src.core.db.database import engine
+from src.core.db.shards import shard_router
+from src.models import AudioInfo
+from src.service.audio.file_storage import sharded_path
+from src.settings import settings
+
+
+def _link(old_path: str, new_path: str) -> None:
+    """Make the file available under its new path.
+
+    Args:
+        old_path (str): Current file path
+        new_path (str): Sharded file path
+    """
+    os.makedirs(os.path.dirname(new_path), exist_ok=True)
+    if os.path.exists(new_path):
+        if os.path.samefile(old_path, new_path):
+            return
+        os.remove(new_path)
+    try:
+        os.link(old_path, new_path)
+    except OSError:
+        shutil.copy2(old_path, new_path)
+
+
+async def migrate_shard(
+    shard: str, batch_size: int, pause: float, start_id: int = 0
+) -> tuple[int, int]:
+    """Migrate the audio files of one database shard to the sharded layout.
+
+    Args:
+        shard (str): Shard name
+        batch_size (int): Number of rows processed per transaction
+        pause (float): Seconds to sleep between batches
+        start_id (int, optional): Continue after this audio id. Defaults to 0.
+
+    Returns:
+        tuple[int, int]: Numbers of moved files and files not found on disk
+    """
+    table = AudioInfo.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"), table.c.path == bindparam("b_old"))
+        .values(path=bindparam("b_new"))
+    )
+    last_id = start_id
+    moved = missing = 0
+
+    while True:
+        async with shard_router.session(shard) as session:
+            result = await session.execute(
+                select(AudioInfo.id, AudioInfo.filename, AudioInfo.path)
+                .where(AudioInfo.id > last_id)
+                .order_by(AudioInfo.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            updates = []
+            for row in rows:
+                new_path = sharded_path(
+                    settings.MEDIA_DIR, row.filename, settings.MEDIA_SHARD_DEPTH
+                )
+                if row.path == new_path:
+                    continue
+                if not os.path.exists(row.path):
+                    missing += 1
+                    continue
+                _link(row.path, new_path)
+                updates.append({"b_id": row.id, "b_old": row.path, "b_new": new_path})
+
+            if updates:
+                await session.execute(stmt, updates)
+                await session.commit()
+
+        for item in updates:
+            if os.path.exists(item["b_old"]):
+                os.remove(item["b_old"])
+        moved += len(updates)
+        print(
+            f"Shard {shard}: processed up to id {last_id}: "
+            f"moved {moved}, missing {missing}"
+        )
+
+        if pause:
+            await asyncio.sleep(pause)
+
+    return moved, missing
+
+
+async def migrate(batch_size: int, pause: float, start_id: int = 0) -> None:
+    """Migrate the audio files of every shard to the sharded layout.
+
+    Args:
+        batch_size (int): Number of rows processed per transaction
+        pause (float): Seconds to sleep between batches
+        start_id (int, optional): Continue after this audio id. Defaults to 0.
+    """
+    moved = missing = 0
+    try:
+        for shard in shard_router.names:
+            shard_moved, shard_missing = await migrate_shard(
+                shard, batch_size, pause, start_id
+            )
+            moved += shard_moved
+            missing += shard_missing
+    finally:
+        await shard_router.dispose()
+        await engine.dispose()
+    print(f"Done: moved {moved} files, {missing} files not found on disk")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.1)
+    parser.add_argument("--start-id", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.batch_size, args.pause, args.start_id))
@@ -0,0 +1,306 @@
+"""Move the audio data of a user to another database shard.
+
+The move is online and resumable. Writes to the user's audio are rejected
+with 503 while it runs, reads keep working:
+
+1. The user is marked as moving and the command waits until every process
+   has seen the mark (SHARD_MAP_CACHE_SECONDS).
+2. Audio records and fingerprints are copied to the target shard in
+   batches; a restarted copy continues after the last copied record.
+3. The shard map is switched to the target shard, the command waits
+   again, then the copies left in the source shard are deleted and the
+   user becomes writable.
+
+Files stay where they are, only database rows are moved.
+
+Usage:
+    python -m src.commands.move_user_shard 42 eu2
+    python -m src.commands.move_user_shard --init eu2
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.core.db.database import async_session, engine
+from src.core.db.shards import DEFAULT_SHARD, shard_router
+from src.models import AudioFingerprint, AudioFingerprintHash, AudioInfo, UserShard
+from src.settings import settings
+
+SHARD_TABLES = (AudioInfo, AudioFingerprint, AudioFingerprintHash)
+
+
+async def init_shard(shard: str) -> None:
+    """Create the audio tables in a shard database.
+
+    Foreign keys to the user table are left out, users are stored
+    in the default database only.
+
+    Args:
+        shard (str): Shard name
+    """
+    async with shard_router.get_engine(shard).begin() as conn:
+        for model in SHARD_TABLES:
+            table = model.__table__
+            foreign_keys = [
+                fk for fk in table.foreign_key_constraints if fk.referred_table.name != "user"
+            ]
+            await conn.execute(
+                CreateTable(
+                    table, include_foreign_key_constraints=foreign_keys, if_not_exists=True
+                )
+            )
+            for index in table.indexes:
+                await conn.execute(CreateIndex(index, if_not_exists=True))
+    print(f"Created audio tables in shard {shard}")
+
+
+async def _upsert(session: AsyncSession, model, rows: list[dict], key: str) -> None:
+    """Insert rows, overwriting rows with the same key.
+
+    Args:
+        session (AsyncSession): Session to the target shard
+        model: SQLAlchemy model
+        rows (list[dict]): Column values
+        key (str): Primary key column
+    """
+    stmt = pg_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[key],
+        set_={name: stmt.excluded[name] for name in rows[0] if name != key},
+    )
+    await session.execute(stmt)
+
+
+async def copy_audio(user_id: int, source: str, target: str) -> None:
+    """Copy the audio records and fingerprints of a user between shards.
+
+    Args:
+        user_id (int): ID of the user
+        source (str): Shard to copy from
+        target (str): Shard to copy to
+    """
+    batch_size = settings.SHARD_MOVE_BATCH_SIZE
+    async with shard_router.session(target) as session:
+        last_id = (
+            await session.execute(
+                select(func.coalesce(func.max(AudioInfo.id), 0)).where(
+                    AudioInfo.user_id == user_id
+                )
+            )
+        ).scalar_one()
+
+    copied = 0
+    while True:
+        async with shard_router.session(source) as session:
+            result = await session.execute(
+                select(AudioInfo.__table__)
+                .where(AudioInfo.user_id == user_id, AudioInfo.id > last_id)
+                .order_by(AudioInfo.id)
+                .limit(batch_size)
+            )
+            rows = [dict(row) for row in result.mappings().all()]
+        if not rows:
+            break
+        async with shard_router.session(target) as session:
+            await _upsert(session, AudioInfo, rows, "id")
+            await session.commit()
+        last_id = rows[-1]["id"]
+        copied += len(rows)
+        print(f"Copied audio records up to id {last_id}: {copied}")
+
+    await copy_fingerprints(user_id, source, target)
+
+
+async def copy_fingerprints(user_id: int, source: str, target: str) -> None:
+    """Copy the fingerprints of a user's audio between shards.
+
+    Fingerprints are copied for records present in the target shard.
+    The lookup hashes of the user in the target shard are rebuilt.
+
+    Args:
+        user_id (int): ID of the user
+        source (str): Shard to copy from
+        target (str): Shard to copy to
+    """
+    batch_size = settings.SHARD_MOVE_BATCH_SIZE
+    hash_columns = [
+        column
+        for column in AudioFingerprintHash.__table__.columns
+        if column.name != "id"
+    ]
+    async with shard_router.session(target) as session:
+        audio_ids = set(
+            (
+                await session.execute(
+                    select(AudioInfo.id).where(AudioInfo.user_id == user_id)
+                )
+            ).scalars()
+        )
+        await session.execute(
+            delete(AudioFingerprintHash).where(AudioFingerprintHash.user_id == user_id)
+        )
+        await session.commit()
+
+    last_id = 0
+    while True:
+        async with shard_router.session(source) as session:
+            result = await session.execute(
+                select(AudioFingerprint.__table__)
+                .where(
+                    AudioFingerprint.user_id == user_id,
+                    AudioFingerprint.audio_id > last_id,
+                )
+                .order_by(AudioFingerprint.audio_id)
+                .limit(batch_size)
+            )
+            rows = [dict(row) for row in result.mappings().all()]
+            if not rows:
+                break
+            last_id = rows[-1]["audio_id"]
+            rows = [row for row in rows if row["audio_id"] in audio_ids]
+            hashes = []
+            if rows:
+                result = await session.execute(
+                    select(*hash_columns).where(
+                        AudioFingerprintHash.audio_id.in_(
+                            [row["audio_id"] for row in rows]
+                        )
+                    )
+                )
+                hashes = [dict(row) for row in result.mappings().all()]
+        if not rows:
+            continue
+        async with shard_router.session(target) as session:
+            await _upsert(session, AudioFingerprint, rows, "audio_id")
+            for start in range(0, len(hashes), batch_size):
+                await session.execute(
+                    pg_insert(AudioFingerprintHash).values(
+                        hashes[start : start + batch_size]
+                    )
+                )
+            await session.commit()
+        print(f"Copied fingerprints up to audio id {last_id}")
+
+
+async def delete_audio(user_id: int, shard: str) -> None:
+    """Delete the audio records of a user from a shard in batches.
+
+    Fingerprints are removed with their records by cascade.
+
+    Args:
+        user_id (int): ID of the user
+        shard (str): Shard to delete from
+    """
+    batch = (
+        select(AudioInfo.id)
+        .where(AudioInfo.user_id == user_id)
+        .limit(settings.SHARD_MOVE_BATCH_SIZE)
+    )
+    deleted = 0
+    while True:
+        async with shard_router.session(shard) as session:
+            result = await session.execute(
+                delete(AudioInfo).where(AudioInfo.id.in_(batch)).returning(AudioInfo.id)
+            )
+            count = len(result.all())
+            await session.commit()
+        if not count:
+            break
+        deleted += count
+        print(f"Deleted {deleted} audio records from shard {shard}")
+
+
+async def _set_entry(user_id: int, **values) -> None:
+    """Create or update the shard map row of a user.
+
+    Args:
+        user_id (int): ID of the user
+        **values: Column values
+    """
+    async with async_session() as session:
+        stmt = pg_insert(UserShard).values(user_id=user_id, **values)
+        await session.execute(
+            stmt.on_conflict_do_update(index_elements=["user_id"], set_=values)
+        )
+        await session.commit()
+    shard_router.invalidate(user_id)
+
+
+async def _wait_for_processes() -> None:
+    """Wait until every process has dropped its cached shard map rows."""
+    print(f"Waiting {settings.SHARD_MAP_CACHE_SECONDS}s for the shard map to refresh")
+    await asyncio.sleep(settings.SHARD_MAP_CACHE_SECONDS)
+
+
+async def move(user_id: int, target: str) -> None:
+    """Move the audio data of a user to another shard.
+
+    Args:
+        user_id (int): ID of the user
+        target (str): Target shard name
+
+    Raises:
+        SystemExit: If the target is unknown or another move of the user
+            is in progress
+    """
+    if target not in shard_router.names:
+        raise SystemExit(f"Unknown shard {target}, configure it in DATABASE_SHARDS")
+
+    async with async_session() as session:
+        entry = await session.get(UserShard, user_id)
+    source = entry.shard if entry else DEFAULT_SHARD
+
+    if entry is None or entry.moving_from is None:
+        if entry is not None and entry.moving_to not in (None, target):
+            raise SystemExit(f"User {user_id} is being moved to {entry.moving_to}")
+        if source == target:
+            print(f"User {user_id} is already in shard {target}")
+            return
+        if entry is None or entry.moving_to is None:
+            await _set_entry(user_id, shard=source, moving_to=target)
+            await _wait_for_processes()
+
+        await copy_audio(user_id, source, target)
+        await _set_entry(user_id, shard=target, moving_to=None, moving_from=source)
+        await _wait_for_processes()
+    else:
+        source = entry.moving_from
+        target = entry.shard
+
+    await copy_fingerprints(user_id, source, target)
+    await delete_audio(user_id, source)
+    await _set_entry(user_id, shard=target, moving_from=None)
+    print(f"Moved user {user_id} from shard {source} to {target}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Run the command.
+
+    Args:
+        args (argparse.Namespace): Parsed command line arguments
+    """
+    try:
+        if args.init:
+            await init_shard(args.init)
+        else:
+            await move(args.user_id, args.target)
+    finally:
+        await shard_router.dispose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("user_id", type=int, nargs="?")
+    parser.add_argument("target", nargs="?")
+    parser.add_argument("--init", metavar="SHARD", help="create tables in a shard")
+    args = parser.parse_args()
+    if not args.init and (args.user_id is None or args.target is None):
+        parser.error("user_id and target are required")
+
+    asyncio.run(main(args))
@@ -0,0 +1,301 @@
+import math
+import time
+
+import jwt
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.metrics import metrics
+from src.settings import settings
+
+
+class TokenBucket:
+    """Token bucket rate limiter.
+
+    Attributes:
+        capacity (float): Maximum number of tokens
+        refill_rate (float): Tokens added per second
+        tokens (float): Currently available tokens
+    """
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        """Add tokens accumulated since the last update."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.refill_rate
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Get the time until `amount` tokens are available.
+
+        Args:
+            amount (float): Requested number of tokens
+
+        Returns:
+            float: Seconds to wait, 0 if the tokens are available now
+        """
+        self.refill()
+        missing = min(amount, self.capacity) - self.tokens
+        if missing <= 0:
+            return 0.0
+        if self.refill_rate <= 0:
+            return math.inf
+        return missing / self.refill_rate
+
+    def consume(self, amount: float) -> None:
+        """Take tokens from the bucket.
+
+        Args:
+            amount (float): Number of tokens to take
+        """
+        self.tokens -= min(amount, self.capacity)
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the bucket is full and can be dropped without losing state."""
+        self.refill()
+        return self.tokens >= self.capacity
+
+
+class AdmissionRejected(Exception):
+    """Raised when an upload cannot be admitted.
+
+    Attributes:
+        status_code (int): HTTP status code for the response
+        detail (str): Reason of the rejection
+        retry_after (int): Seconds after which the client may retry
+    """
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class UploadAdmissionController:
+    """Admission control for audio uploads.
+
+    Limits the number of concurrent uploads and the bytes in flight for the
+    worker and applies per-user token buckets on upload count and bytes.
+    State is per worker process.
+
+    Attributes:
+        max_concurrent (int): Maximum number of concurrent uploads
+        max_bytes_in_flight (int): Maximum total size of concurrent uploads
+        active (int): Number of uploads in progress
+        bytes_in_flight (int): Total size of uploads in progress
+        draining (bool): Whether the worker is shutting down and
+            rejects new uploads
+    """
+
+    MAX_TRACKED_USERS = 10_000
+
+    def __init__(self):
+        self.max_concurrent = settings.UPLOAD_MAX_CONCURRENT
+        self.max_bytes_in_flight = settings.UPLOAD_MAX_BYTES_IN_FLIGHT
+        self.active = 0
+        self.bytes_in_flight = 0
+        self.draining = False
+        self._count_buckets: dict[str, TokenBucket] = {}
+        self._bytes_buckets: dict[str, TokenBucket] = {}
+        self._admitted = 0
+        self._rejected_global = 0
+        self._rejected_user = 0
+        self._rejected_draining = 0
+
+    def start_draining(self) -> None:
+        """Reject new uploads, letting the ones in progress finish."""
+        self.draining = True
+
+    def _buckets(self, user_key: str) -> tuple[TokenBucket, TokenBucket]:
+        """Get or create the token buckets of a user.
+
+        Args:
+            user_key (str): Identifier of the user
+
+        Returns:
+            tuple[TokenBucket, TokenBucket]: Upload count and bytes buckets
+        """
+        if user_key not in self._count_buckets:
+            if len(self._count_buckets) >= self.MAX_TRACKED_USERS:
+                self._drop_idle_buckets()
+            self._count_buckets[user_key] = TokenBucket(
+                settings.UPLOAD_USER_BURST, settings.UPLOAD_USER_RATE_PER_SECOND
+            )
+            self._bytes_buckets[user_key] = TokenBucket(
+                settings.UPLOAD_USER_BYTES_BURST,
+                settings.UPLOAD_USER_BYTES_PER_SECOND,
+            )
+        return self._count_buckets[user_key], self._bytes_buckets[user_key]
+
+    def _drop_idle_buckets(self) -> None:
+        """Forget users whose buckets are full again."""
+        for user_key in list(self._count_buckets):
+            if (
+                self._count_buckets[user_key].is_full
+                and self._bytes_buckets[user_key].is_full
+            ):
+                del self._count_buckets[user_key]
+                del self._bytes_buckets[user_key]
+
+    def acquire(self, user_key: str, size: int) -> None:
+        """Admit an upload or reject it.
+
+        Args:
+            user_key (str): Identifier of the uploading user
+            size (int): Expected upload size in bytes
+
+        Raises:
+            AdmissionRejected:
+                503 - If the worker is shutting down or at its concurrency
+                    or bytes limit
+                429 - If the user exceeded their upload rate
+        """
+        if self.draining:
+            self._rejected_draining += 1
+            raise AdmissionRejected(
+                503,
+                "Server is shutting down, try again later",
+                settings.UPLOAD_RETRY_AFTER_SECONDS,
+            )
+        if self.active >= self.max_concurrent or (
+            self.active and self.bytes_in_flight + size > self.max_bytes_in_flight
+        ):
+            self._rejected_global += 1
+            raise AdmissionRejected(
+                503,
+                "Too many uploads in progress, try again later",
+                settings.UPLOAD_RETRY_AFTER_SECONDS,
+            )
+
+        count_bucket, bytes_bucket = self._buckets(user_key)
+        wait = max(count_bucket.wait_time(1), bytes_bucket.wait_time(size))
+        if wait > 0:
+            self._rejected_user += 1
+            raise AdmissionRejected(429, "Upload rate limit exceeded", wait)
+
+        count_bucket.consume(1)
+        bytes_bucket.consume(size)
+        self.active += 1
+        self.bytes_in_flight += size
+        self._admitted += 1
+
+    def release(self, size: int) -> None:
+        """Release the slot of a finished upload.
+
+        Args:
+            size (int): Size passed to acquire
+        """
+        self.active -= 1
+        self.bytes_in_flight -= size
+
+    def get_metrics(self) -> dict:
+        """Get admission metrics.
+
+        Returns:
+            dict: Current limits, usage and rejection counters
+        """
+        return {
+            "active": self.active,
+            "bytes_in_flight": self.bytes_in_flight,
+            "max_concurrent": self.max_concurrent,
+            "max_bytes_in_flight": self.max_bytes_in_flight,
+            "admitted": self._admitted,
+            "rejected_global": self._rejected_global,
+            "rejected_user": self._rejected_user,
+            "rejected_draining": self._rejected_draining,
+            "draining": self.draining,
+            "tracked_users": len(self._count_buckets),
+        }
+
+
+upload_admission = UploadAdmissionController()
+metrics.register("upload_admission", upload_admission.get_metrics)
+
+
+class UploadAdmissionMiddleware:
+    """ASGI middleware applying upload admission control.
+
+    Runs before the multipart body is read, so rejected uploads cost
+    neither memory nor disk. The upload size is taken from Content-Length
+    and the user from the access token subject, falling back to the
+    client address for anonymous requests.
+
+    Attributes:
+        paths (set[str]): Paths of upload endpoints
+    """
+
+    def __init__(self, app: ASGIApp, paths: set[str], max_size: int):
+        self.app = app
+        self.paths = paths
+        self.max_size = max_size
+        self.controller = upload_admission
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        try:
+            size = int(request.headers.get("content-length") or self.max_size)
+        except ValueError:
+            size = -1
+        if size < 0:
+            response = JSONResponse(
+                {"detail": "Invalid Content-Length header"}, status_code=400
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            self.controller.acquire(self._user_key(request), size)
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": e.detail},
+                status_code=e.status_code,
+                headers={"Retry-After": str(e.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(size)
+
+    @staticmethod
+    def _user_key(request: Request) -> str:
+        """Identify the uploading user without touching the database.
+
+        Args:
+            request (Request): Incoming request
+
+        Returns:
+            str: Token subject or client address
+        """
+        access_token = request.cookies.get("access_token")
+        if access_token:
+            try:
+                payload = jwt.decode(
+                    access_token.replace("Bearer ", ""),
+                    settings.ACCESS_SECRET_KEY,
+                    algorithms=[settings.ALGORITHM],
+                )
+                if payload.get("sub"):
+                    return f"user:{payload['sub']}"
+            except jwt.PyJWTError:
+                pass
+        return f"client:{request.client.host if request.client else 'unknown'}"
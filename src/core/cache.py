@@ -0,0 +1,221 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from src.core.metrics import metrics
+from src.settings import settings
+
+
+class BytesLRUCache:
+    """In-process LRU cache of byte strings bounded by total size.
+
+    Entries larger than `max_entry_bytes` are not stored, least recently
+    used entries are evicted once `max_bytes` would be exceeded.
+    """
+
+    def __init__(self, max_bytes: int, max_entry_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes (int): Total size of the stored values
+            max_entry_bytes (int, optional): Size limit of a single value.
+                Defaults to `max_bytes`.
+        """
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes or max_bytes, max_bytes)
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Get a value and mark it as recently used.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Optional[bytes]: Cached value or None
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def put(self, key: Hashable, value: bytes) -> bool:
+        """Store a value, evicting least recently used ones if needed.
+
+        Args:
+            key (Hashable): Cache key
+            value (bytes): Value to store
+
+        Returns:
+            bool: False if the value is too large to be cached
+        """
+        if len(value) > self.max_entry_bytes:
+            return False
+        self.pop(key)
+        while self._size + len(value) > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
+        self._entries[key] = value
+        self._size += len(value)
+        return True
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a value if it is cached.
+
+        Args:
+            key (Hashable): Cache key
+        """
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._size -= len(value)
+
+    def clear(self) -> None:
+        """Remove all values."""
+        self._entries.clear()
+        self._size = 0
+
+    def get_metrics(self) -> dict:
+        """Get cache metrics.
+
+        Returns:
+            dict: Size, usage and hit counters
+        """
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else None,
+            "evictions": self._evictions,
+        }
+
+
+class ListingCache:
+    """Cache of serialized audio listings with per-user versions.
+
+    Every user has a version counter that is part of the cache key.
+    Mutations of a user's audio call `invalidate`, which bumps the counter,
+    so entries cached before the change can no longer be found, and drops
+    them to free memory. Callers also pass the listing ETag computed from
+    the database, so changes made by other worker processes are never
+    served from a stale entry either.
+
+    Versions and key sets are kept for at most MAX_TRACKED_USERS users,
+    least recently used first out; the cached listings of a user are
+    dropped together with their version, so a restarted counter cannot
+    match an old entry.
+    """
+
+    MAX_TRACKED_USERS = 10_000
+
+    def __init__(self, max_bytes: int):
+        """Initialize the cache.
+
+        Args:
+            max_bytes (int): Total size of the cached listings
+        """
+        self._cache = BytesLRUCache(max_bytes)
+        self._versions: OrderedDict[int, int] = OrderedDict()
+        self._keys: OrderedDict[int, set[tuple]] = OrderedDict()
+
+    def _key(self, user_id: int, variant: Hashable) -> tuple:
+        """Build the cache key for the current version of a user's listing.
+
+        Args:
+            user_id (int): ID of the user
+            variant (Hashable): Listing parameters
+
+        Returns:
+            tuple: Cache key
+        """
+        return user_id, self._versions.get(user_id, 0), variant
+
+    def get(self, user_id: int, variant: Hashable) -> Optional[bytes]:
+        """Get a cached listing.
+
+        Args:
+            user_id (int): ID of the user
+            variant (Hashable): Listing parameters, e.g. filters and ETag
+
+        Returns:
+            Optional[bytes]: Serialized listing or None
+        """
+        return self._cache.get(self._key(user_id, variant))
+
+    def put(self, user_id: int, variant: Hashable, body: bytes) -> None:
+        """Cache a serialized listing.
+
+        Args:
+            user_id (int): ID of the user
+            variant (Hashable): Listing parameters, e.g. filters and ETag
+            body (bytes): Serialized listing
+        """
+        key = self._key(user_id, variant)
+        if self._cache.put(key, body):
+            keys = {
+                cached for cached in self._keys.get(user_id, ()) if cached in self._cache
+            }
+            keys.add(key)
+            self._keys[user_id] = keys
+            self._keys.move_to_end(user_id)
+            self._trim()
+
+    def invalidate(self, *user_ids: int) -> None:
+        """Invalidate the cached listings of users.
+
+        Args:
+            *user_ids (int): IDs of the users whose audio changed
+        """
+        for user_id in user_ids:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._versions.move_to_end(user_id)
+            self._drop_entries(user_id)
+        self._trim()
+
+    def _drop_entries(self, user_id: int) -> None:
+        """Remove the cached listings of a user.
+
+        Args:
+            user_id (int): ID of the user
+        """
+        for key in self._keys.pop(user_id, ()):
+            self._cache.pop(key)
+
+    def _trim(self) -> None:
+        """Forget the least recently used users beyond MAX_TRACKED_USERS."""
+        while len(self._keys) > self.MAX_TRACKED_USERS:
+            user_id, keys = self._keys.popitem(last=False)
+            self._versions.pop(user_id, None)
+            for key in keys:
+                self._cache.pop(key)
+        while len(self._versions) > self.MAX_TRACKED_USERS:
+            user_id, _ = self._versions.popitem(last=False)
+            self._drop_entries(user_id)
+
+    def clear(self) -> None:
+        """Invalidate all cached listings."""
+        self.invalidate(*self._keys)
+
+    def get_metrics(self) -> dict:
+        """Get cache metrics.
+
+        Returns:
+            dict: Size, usage and hit counters
+        """
+        return self._cache.get_metrics()
+
+
+listing_cache = ListingCache(settings.LISTING_CACHE_MAX_BYTES)
+metrics.register("listing_cache", listing_cache.get_metrics)
@@ -0,0 +1,83 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from values identifying a resource version.
+
+    Args:
+        *parts: Values that change whenever the representation changes
+
+    Returns:
+        str: Quoted ETag
+    """
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> dict[str, str]:
+    """Build ETag and Last-Modified headers.
+
+    Args:
+        etag (str): Quoted ETag
+        last_modified (datetime, optional): Naive UTC modification time
+
+    Returns:
+        dict[str, str]: Response headers
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Check conditional request headers against the current version.
+
+    If-None-Match takes precedence over If-Modified-Since.
+
+    Args:
+        request (Request): Incoming request
+        etag (str): Quoted ETag of the current version
+        last_modified (datetime, optional): Naive UTC modification time
+
+    Returns:
+        bool: True if the client's copy is up to date
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified <= since
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Build a 304 Not Modified response.
+
+    Args:
+        etag (str): Quoted ETag of the current version
+        last_modified (datetime, optional): Naive UTC modification time
+
+    Returns:
+        Response: Empty 304 response with validator headers
+    """
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
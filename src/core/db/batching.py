@@ -0,0 +1,204 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import insert
+
+from src.core.db.shards import DEFAULT_SHARD, shard_router
+from src.core.metrics import metrics
+from src.models import AudioInfo
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InsertBatcher:
+    """Group commit for concurrent inserts of one model.
+
+    Rows added within INSERT_BATCH_WINDOW_SECONDS of the first pending
+    row of a shard are written with one multi-row INSERT ... RETURNING
+    and one commit; a batch is written at once when it reaches
+    INSERT_BATCH_MAX_SIZE rows. If the batch fails, its rows are
+    inserted one by one, so every caller gets its own row or its own
+    error. Rows of callers cancelled before the write are skipped.
+
+    Attributes:
+        model: SQLAlchemy model of the inserted rows
+    """
+
+    def __init__(self, model):
+        """Initialize the batcher.
+
+        Args:
+            model: SQLAlchemy model of the inserted rows
+        """
+        self.model = model
+        self._pending: dict[tuple, list[tuple[dict, asyncio.Future]]] = defaultdict(
+            list
+        )
+        self._tasks: set[asyncio.Task] = set()
+        self._batches = 0
+        self._rows = 0
+        self._largest_batch = 0
+        self._fallbacks = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether inserts are batched."""
+        return settings.INSERT_BATCH_ENABLED
+
+    async def add(self, shard: str, values: dict):
+        """Insert a row as part of the next batch of its shard.
+
+        Args:
+            shard (str): Shard name
+            values (dict): Column values
+
+        Returns:
+            Created model instance
+
+        Raises:
+            Exception: The error of the row's INSERT
+        """
+        key = (shard, tuple(sorted(values)))
+        future = asyncio.get_running_loop().create_future()
+        pending = self._pending[key]
+        pending.append((values, future))
+        if len(pending) >= settings.INSERT_BATCH_MAX_SIZE:
+            del self._pending[key]
+            self._spawn(self._flush(key, pending))
+        elif len(pending) == 1:
+            self._spawn(self._flush_later(key, pending))
+        return await future
+
+    def _spawn(self, coro) -> None:
+        """Run a flush in the background, keeping a reference to it.
+
+        Args:
+            coro: Flush coroutine
+        """
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush_later(
+        self, key: tuple, pending: list[tuple[dict, asyncio.Future]]
+    ) -> None:
+        """Write a batch once the batch window has passed.
+
+        Does nothing if the batch was already written for reaching
+        INSERT_BATCH_MAX_SIZE.
+
+        Args:
+            key (tuple): Shard name and column names of the batch
+            pending (list[tuple[dict, asyncio.Future]]): Rows and their callers
+        """
+        await asyncio.sleep(settings.INSERT_BATCH_WINDOW_SECONDS)
+        if self._pending.get(key) is pending:
+            del self._pending[key]
+            await self._flush(key, pending)
+
+    async def _flush(
+        self, key: tuple, pending: list[tuple[dict, asyncio.Future]]
+    ) -> None:
+        """Write the rows of a batch.
+
+        Args:
+            key (tuple): Shard name and column names of the batch
+            pending (list[tuple[dict, asyncio.Future]]): Rows and their callers
+        """
+        batch = [item for item in pending if not item[1].done()]
+        if not batch:
+            return
+        shard = key[0]
+        if shard != DEFAULT_SHARD and "id" not in key[1]:
+            try:
+                ids = await shard_router.allocate_audio_ids(len(batch))
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            batch = [
+                ({**values, "id": audio_id}, future)
+                for (values, future), audio_id in zip(batch, ids)
+            ]
+
+        if len(batch) == 1:
+            await self._insert_one(shard, *batch[0])
+            return
+        try:
+            await self._insert_batch(shard, batch)
+        except Exception:
+            logger.warning(
+                "Batch insert of %s rows failed, inserting one by one", len(batch)
+            )
+            self._fallbacks += 1
+            for values, future in batch:
+                await self._insert_one(shard, values, future)
+
+    async def _insert_batch(
+        self, shard: str, batch: list[tuple[dict, asyncio.Future]]
+    ) -> None:
+        """Insert rows with one statement and one commit.
+
+        Args:
+            shard (str): Shard name
+            batch (list[tuple[dict, asyncio.Future]]): Rows and their callers
+        """
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        async with shard_router.session(shard) as session:
+            result = await session.execute(stmt, [values for values, _ in batch])
+            instances = result.scalars().all()
+            await session.commit()
+        for (_, future), instance in zip(batch, instances):
+            if not future.done():
+                future.set_result(instance)
+        self._batches += 1
+        self._rows += len(batch)
+        self._largest_batch = max(self._largest_batch, len(batch))
+
+    async def _insert_one(
+        self, shard: str, values: dict, future: asyncio.Future
+    ) -> None:
+        """Insert a single row and pass its result or error to the caller.
+
+        Args:
+            shard (str): Shard name
+            values (dict): Column values
+            future (asyncio.Future): Future of the caller
+        """
+        try:
+            async with shard_router.session(shard) as session:
+                result = await session.execute(
+                    insert(self.model).values(**values).returning(self.model)
+                )
+                instance = result.scalar_one()
+                await session.commit()
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(instance)
+        self._batches += 1
+        self._rows += 1
+
+    def get_metrics(self) -> dict:
+        """Get batching metrics.
+
+        Returns:
+            dict: Written batches and rows, the largest batch and the number
+                of failed batches retried row by row
+        """
+        return {
+            "enabled": self.enabled,
+            "batches": self._batches,
+            "rows": self._rows,
+            "largest_batch": self._largest_batch,
+            "fallbacks": self._fallbacks,
+        }
+
+
+audio_insert_batcher = InsertBatcher(AudioInfo)
+metrics.register("insert_batches", audio_insert_batcher.get_metrics)
@@ -1,19 +1,62 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, AsyncIterator
 
+from src.core.db.query_stats import install_query_hooks
+from src.core.db.sqlite import (
+    SQLiteSession,
+    install_pragmas,
+    is_sqlite,
+    sqlite_engine_options,
+    sqlite_writer,
+)
+from src.core.metrics import metrics
 from src.settings import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+
+def make_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the configured pool and query hooks.
+
+    SQLite engines get their own pool setup and connection pragmas.
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        AsyncEngine: Engine for the database
+    """
+    if is_sqlite(url):
+        options = sqlite_engine_options(url)
+    else:
+        options = {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+        }
+    new_engine = create_async_engine(
+        url, echo=settings.DB_ECHO, pool_pre_ping=True, **options
+    )
+    if is_sqlite(url):
+        install_pragmas(new_engine)
+    install_query_hooks(new_engine)
+    return new_engine
+
+
+engine = make_engine(settings.DATABASE_URL)
 
 async_session = sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=SQLiteSession if engine.dialect.name == "sqlite" else AsyncSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
 )
+if engine.dialect.name == "sqlite":
+    metrics.register("sqlite_writer", sqlite_writer.get_metrics)
 
 
 async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
@@ -34,3 +77,55 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
         yield db
     finally:
         await db.close()
+
+
+async def warm_up_pool(connections: int) -> None:
+    """Open database connections before the first request arrives.
+
+    Connections are checked out concurrently, so the pool keeps
+    all of them open once they are returned.
+
+    Args:
+        connections (int): Number of connections to open,
+            capped by DB_POOL_SIZE
+    """
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    count = min(connections, settings.DB_POOL_SIZE)
+    await asyncio.gather(*(ping() for _ in range(count)))
+
+
+@asynccontextmanager
+async def advisory_lock(key: int) -> AsyncIterator[bool]:
+    """Try to take a Postgres session-level advisory lock.
+
+    Used to let only one of several worker processes run a periodic job.
+    Other databases have no advisory locks, there the lock is always granted.
+    The connection runs in autocommit mode, so holding the lock does not
+    leave it idle in a transaction.
+
+    Args:
+        key (int): Lock identifier
+
+    Yields:
+        bool: True if the lock was acquired
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        acquired = (
+            await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key})
+        ).scalar()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": key}
+                )
@@ -0,0 +1,211 @@
+import heapq
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Per-request database query statistics.
+
+    Attributes:
+        count (int): Number of executed statements
+        total_time (float): Total time spent in the database, in seconds
+        statements (Counter): Number of executions per statement shape
+        slowest (list): Heap of the slowest statements as
+            (duration, statement, parameter shape) tuples
+    """
+
+    def __init__(self, keep_slowest: int = 5):
+        self.count = 0
+        self.total_time = 0.0
+        self.statements = Counter()
+        self.slowest = []
+        self._keep_slowest = keep_slowest
+
+    def record(self, statement: str, parameters_shape: str, duration: float) -> None:
+        """Record one executed statement.
+
+        Args:
+            statement (str): SQL statement text
+            parameters_shape (str): Shape of the bind parameters
+            duration (float): Execution time in seconds
+        """
+        self.count += 1
+        self.total_time += duration
+        self.statements[statement] += 1
+
+        item = (duration, statement, parameters_shape)
+        if len(self.slowest) < self._keep_slowest:
+            heapq.heappush(self.slowest, item)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Find statement shapes executed more than `threshold` times.
+
+        Args:
+            threshold (int): Maximum allowed number of executions
+
+        Returns:
+            dict[str, int]: Statement shapes and their execution counts
+        """
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count > threshold
+        }
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def get_query_stats() -> QueryStats | None:
+    """Get query statistics of the current request.
+
+    Returns:
+        QueryStats | None: Statistics or None outside of a request
+    """
+    return _current_stats.get()
+
+
+def _parameters_shape(parameters) -> str:
+    """Describe bind parameters by their types, without their values.
+
+    Args:
+        parameters: DBAPI parameters of a statement
+
+    Returns:
+        str: Parameter shape, e.g. "(int, str)" or "{'id': int}"
+    """
+    if isinstance(parameters, dict):
+        return repr({key: type(value).__name__ for key, value in parameters.items()})
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{_parameters_shape(parameters[0])} x {len(parameters)}"
+        return f"({', '.join(type(value).__name__ for value in parameters)})"
+    return type(parameters).__name__
+
+
+def _normalize(statement: str) -> str:
+    """Collapse whitespace so equal statements share one shape."""
+    return " ".join(statement.split())
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """Register cursor execute hooks collecting query statistics.
+
+    Statements slower than SLOW_QUERY_THRESHOLD_MS are logged as warnings.
+    Inside a request wrapped by QueryStatsMiddleware every statement is also
+    recorded into the request's QueryStats.
+
+    Args:
+        engine (AsyncEngine): Engine to instrument
+    """
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        if stats is None and duration < threshold:
+            return
+
+        statement = _normalize(statement)
+        parameters_shape = _parameters_shape(parameters)
+        if duration >= threshold:
+            logger.warning(
+                "Slow query (%.1f ms): %s parameters=%s",
+                duration * 1000,
+                statement,
+                parameters_shape,
+            )
+        if stats is not None:
+            stats.record(statement, parameters_shape, duration)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_start_time"):
+            conn.info["query_start_time"].pop()
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting database statistics for each request.
+
+    Logs statement shapes executed more than N_PLUS_ONE_THRESHOLD times
+    within one request. With DEBUG enabled, the query count and total
+    database time are added to the `X-DB-Query-Count` and `X-DB-Time-Ms`
+    response headers and the slowest statements are logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._debug = settings.DEBUG
+        self._repeat_threshold = settings.N_PLUS_ONE_THRESHOLD
+        self._keep_slowest = settings.SLOW_QUERY_LOG_TOP
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(keep_slowest=self._keep_slowest)
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message: Message) -> None:
+            if self._debug and message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_time * 1000:.1f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        """Log repeated statements and, in debug mode, the request summary.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+            stats (QueryStats): Collected statistics
+        """
+        request = f"{scope['method']} {scope['path']}"
+        for statement, count in stats.repeated(self._repeat_threshold).items():
+            logger.warning(
+                "Possible N+1 in %s: statement executed %d times: %s",
+                request,
+                count,
+                statement,
+            )
+
+        if self._debug and stats.count:
+            slowest = "; ".join(
+                f"{duration * 1000:.1f} ms {statement} parameters={shape}"
+                for duration, statement, shape in sorted(stats.slowest, reverse=True)
+            )
+            logger.info(
+                "%s: %d queries, %.1f ms in database, slowest: %s",
+                request,
+                stats.count,
+                stats.total_time * 1000,
+                slowest,
+            )
@@ -0,0 +1,266 @@
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import HTTPException
+from sqlalchemy import or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from src.core.db.database import async_session, engine, make_engine
+from src.core.metrics import metrics
+from src.models import UserShard
+from src.settings import settings
+
+DEFAULT_SHARD = "default"
+
+
+class ShardRouter:
+    """Routes per-user audio data to one of several databases.
+
+    The default shard is the main database from DATABASE_URL, which also
+    holds users, jobs and the shard map. DATABASE_SHARDS adds more
+    databases by name. Users without a shard map row live in the default
+    shard; new users are spread over SHARD_PLACEMENT by user id.
+
+    Shard map lookups are cached for SHARD_MAP_CACHE_SECONDS; the move
+    tool waits that long between its steps, so every process sees a
+    change before the next step starts.
+
+    Audio ids stay unique across shards: rows written to other shards
+    take their ids from the audio_info sequence of the default shard.
+
+    Attributes:
+        MAX_CACHED_USERS (int): Maximum number of cached shard map entries
+    """
+
+    MAX_CACHED_USERS = 10_000
+
+    def __init__(self):
+        """Create engines for the configured shards.
+
+        Raises:
+            RuntimeError: If shards are configured for a database
+                other than PostgreSQL
+        """
+        if settings.DATABASE_SHARDS and engine.dialect.name != "postgresql":
+            raise RuntimeError("DATABASE_SHARDS requires PostgreSQL databases")
+        self._engines: dict[str, AsyncEngine] = {DEFAULT_SHARD: engine}
+        self._sessions: dict[str, sessionmaker] = {DEFAULT_SHARD: async_session}
+        for name, url in settings.DATABASE_SHARDS.items():
+            shard_engine = make_engine(url)
+            self._engines[name] = shard_engine
+            self._sessions[name] = sessionmaker(
+                bind=shard_engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+                autocommit=False,
+            )
+        self._cache: OrderedDict[int, tuple[str, bool, float]] = OrderedDict()
+        self._lookups = 0
+        self._cache_hits = 0
+        self._allocated_ids = 0
+
+    @property
+    def names(self) -> list[str]:
+        """Names of all shards, the default one first."""
+        return list(self._engines)
+
+    @property
+    def is_sharded(self) -> bool:
+        """Whether audio data is spread over several databases."""
+        return len(self._engines) > 1
+
+    def get_engine(self, shard: str) -> AsyncEngine:
+        """Get the engine of a shard.
+
+        Args:
+            shard (str): Shard name
+
+        Returns:
+            AsyncEngine: Engine of the shard
+
+        Raises:
+            KeyError: If the shard is not configured
+        """
+        return self._engines[shard]
+
+    @asynccontextmanager
+    async def session(self, shard: str) -> AsyncIterator[AsyncSession]:
+        """Open a session to a shard.
+
+        Args:
+            shard (str): Shard name
+
+        Yields:
+            AsyncSession: Session bound to the shard database
+        """
+        async with self._sessions[shard]() as session:
+            yield session
+
+    def placement(self, user_id: int) -> str:
+        """Choose the shard for a new user.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            str: Shard name
+        """
+        shards = [name for name in settings.SHARD_PLACEMENT if name in self._engines]
+        return shards[user_id % len(shards)] if shards else DEFAULT_SHARD
+
+    async def assign(self, user_id: int) -> None:
+        """Record the shard of a newly created user.
+
+        Args:
+            user_id (int): ID of the user
+        """
+        shard = self.placement(user_id)
+        if shard == DEFAULT_SHARD:
+            return
+        async with async_session() as session:
+            await session.execute(
+                pg_insert(UserShard)
+                .values(user_id=user_id, shard=shard)
+                .on_conflict_do_nothing()
+            )
+            await session.commit()
+        self.invalidate(user_id)
+
+    async def _lookup(self, user_id: int) -> tuple[str, bool]:
+        """Get the shard of a user and whether the user is being moved.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            tuple[str, bool]: Shard name and move flag
+        """
+        if not self.is_sharded:
+            return DEFAULT_SHARD, False
+
+        self._lookups += 1
+        cached = self._cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[2] < (
+            settings.SHARD_MAP_CACHE_SECONDS
+        ):
+            self._cache_hits += 1
+            self._cache.move_to_end(user_id)
+            return cached[0], cached[1]
+
+        async with async_session() as session:
+            entry = await session.get(UserShard, user_id)
+        if entry is None:
+            shard, moving = DEFAULT_SHARD, False
+        else:
+            shard = entry.shard
+            moving = entry.moving_to is not None or entry.moving_from is not None
+        self._cache[user_id] = (shard, moving, time.monotonic())
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self.MAX_CACHED_USERS:
+            self._cache.popitem(last=False)
+        return shard, moving
+
+    async def shard_for_user(self, user_id: int) -> str:
+        """Get the shard serving a user's audio data.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            str: Shard name
+        """
+        return (await self._lookup(user_id))[0]
+
+    async def ensure_writable(self, *user_ids: int) -> None:
+        """Reject writes to the audio data of users being moved.
+
+        Args:
+            *user_ids (int): IDs of the users
+
+        Raises:
+            HTTPException: 503 if any of the users is being moved
+        """
+        for user_id in user_ids:
+            if (await self._lookup(user_id))[1]:
+                raise HTTPException(
+                    status_code=503,
+                    detail="Audio library is being moved, try again later",
+                    headers={"Retry-After": str(int(settings.SHARD_MAP_CACHE_SECONDS))},
+                )
+
+    async def moving_user_ids(self) -> set[int]:
+        """Get users whose audio data is being moved.
+
+        Returns:
+            set[int]: User IDs
+        """
+        if not self.is_sharded:
+            return set()
+        async with async_session() as session:
+            result = await session.execute(
+                select(UserShard.user_id).where(
+                    or_(
+                        UserShard.moving_to.is_not(None),
+                        UserShard.moving_from.is_not(None),
+                    )
+                )
+            )
+            return set(result.scalars().all())
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the cached shard of a user in this process.
+
+        Args:
+            user_id (int): ID of the user
+        """
+        self._cache.pop(user_id, None)
+
+    async def allocate_audio_ids(self, count: int) -> list[int]:
+        """Take audio ids from the sequence of the default shard.
+
+        Args:
+            count (int): Number of ids
+
+        Returns:
+            list[int]: Unique ids
+        """
+        async with async_session() as session:
+            result = await session.execute(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence('audio_info', 'id')) "
+                    "FROM generate_series(1, :count)"
+                ),
+                {"count": count},
+            )
+            await session.commit()
+        self._allocated_ids += count
+        return list(result.scalars().all())
+
+    async def dispose(self) -> None:
+        """Close the connection pools of the additional shards."""
+        for name, shard_engine in self._engines.items():
+            if name != DEFAULT_SHARD:
+                await shard_engine.dispose()
+
+    def get_metrics(self) -> dict:
+        """Get shard routing metrics.
+
+        Returns:
+            dict: Shard names and shard map cache counters
+        """
+        return {
+            "shards": self.names,
+            "cached_users": len(self._cache),
+            "lookups": self._lookups,
+            "cache_hits": self._cache_hits,
+            "allocated_ids": self._allocated_ids,
+        }
+
+
+shard_router = ShardRouter()
+metrics.register("shards", shard_router.get_metrics)
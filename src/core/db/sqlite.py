@@ -0,0 +1,246 @@
+import asyncio
+import sqlite3
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import TextClause
+
+from src.settings import settings
+
+MIN_SQLITE_VERSION = (3, 35, 0)
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+
+
+def is_sqlite(url: str) -> bool:
+    """Check whether a database URL points to SQLite.
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        bool: True for SQLite URLs
+    """
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def sqlite_engine_options(url: str) -> dict:
+    """Get engine arguments for a SQLite database.
+
+    File databases keep a pool of DB_POOL_SIZE connections, so pragmas
+    and the page cache survive between sessions. In-memory databases
+    are not supported: sessions would have to share one connection and
+    with it each other's uncommitted transactions. For a database kept
+    in memory use a file on tmpfs, e.g. /dev/shm/audio.db.
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        dict: Keyword arguments for create_async_engine
+
+    Raises:
+        RuntimeError: If the SQLite library does not support RETURNING
+            or the URL points to an in-memory database
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise RuntimeError(
+            f"SQLite {sqlite3.sqlite_version} is too old, "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer is required"
+        )
+    database = make_url(url).database
+    if database in (None, "", ":memory:") or "mode=memory" in database:
+        raise RuntimeError(
+            "In-memory SQLite databases are not supported, "
+            "use a database file, e.g. on tmpfs (/dev/shm)"
+        )
+    return {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+    }
+
+
+def install_pragmas(engine: AsyncEngine) -> None:
+    """Tune every new SQLite connection of an engine.
+
+    WAL lets readers run alongside the writer, synchronous=NORMAL
+    is durable in WAL mode except for the last commits on power loss,
+    busy_timeout makes writers of other processes wait instead of
+    failing, and foreign keys are enforced as on Postgres.
+
+    Args:
+        engine (AsyncEngine): SQLite engine
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in (
+            "journal_mode=WAL",
+            f"synchronous={settings.SQLITE_SYNCHRONOUS}",
+            "foreign_keys=ON",
+            f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+            f"cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+            f"mmap_size={settings.SQLITE_MMAP_SIZE}",
+            "temp_store=MEMORY",
+        ):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+class SQLiteWriter:
+    """Queue of write transactions of the process.
+
+    SQLite allows one writer at a time. Sessions wait here, in the order
+    they arrive, before their first write statement and hold their turn
+    until they commit, roll back or close, so concurrent requests never
+    fail with "database is locked". Writers of other processes are
+    waited for through busy_timeout.
+
+    Attributes:
+        timeout (float): Seconds a session may wait for its turn
+    """
+
+    def __init__(self, timeout: float):
+        """Initialize the queue.
+
+        Args:
+            timeout (float): Seconds a session may wait for its turn
+        """
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._transactions = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._timeouts = 0
+
+    async def acquire(self) -> None:
+        """Wait for the turn to write.
+
+        Raises:
+            TimeoutError: If the turn does not come within `timeout`
+        """
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._lock.acquire()
+        except TimeoutError:
+            self._timeouts += 1
+            raise
+        finally:
+            self._waiting -= 1
+        waited = time.monotonic() - started
+        self._transactions += 1
+        self._wait_seconds += waited
+        self._max_wait_seconds = max(self._max_wait_seconds, waited)
+
+    def release(self) -> None:
+        """Give the turn to the next writer."""
+        self._lock.release()
+
+    def get_metrics(self) -> dict:
+        """Get write queue metrics.
+
+        Returns:
+            dict: Queue length and waiting times of write transactions
+        """
+        transactions = max(self._transactions, 1)
+        return {
+            "waiting": self._waiting,
+            "transactions": self._transactions,
+            "avg_wait_ms": round(self._wait_seconds / transactions * 1000, 2),
+            "max_wait_ms": round(self._max_wait_seconds * 1000, 2),
+            "timeouts": self._timeouts,
+        }
+
+
+sqlite_writer = SQLiteWriter(settings.SQLITE_WRITE_TIMEOUT_SECONDS)
+
+
+class SQLiteSession(AsyncSession):
+    """Async session that writes through the SQLite write queue.
+
+    The turn is taken before the first INSERT, UPDATE or DELETE of a
+    transaction, or before a commit that flushes pending ORM changes,
+    and given back when the transaction ends.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._writing = False
+
+    @staticmethod
+    def _is_write(statement: Any) -> bool:
+        """Check whether a statement modifies data.
+
+        Args:
+            statement (Any): Executed statement
+
+        Returns:
+            bool: True for INSERT, UPDATE and DELETE statements
+        """
+        if isinstance(statement, TextClause):
+            words = statement.text.split(None, 1)
+            return bool(words) and words[0].upper() in WRITE_KEYWORDS
+        return bool(getattr(statement, "is_dml", False))
+
+    async def _start_writing(self) -> None:
+        """Take the turn to write unless the session already has it.
+
+        The session checks out its connection first: a writer waiting
+        for a pool connection while holding the turn could otherwise
+        wait forever for sessions that wait for the turn.
+        """
+        if not self._writing:
+            await self.connection()
+            await sqlite_writer.acquire()
+            self._writing = True
+
+    def _stop_writing(self) -> None:
+        """Give back the turn to write if the session has it."""
+        if self._writing:
+            self._writing = False
+            sqlite_writer.release()
+
+    @property
+    def _has_changes(self) -> bool:
+        """Whether ORM changes are waiting to be flushed."""
+        session = self.sync_session
+        return bool(session.new or session.dirty or session.deleted)
+
+    async def execute(self, statement: Any, *args, **kwargs):
+        if self._is_write(statement):
+            await self._start_writing()
+        return await super().execute(statement, *args, **kwargs)
+
+    async def flush(self, objects=None) -> None:
+        if self._has_changes:
+            await self._start_writing()
+        await super().flush(objects)
+
+    async def commit(self) -> None:
+        if self._has_changes:
+            await self._start_writing()
+        try:
+            await super().commit()
+        finally:
+            self._stop_writing()
+
+    async def rollback(self) -> None:
+        try:
+            await super().rollback()
+        finally:
+            self._stop_writing()
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            self._stop_writing()
+
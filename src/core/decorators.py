@@ -2,7 +2,11 @@ from functools import wraps
 from typing import Any, Callable, TypeVar, ParamSpec
 from fastapi import HTTPException
 from sqlalchemy.exc import DataError as SQLAlchemyDataError, DBAPIError
-from asyncpg.exceptions import DataError as AsyncPGDataError
+
+try:
+    from asyncpg.exceptions import DataError as AsyncPGDataError
+except ImportError:  # pragma: no cover - asyncpg is not needed with SQLite
+    AsyncPGDataError = SQLAlchemyDataError
 
 P = ParamSpec("P")
 T = TypeVar("T")
@@ -23,7 +27,7 @@ def handle_db_errors(func: Callable[P, T]) -> Callable[P, T]:
 
     Raises:
         HTTPException:
-            400 - If the value is out of int32 range
+            400 - If the value is out of the integer range of the database
             409 - For other database-related errors
     """
 
@@ -31,10 +35,10 @@ def handle_db_errors(func: Callable[P, T]) -> Callable[P, T]:
     async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
         try:
             return await func(*args, **kwargs)
-        except (SQLAlchemyDataError, AsyncPGDataError, DBAPIError) as e:
+        except (SQLAlchemyDataError, AsyncPGDataError, DBAPIError, OverflowError) as e:
             if hasattr(args[0], "session"):
                 await args[0].session.rollback()
-            if "value out of int32 range" in str(e):
+            if isinstance(e, OverflowError) or "value out of int32 range" in str(e):
                 raise HTTPException(
                     status_code=400,
                     detail="Некорректные данные: значение выходит за пределы допустимого диапазона",
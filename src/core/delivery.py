@@ -0,0 +1,111 @@
+import os
+from mimetypes import guess_type
+from typing import Mapping, Optional
+from urllib.parse import quote
+
+from fastapi import Response
+
+from src.core.responses import content_disposition
+from src.settings import settings
+
+
+def _tier_dirs() -> list[tuple[str, str]]:
+    """Get the storage directories by tier.
+
+    Returns:
+        list[tuple[str, str]]: Tier names and absolute directories,
+            hot tier first
+    """
+    dirs = [("hot", settings.MEDIA_DIR), ("cold", settings.COLD_MEDIA_DIR)]
+    return [(tier, os.path.abspath(directory)) for tier, directory in dirs if directory]
+
+
+def _locate(path: str) -> Optional[tuple[str, str]]:
+    """Find the tier of a stored file.
+
+    Args:
+        path (str): Path of a stored file
+
+    Returns:
+        Optional[tuple[str, str]]: Tier name and path relative to the tier
+            directory, or None if the file is outside the storage directories
+    """
+    path = os.path.abspath(path)
+    for tier, directory in _tier_dirs():
+        if os.path.commonpath([path, directory]) == directory and path != directory:
+            return tier, os.path.relpath(path, directory).replace(os.sep, "/")
+    return None
+
+
+def storage_key(path: str) -> Optional[str]:
+    """Get the tier-independent key of a stored file.
+
+    Files keep their relative path when they move between tiers, so
+    a key stays valid after the file is demoted or promoted.
+
+    Args:
+        path (str): Path of a stored file
+
+    Returns:
+        Optional[str]: Key like "3f/a2/<filename>", or None if the file
+            is outside the storage directories
+    """
+    located = _locate(path)
+    return located[1] if located else None
+
+
+def key_paths(key: str) -> list[str]:
+    """Get the paths where a file with the given key may be stored.
+
+    Args:
+        key (str): Key built by `storage_key`
+
+    Returns:
+        list[str]: Candidate paths, hot tier first. Empty if the key
+            points outside the storage directories.
+    """
+    paths = []
+    for _, directory in _tier_dirs():
+        path = os.path.abspath(os.path.join(directory, key))
+        if os.path.commonpath([path, directory]) == directory and path != directory:
+            paths.append(path)
+    return paths
+
+
+def offload_response(
+    path: str, filename: str, headers: Mapping[str, str] | None = None
+) -> Optional[Response]:
+    """Build a response that lets the reverse proxy send the file.
+
+    With FILE_DELIVERY_MODE "x-accel-redirect" the response points nginx
+    to the internal location FILE_DELIVERY_INTERNAL_PREFIX<tier>/<key>,
+    with "x-sendfile" it carries the absolute file path for Apache or
+    lighttpd. The proxy then sends the body itself, including ranges,
+    and the worker is free right away.
+
+    Args:
+        path (str): Path of the stored file
+        filename (str): Filename offered to the client
+        headers (Mapping[str, str], optional): Extra headers, e.g. ETag
+
+    Returns:
+        Optional[Response]: Empty response with the offload header, or None
+            if offloading is disabled or the file is outside the storage
+            directories
+    """
+    headers = dict(headers or {})
+    if settings.FILE_DELIVERY_MODE == "x-accel-redirect":
+        located = _locate(path)
+        if located is None:
+            return None
+        tier, relative = located
+        prefix = settings.FILE_DELIVERY_INTERNAL_PREFIX.rstrip("/")
+        headers["X-Accel-Redirect"] = f"{prefix}/{tier}/{quote(relative)}"
+    elif settings.FILE_DELIVERY_MODE == "x-sendfile":
+        headers["X-Sendfile"] = os.path.abspath(path)
+    else:
+        return None
+
+    headers["Content-Disposition"] = content_disposition(filename)
+    media_type = guess_type(filename)[0] or "application/octet-stream"
+    return Response(headers=headers, media_type=media_type)
@@ -1,6 +1,9 @@
+from typing import Optional
+
 import jwt
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query
 from fastapi import Cookie
+from pydantic import BaseModel
 
 from src.crud import UserDAO
 from src.models import User
@@ -69,3 +72,54 @@ async def get_admin_user(
             status_code=403, detail="You don't have administrator privileges"
         )
     return user
+
+
+class SparseFields:
+    """Dependency parsing a `fields` query parameter for a response schema.
+
+    Clients pass a comma-separated list of fields to receive only part of
+    each object, e.g. `?fields=audio_id,user_filename,size`.
+
+    Example:
+        fields: Optional[tuple[str, ...]] = Depends(SparseFields(AudioFullInfo))
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        """Initialize the dependency.
+
+        Args:
+            schema (type[BaseModel]): Schema whose fields may be requested
+        """
+        self.allowed = tuple(schema.model_fields)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated list of fields to return"
+        ),
+    ) -> Optional[tuple[str, ...]]:
+        """Validate the requested fields.
+
+        Args:
+            fields (str, optional): Comma-separated field names
+
+        Returns:
+            Optional[tuple[str, ...]]: Requested fields in schema order,
+                or None if all fields are requested
+
+        Raises:
+            HTTPException: 400 if a field is unknown or the list is empty
+        """
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise HTTPException(status_code=400, detail="No fields requested")
+        unknown = requested.difference(self.allowed)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. "
+                f"Allowed fields: {', '.join(self.allowed)}",
+            )
+        return tuple(name for name in self.allowed if name in requested)
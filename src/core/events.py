@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+
+import jwt
+import orjson
+from sqlalchemy import text
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.db.database import async_session, engine
+from src.core.metrics import metrics
+from src.core.signing import verify_url
+from src.crud import UserDAO
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """Per-user event fan-out for server-sent events.
+
+    Every subscriber gets its own bounded queue; publishing never blocks
+    and drops the oldest event of a subscriber that does not keep up.
+    On Postgres events are sent through NOTIFY and every process listens
+    on one shared connection, so events published by another API worker
+    or by worker.py reach all subscribers. Other databases deliver events
+    within the process only.
+
+    Attributes:
+        CHANNEL (str): Postgres notification channel
+        queue_size (int): Maximum number of queued events per subscriber
+    """
+
+    CHANNEL = "audio_events"
+
+    def __init__(self, queue_size: int):
+        """Initialize the broker.
+
+        Args:
+            queue_size (int): Maximum number of queued events per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+
+    @property
+    def is_distributed(self) -> bool:
+        """Whether events are exchanged between processes."""
+        return engine.dialect.name == "postgresql"
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        """Receive events of a user while the context is open.
+
+        Args:
+            user_id (int): ID of the user
+
+        Yields:
+            asyncio.Queue: Queue of (event, data) tuples
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers[user_id]
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[user_id]
+
+    async def stream(self, user_id: int) -> AsyncIterator[bytes]:
+        """Stream events of a user in the text/event-stream format.
+
+        The stream starts with the client reconnection delay
+        EVENTS_CLIENT_RETRY_MS. A comment line is sent every
+        EVENTS_KEEPALIVE_SECONDS without events, so proxies do not close
+        the idle connection.
+
+        Args:
+            user_id (int): ID of the user
+
+        Yields:
+            bytes: Encoded server-sent events
+        """
+        async with self.subscribe(user_id) as queue:
+            yield b"retry: %d\n\n" % settings.EVENTS_CLIENT_RETRY_MS
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(
+                        queue.get(), settings.EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"event: %s\ndata: %s\n\n" % (event.encode(), orjson.dumps(data))
+
+    def deliver(self, user_id: int, event: str, data: dict[str, Any]) -> None:
+        """Put an event into the queues of local subscribers.
+
+        Args:
+            user_id (int): ID of the user
+            event (str): Event name
+            data (dict[str, Any]): Event payload
+        """
+        for queue in self._subscribers.get(user_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self._dropped += 1
+            queue.put_nowait((event, data))
+            self._delivered += 1
+
+    async def publish(self, user_id: int, event: str, data: dict[str, Any]) -> None:
+        """Publish an event to all subscribers of a user.
+
+        Failures are logged and swallowed: events are advisory and must
+        not break the operation that produced them.
+
+        Args:
+            user_id (int): ID of the user
+            event (str): Event name
+            data (dict[str, Any]): Event payload, serializable by orjson
+        """
+        self._published += 1
+        if not self.is_distributed:
+            self.deliver(user_id, event, data)
+            return
+        payload = orjson.dumps({"user_id": user_id, "event": event, "data": data})
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.CHANNEL, "payload": payload.decode()},
+                )
+                await conn.commit()
+        except Exception:
+            logger.exception("Failed to publish event %s for user %s", event, user_id)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        """Deliver an event received from Postgres.
+
+        Args:
+            connection: asyncpg connection
+            pid: ID of the notifying backend
+            channel: Notification channel
+            payload (str): Serialized event
+        """
+        message = orjson.loads(payload)
+        self.deliver(message["user_id"], message["event"], message["data"])
+
+    async def listen_forever(self) -> None:
+        """Receive events published by other processes.
+
+        Holds one database connection per process, not per subscriber,
+        and reconnects if it is lost. Returns at once for databases
+        without LISTEN/NOTIFY.
+        """
+        if not self.is_distributed:
+            return
+        while True:
+            try:
+                async with engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    raw.add_termination_listener(lambda _: lost.set())
+                    await raw.add_listener(self.CHANNEL, self._on_notification)
+                    try:
+                        await lost.wait()
+                    finally:
+                        if not raw.is_closed():
+                            await raw.remove_listener(
+                                self.CHANNEL, self._on_notification
+                            )
+                logger.warning("Event listener connection lost, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event listener failed")
+                await asyncio.sleep(settings.EVENTS_RECONNECT_SECONDS)
+
+    def get_metrics(self) -> dict:
+        """Get event broker metrics.
+
+        Returns:
+            dict: Subscribers and event counters
+        """
+        return {
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+        }
+
+
+event_broker = EventBroker(settings.EVENTS_QUEUE_SIZE)
+metrics.register("events", event_broker.get_metrics)
+
+
+class UploadProgressMiddleware:
+    """ASGI middleware publishing "upload.progress" events.
+
+    Counts request body bytes of uploads as they are received, before
+    the endpoint runs, and publishes at most one event per
+    UPLOAD_PROGRESS_INTERVAL_SECONDS. Clients may send an X-Upload-Id
+    header to tell concurrent uploads apart.
+
+    Attributes:
+        paths (set[str]): Paths of multipart upload endpoints, the user
+            is taken from the access token
+        prefix (str): Path prefix of direct upload URLs, the user ID is
+            the first path segment after it and the URL must be signed
+    """
+
+    MAX_CACHED_USERS = 10_000
+
+    def __init__(self, app: ASGIApp, paths: set[str], prefix: str):
+        self.app = app
+        self.paths = paths
+        self.prefix = prefix
+        self._user_ids: OrderedDict[str, int] = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+        user_id = await self._user_id(scope)
+        if user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        try:
+            total = int(headers.get(b"content-length") or 0) or None
+        except ValueError:
+            total = None
+        upload_id = headers.get(b"x-upload-id", b"").decode("latin-1") or None
+        received = 0
+        published_at = time.monotonic()
+
+        async def receive_with_progress() -> Message:
+            nonlocal received, published_at
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                now = time.monotonic()
+                done = not message.get("more_body", False)
+                if done or now - published_at >= settings.UPLOAD_PROGRESS_INTERVAL_SECONDS:
+                    published_at = now
+                    await event_broker.publish(
+                        user_id,
+                        "upload.progress",
+                        {"upload_id": upload_id, "received": received, "total": total},
+                    )
+            return message
+
+        await self.app(scope, receive_with_progress, send)
+
+    async def _user_id(self, scope: Scope) -> Optional[int]:
+        """Identify the user of an upload request.
+
+        Args:
+            scope (Scope): Request scope
+
+        Returns:
+            Optional[int]: User ID, or None if the request is not an upload
+                or the user is unknown
+        """
+        path = scope["path"]
+        request = Request(scope)
+        if path.startswith(self.prefix):
+            user_id = path[len(self.prefix) :].split("/", 1)[0]
+            if not settings.SIGNED_URL_SECRET or not user_id.isdigit():
+                return None
+            params = request.query_params
+            try:
+                signed = verify_url(
+                    path,
+                    int(params.get("expires", "")),
+                    params.get("signature", ""),
+                    params.get("size", ""),
+                )
+            except (TypeError, ValueError):
+                return None
+            return int(user_id) if signed else None
+        if path not in self.paths:
+            return None
+
+        token = request.cookies.get("access_token")
+        if not token:
+            return None
+        try:
+            payload = jwt.decode(
+                token.replace("Bearer ", ""),
+                settings.ACCESS_SECRET_KEY,
+                algorithms=[settings.ALGORITHM],
+            )
+        except jwt.PyJWTError:
+            return None
+        yandex_id = payload.get("sub")
+        if yandex_id is None:
+            return None
+
+        if yandex_id in self._user_ids:
+            self._user_ids.move_to_end(yandex_id)
+            return self._user_ids[yandex_id]
+        async with async_session() as session:
+            user = await UserDAO(session).find_one_or_none(yandex_id=yandex_id)
+        if user is None:
+            return None
+        self._user_ids[yandex_id] = user.id
+        if len(self._user_ids) > self.MAX_CACHED_USERS:
+            self._user_ids.popitem(last=False)
+        return user.id
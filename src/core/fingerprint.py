@@ -0,0 +1,174 @@
+"""Acoustic fingerprints for near-duplicate detection.
+
+The fingerprint follows the Haitsma-Kalker scheme: mono PCM is split into
+overlapping frames of FRAME_SECONDS and, for every frame, the energy
+differences of 33 logarithmic bands between neighbouring
+bands and consecutive frames are turned into one 32-bit sub-fingerprint.
+Re-encoding at another bitrate or in another container flips only a small
+share of the bits, so two files are compared by their bit error rate.
+
+The functions of this module are CPU bound and are meant to run in a
+process pool.
+"""
+
+import wave
+
+import numpy as np
+
+FRAME_SECONDS = 0.37
+HOP_SECONDS = 0.0464
+BANDS = 33
+MIN_FREQUENCY = 300
+MAX_FREQUENCY = 2000
+MAX_OFFSET = 8
+
+SUPPORTED_EXTENSIONS = {"wav", "flac"}
+
+
+def decode_pcm(path: str, max_seconds: float) -> tuple[np.ndarray, int, float]:
+    """Decode the beginning of a WAV or FLAC file to mono float samples.
+
+    Args:
+        path (str): Path to the audio file
+        max_seconds (float): Maximum duration to decode
+
+    Returns:
+        tuple[np.ndarray, int, float]: Mono samples, their sample rate and
+            the duration of the whole file in seconds
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    extension = path.rsplit(".", 1)[-1].lower()
+    if extension == "wav":
+        with wave.open(path, "rb") as wav:
+            sample_rate = wav.getframerate()
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            duration = wav.getnframes() / sample_rate
+            frames = wav.readframes(int(sample_rate * max_seconds))
+        if width == 1:
+            samples = np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128
+        elif width in (2, 4):
+            samples = np.frombuffer(frames, dtype=f"<i{width}").astype(np.float32)
+        else:
+            raise ValueError(f"Unsupported WAV sample width: {width}")
+        samples = samples[: len(samples) // channels * channels]
+        return samples.reshape(-1, channels).mean(axis=1), sample_rate, duration
+
+    if extension == "flac":
+        import soundfile
+
+        with soundfile.SoundFile(path) as flac:
+            sample_rate = flac.samplerate
+            duration = flac.frames / sample_rate
+            samples = flac.read(
+                int(sample_rate * max_seconds), dtype="float32", always_2d=True
+            )
+        return samples.mean(axis=1), sample_rate, duration
+
+    raise ValueError(f"Unsupported format for fingerprinting: {extension}")
+
+
+def compute_fingerprint(path: str, max_seconds: float) -> tuple[float, bytes]:
+    """Compute the fingerprint of an audio file.
+
+    Args:
+        path (str): Path to a WAV or FLAC file
+        max_seconds (float): Maximum duration to analyse
+
+    Returns:
+        tuple[float, bytes]: Duration of the file in seconds and packed
+            little-endian uint32 sub-fingerprints
+    """
+    samples, sample_rate, duration = decode_pcm(path, max_seconds)
+    frame_size = int(FRAME_SECONDS * sample_rate)
+    hop_size = max(1, int(HOP_SECONDS * sample_rate))
+    if len(samples) < frame_size + 2 * hop_size:
+        return duration, b""
+
+    # Frame length is fixed in seconds rather than samples, so files with
+    # different sample rates get the same bands without resampling.
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_size)[::hop_size]
+    spectrum = np.abs(np.fft.rfft(frames * np.hanning(frame_size), axis=1)) ** 2
+
+    edges = np.geomspace(MIN_FREQUENCY, MAX_FREQUENCY, BANDS + 1)
+    bins = np.round(edges * frame_size / sample_rate).astype(int)
+    energy = np.add.reduceat(spectrum, bins[:-1], axis=1)[:, :BANDS]
+
+    band_diff = energy[:, :-1] - energy[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    weights = (1 << np.arange(32, dtype=np.uint64)).astype(np.uint64)
+    values = (bits.astype(np.uint64) * weights).sum(axis=1).astype("<u4")
+    return duration, values.tobytes()
+
+
+def unpack(fingerprint: bytes) -> np.ndarray:
+    """Unpack a stored fingerprint.
+
+    Args:
+        fingerprint (bytes): Packed little-endian uint32 values
+
+    Returns:
+        np.ndarray: Sub-fingerprints
+    """
+    return np.frombuffer(fingerprint, dtype="<u4")
+
+
+def index_hashes(fingerprint: bytes) -> list[int]:
+    """Get the distinct sub-fingerprints used for index lookups.
+
+    Values are converted to signed 32-bit integers to fit an INTEGER column.
+    Silence produces all-zero or all-one values, those are skipped.
+
+    Args:
+        fingerprint (bytes): Packed fingerprint
+
+    Returns:
+        list[int]: Distinct signed sub-fingerprints
+    """
+    values = np.unique(unpack(fingerprint))
+    values = values[(values != 0) & (values != 0xFFFFFFFF)]
+    return values.astype(np.int32).tolist()
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Compare two fingerprints.
+
+    Tries small time offsets and returns the best share of equal bits
+    over the overlapping frames.
+
+    Args:
+        first (bytes): Packed fingerprint
+        second (bytes): Packed fingerprint
+
+    Returns:
+        float: Similarity from 0 to 1
+    """
+    a, b = unpack(first), unpack(second)
+    best = 0.0
+    for offset in range(-MAX_OFFSET, MAX_OFFSET + 1):
+        x = a[max(0, offset) :]
+        y = b[max(0, -offset) :]
+        length = min(len(x), len(y))
+        if length < 16:
+            continue
+        errors = np.unpackbits((x[:length] ^ y[:length]).view(np.uint8)).sum()
+        best = max(best, 1 - errors / (length * 32))
+    return best
+
+
+def compare_pairs(pairs: list[tuple[int, int, bytes, bytes]]) -> list[tuple[int, int, float]]:
+    """Compare fingerprint pairs in one process pool call.
+
+    Args:
+        pairs (list[tuple[int, int, bytes, bytes]]): Audio ids with
+            their fingerprints
+
+    Returns:
+        list[tuple[int, int, float]]: Audio ids with their similarity
+    """
+    return [
+        (first_id, second_id, similarity(first, second))
+        for first_id, second_id, first, second in pairs
+    ]
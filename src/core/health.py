@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import os
+import shutil
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from src.core.admission import upload_admission
+from src.core.db.database import engine
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """Readiness checks of the worker process.
+
+    Checks that need I/O (database ping, MEDIA_DIR write, free space)
+    run in the background every HEALTH_CHECK_INTERVAL_SECONDS and their
+    results are cached, so readiness probes only read memory. Connection
+    pool saturation and shutdown draining are read at probe time since
+    they cost nothing.
+
+    Attributes:
+        PROBE_FILENAME (str): File written to test MEDIA_DIR writability,
+            formatted with the process id so worker processes sharing
+            MEDIA_DIR never remove each other's probe
+    """
+
+    PROBE_FILENAME = ".healthcheck-{pid}"
+
+    def __init__(self):
+        self._checks: dict[str, dict] = {}
+        self._checked_at: Optional[float] = None
+
+    async def _check_database(self) -> dict:
+        """Ping the database through the connection pool.
+
+        Returns:
+            dict: Check result
+        """
+        if self.pool_usage() >= settings.HEALTH_POOL_SATURATION:
+            return {"ok": True, "skipped": "pool saturated"}
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+        except Exception as e:
+            return {"ok": False, "error": type(e).__name__}
+        return {"ok": True, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    @staticmethod
+    def _check_media_dir() -> dict:
+        """Check that MEDIA_DIR is writable and has enough free space.
+
+        Returns:
+            dict: Check result
+        """
+        probe_path = os.path.join(
+            settings.MEDIA_DIR, HealthChecker.PROBE_FILENAME.format(pid=os.getpid())
+        )
+        try:
+            with open(probe_path, "wb") as f:
+                f.write(b"ok")
+            os.remove(probe_path)
+            usage = shutil.disk_usage(settings.MEDIA_DIR)
+        except OSError as e:
+            return {"ok": False, "error": e.strerror or type(e).__name__}
+
+        free_ratio = usage.free / usage.total if usage.total else 0.0
+        ok = (
+            usage.free >= settings.HEALTH_MIN_FREE_BYTES
+            and free_ratio >= settings.HEALTH_MIN_FREE_RATIO
+        )
+        result = {"ok": ok, "free_bytes": usage.free, "free_ratio": round(free_ratio, 4)}
+        if not ok:
+            result["error"] = "low disk space"
+        return result
+
+    async def run_once(self) -> None:
+        """Run the I/O checks and cache their results."""
+        database, media_dir = await asyncio.gather(
+            self._check_database(), asyncio.to_thread(self._check_media_dir)
+        )
+        self._checks = {"database": database, "media_dir": media_dir}
+        self._checked_at = time.monotonic()
+
+    async def run_forever(self) -> None:
+        """Refresh the cached checks every HEALTH_CHECK_INTERVAL_SECONDS."""
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Health checks failed")
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL_SECONDS)
+
+    @staticmethod
+    def pool_usage() -> float:
+        """Get the share of pool connections in use.
+
+        Returns:
+            float: Checked out connections relative to pool size plus
+                overflow, 0 for pools without a size limit
+        """
+        pool = engine.sync_engine.pool
+        if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+            return 0.0
+        capacity = pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+        return pool.checkedout() / capacity if capacity else 0.0
+
+    def readiness(self) -> tuple[bool, dict]:
+        """Get the readiness of the worker without doing any I/O.
+
+        The worker is not ready before the first checks complete, when
+        the cached results are older than three check intervals, when any
+        check failed, when the connection pool is saturated or when the
+        worker is shutting down.
+
+        Returns:
+            tuple[bool, dict]: Whether the worker is ready and check details
+        """
+        checks = dict(self._checks)
+        usage = self.pool_usage()
+        checks["pool"] = {
+            "ok": usage < settings.HEALTH_POOL_SATURATION,
+            "usage": round(usage, 3),
+        }
+        checks["accepting_uploads"] = {"ok": not upload_admission.draining}
+
+        if self._checked_at is None:
+            return False, {"error": "checks pending", **checks}
+        age = time.monotonic() - self._checked_at
+        if age > settings.HEALTH_CHECK_INTERVAL_SECONDS * 3:
+            return False, {"error": "checks are stale", **checks}
+        return all(check["ok"] for check in checks.values()), checks
+
+
+health_checker = HealthChecker()
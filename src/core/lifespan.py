@@ -0,0 +1,96 @@
+import asyncio
+import os
+import signal
+import threading
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI
+
+from src.core.admission import upload_admission
+from src.core.db.database import engine, warm_up_pool
+from src.core.db.shards import shard_router
+from src.core.events import event_broker
+from src.core.health import health_checker
+from src.service.audio import LocalFileStorage
+from src.service.audio.duplicates import duplicate_detector
+from src.service.audio.sweeper import retention_sweeper
+from src.service.audio.tiering import tier_manager
+from src.service.jobs import job_worker
+from src.settings import settings
+
+
+def drain_uploads_on_signal() -> None:
+    """Stop admitting uploads as soon as the server is asked to stop.
+
+    On SIGTERM or SIGINT uvicorn closes the listening socket and waits
+    up to SHUTDOWN_TIMEOUT_SECONDS for open requests before the lifespan
+    shutdown runs. Its handlers are chained so that uploads arriving
+    on kept-alive connections meanwhile get 503 with Retry-After
+    instead of being cut off by the exit.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            continue
+
+        def handler(signum, frame, previous=previous):
+            upload_admission.start_draining()
+            previous(signum, frame)
+
+        signal.signal(signum, handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan handler.
+
+    On startup creates MEDIA_DIR, pre-opens DB_POOL_WARMUP database
+    connections, so the first requests after a deploy do not pay the
+    connection setup cost, removes partial files left by killed workers
+    and starts the storage tiering task, the event listener, the
+    readiness checks, the retention sweeper and, with JOB_WORKER_IN_APP, the job worker.
+    A shutdown signal stops admitting new uploads right away.
+    On shutdown, which runs once open requests have finished, lets
+    running jobs finish, stops background tasks and the fingerprint
+    worker pool and closes the connection pool.
+
+    Args:
+        app (FastAPI): The application instance
+    """
+    os.makedirs(settings.MEDIA_DIR, exist_ok=True)
+    if settings.COLD_MEDIA_DIR:
+        os.makedirs(settings.COLD_MEDIA_DIR, exist_ok=True)
+    if settings.DB_POOL_WARMUP > 0:
+        await warm_up_pool(settings.DB_POOL_WARMUP)
+    drain_uploads_on_signal()
+
+    background_tasks = [
+        asyncio.create_task(
+            LocalFileStorage().remove_partial_files(
+                settings.PARTIAL_FILE_MAX_AGE_SECONDS
+            )
+        ),
+        asyncio.create_task(tier_manager.run_forever()),
+        asyncio.create_task(event_broker.listen_forever()),
+        asyncio.create_task(health_checker.run_forever()),
+    ]
+    if settings.SWEEPER_ENABLED:
+        background_tasks.append(asyncio.create_task(retention_sweeper.run_forever()))
+    job_worker_task = None
+    if settings.JOB_WORKER_IN_APP:
+        job_worker_task = asyncio.create_task(job_worker.run_forever())
+
+    yield
+
+    if job_worker_task is not None:
+        job_worker.stop()
+        await job_worker_task
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    duplicate_detector.shutdown()
+    await shard_router.dispose()
+    await engine.dispose()
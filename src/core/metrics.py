@@ -0,0 +1,36 @@
+from typing import Callable
+
+
+class MetricsRegistry:
+    """In-process registry of component metrics.
+
+    Components register a collector returning a flat dictionary of their
+    current counters. Values are per worker process.
+
+    Methods:
+        register: Register a metrics collector
+        collect: Collect metrics from all registered components
+    """
+
+    def __init__(self):
+        self._collectors: dict[str, Callable[[], dict]] = {}
+
+    def register(self, name: str, collector: Callable[[], dict]) -> None:
+        """Register a metrics collector.
+
+        Args:
+            name (str): Name of the component
+            collector (Callable[[], dict]): Function returning current metrics
+        """
+        self._collectors[name] = collector
+
+    def collect(self) -> dict[str, dict]:
+        """Collect metrics from all registered components.
+
+        Returns:
+            dict[str, dict]: Metrics grouped by component name
+        """
+        return {name: collector() for name, collector in self._collectors.items()}
+
+
+metrics = MetricsRegistry()
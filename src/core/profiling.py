@@ -0,0 +1,360 @@
+import asyncio
+import cProfile
+import html
+import io
+import itertools
+import json
+import os
+import pstats
+import re
+import time
+from urllib.parse import parse_qs
+
+import jwt
+from fastapi import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.db.database import async_session
+from src.core.dependencies import get_admin_user, get_current_user
+from src.crud import UserDAO
+from src.settings import settings
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+    from pyinstrument.renderers import JSONRenderer
+except ImportError:  # pragma: no cover - optional dependency
+    PyinstrumentProfiler = None
+    JSONRenderer = None
+
+
+PROFILE_MODES = {"html", "json", "store"}
+
+
+class RequestProfiler:
+    """Profiler wrapper for a single request.
+
+    Uses pyinstrument (sampling, async-aware) when it is installed and falls
+    back to the standard library cProfile otherwise.
+
+    Methods:
+        start: Start collecting samples
+        stop: Stop collecting samples
+        render: Render collected data as HTML or JSON
+    """
+
+    def __init__(self):
+        if PyinstrumentProfiler is not None:
+            self._profiler = PyinstrumentProfiler(async_mode="enabled")
+        else:
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling."""
+        if PyinstrumentProfiler is not None:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        if PyinstrumentProfiler is not None:
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def render(self, fmt: str) -> tuple[bytes, str]:
+        """Render the collected profile.
+
+        Args:
+            fmt (str): Output format, either "html" or "json"
+
+        Returns:
+            tuple[bytes, str]: Rendered profile and its media type
+        """
+        if PyinstrumentProfiler is not None:
+            if fmt == "json":
+                content = self._profiler.output(JSONRenderer())
+                return content.encode(), "application/json"
+            return self._profiler.output_html().encode(), "text/html"
+
+        stats = pstats.Stats(self._profiler)
+        if fmt == "json":
+            rows = [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": calls,
+                    "total_time": total_time,
+                    "cumulative_time": cumulative_time,
+                }
+                for (filename, line, name), (
+                    _,
+                    calls,
+                    total_time,
+                    cumulative_time,
+                    _,
+                ) in stats.stats.items()
+            ]
+            rows.sort(key=lambda row: row["cumulative_time"], reverse=True)
+            return json.dumps(rows[:100]).encode(), "application/json"
+
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats("cumulative").print_stats(100)
+        content = f"<html><body><pre>{html.escape(buffer.getvalue())}</pre></body></html>"
+        return content.encode(), "text/html"
+
+
+class ProfileStore:
+    """Directory-backed storage for rendered profiles.
+
+    Keeps at most `max_stored` profiles, removing the oldest ones first.
+
+    Attributes:
+        directory (str): Directory where profiles are written
+        max_stored (int): Maximum number of profiles to keep
+    """
+
+    PROFILE_ID_PATTERN = re.compile(r"^[\w.-]+$")
+
+    def __init__(self, directory: str, max_stored: int):
+        self.directory = directory
+        self.max_stored = max_stored
+
+    @staticmethod
+    def make_id(scope: Scope, fmt: str) -> str:
+        """Build a unique profile id for a request.
+
+        Args:
+            scope (Scope): ASGI scope of the profiled request
+            fmt (str): Output format used as the file extension
+
+        Returns:
+            str: Profile id
+        """
+        slug = re.sub(r"[^\w]+", "_", scope["path"]).strip("_") or "root"
+        return f"{time.time_ns()}_{scope['method'].lower()}_{slug}.{fmt}"
+
+    def save(self, profile_id: str, content: bytes) -> None:
+        """Write a profile to disk and drop the oldest extra ones.
+
+        Args:
+            profile_id (str): Id returned by make_id
+            content (bytes): Rendered profile
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, profile_id), "wb") as f:
+            f.write(content)
+
+        profiles = self.list()
+        for stale in profiles[self.max_stored :]:
+            os.remove(os.path.join(self.directory, stale))
+
+    def list(self) -> list[str]:
+        """List stored profile ids, newest first.
+
+        Returns:
+            list[str]: Stored profile ids
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(os.listdir(self.directory), reverse=True)
+
+    def path(self, profile_id: str) -> str:
+        """Resolve the file path of a stored profile.
+
+        Args:
+            profile_id (str): Profile id
+
+        Returns:
+            str: Path to the profile file
+
+        Raises:
+            HTTPException: 404 if the profile does not exist
+        """
+        file_path = os.path.join(self.directory, profile_id)
+        if not self.PROFILE_ID_PATTERN.match(profile_id) or not os.path.isfile(
+            file_path
+        ):
+            raise HTTPException(status_code=404, detail="Profile not found")
+        return file_path
+
+
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_STORED)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware for on-demand and sampled request profiling.
+
+    A supervisor triggers profiling with the `X-Profile` header or the
+    `profile` query parameter. Supported values:
+        html, json - return the profile instead of the response body
+        store - return the normal response and store the profile,
+            its id is sent in the `X-Profile-Id` header
+
+    When PROFILING_SAMPLE_ROUTE and PROFILING_SAMPLE_RATE are set, every
+    N-th request to that path is profiled and stored as well.
+
+    The middleware is only installed when PROFILING_ENABLED is set, so regular
+    deployments do not pay for it at all.
+    """
+
+    def __init__(self, app: ASGIApp, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self._sample_route = settings.PROFILING_SAMPLE_ROUTE
+        self._sample_rate = settings.PROFILING_SAMPLE_RATE
+        self._sample_counter = itertools.count(1)
+        self._lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self._requested_mode(scope)
+        if mode is not None:
+            await self._profile_on_demand(scope, receive, send, mode)
+        elif self._is_sampled(scope) and not self._lock.locked():
+            await self._profile_and_store(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    @staticmethod
+    def _requested_mode(scope: Scope) -> str | None:
+        """Extract the requested profiling mode from headers or query string.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+
+        Returns:
+            str | None: Requested mode or None if profiling was not requested
+        """
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return value.decode("latin-1").lower()
+
+        query_string = scope.get("query_string", b"")
+        if b"profile=" in query_string:
+            values = parse_qs(query_string.decode("latin-1")).get("profile")
+            if values:
+                return values[0].lower()
+        return None
+
+    def _is_sampled(self, scope: Scope) -> bool:
+        """Check whether the request falls into the sampled profiling mode.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+
+        Returns:
+            bool: True if the request should be profiled
+        """
+        if self._sample_rate <= 0 or scope["path"] != self._sample_route:
+            return False
+        return next(self._sample_counter) % self._sample_rate == 0
+
+    @staticmethod
+    async def _authorize(scope: Scope) -> None:
+        """Ensure that the request comes from a supervisor.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+
+        Raises:
+            HTTPException:
+                401 - If token is missing or invalid
+                403 - If the user is not an admin
+        """
+        access_token = Request(scope).cookies.get("access_token")
+        async with async_session() as session:
+            try:
+                user = await get_current_user(
+                    access_token=access_token, db_user=UserDAO(session)
+                )
+            except jwt.PyJWTError:
+                raise HTTPException(status_code=401, detail="Invalid token")
+            await get_admin_user(user=user)
+
+    async def _profile_on_demand(
+        self, scope: Scope, receive: Receive, send: Send, mode: str
+    ) -> None:
+        """Profile a request explicitly requested by a supervisor.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+            receive (Receive): ASGI receive callable
+            send (Send): ASGI send callable
+            mode (str): Requested profiling mode
+        """
+        if mode not in PROFILE_MODES:
+            response = JSONResponse(
+                {"detail": f"Unknown profile mode. Allowed: {', '.join(PROFILE_MODES)}"},
+                status_code=400,
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self._authorize(scope)
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            await response(scope, receive, send)
+            return
+
+        if mode == "store":
+            await self._profile_and_store(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def discard(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        async with self._lock:
+            profiler = RequestProfiler()
+            profiler.start()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                profiler.stop()
+
+        content, media_type = profiler.render(mode)
+        response = Response(
+            content,
+            media_type=media_type,
+            headers={"X-Profile-Status": str(status_code)},
+        )
+        await response(scope, receive, send)
+
+    async def _profile_and_store(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Profile a request, pass its response through and store the profile.
+
+        Args:
+            scope (Scope): ASGI scope of the request
+            receive (Receive): ASGI receive callable
+            send (Send): ASGI send callable
+        """
+        profile_id = self.store.make_id(scope, "html")
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        async with self._lock:
+            profiler = RequestProfiler()
+            profiler.start()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profiler.stop()
+                content, _ = profiler.render("html")
+                await asyncio.to_thread(self.store.save, profile_id, content)
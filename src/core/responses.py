@@ -0,0 +1,182 @@
+from functools import lru_cache
+from mimetypes import guess_type
+from typing import Any, Mapping, Optional
+from urllib.parse import quote
+
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+@lru_cache(maxsize=None)
+def _get_adapter(model_type: Any) -> TypeAdapter:
+    """Get a cached TypeAdapter for a response type.
+
+    Args:
+        model_type (Any): Response type, e.g. List[AudioFullInfo]
+
+    Returns:
+        TypeAdapter: Adapter used for serialization
+    """
+    return TypeAdapter(model_type)
+
+
+def render_model_json(content: Any, model_type: Any) -> bytes:
+    """Serialize validated Pydantic models to JSON bytes.
+
+    Args:
+        content (Any): Pydantic model or a collection of models
+        model_type (Any): Type describing the content
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    return _get_adapter(model_type).dump_json(content)
+
+
+def content_disposition(filename: str) -> str:
+    """Build an attachment Content-Disposition header value.
+
+    Non-ASCII filenames are sent RFC 5987 encoded, the same way
+    Starlette's FileResponse does it.
+
+    Args:
+        filename (str): Filename offered to the client
+
+    Returns:
+        str: Header value
+    """
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+class ModelResponse(Response):
+    """JSON response for objects that are already validated Pydantic models.
+
+    FastAPI validates a returned value against `response_model` once more
+    before encoding it. Returning this response from an endpoint skips that
+    step: the content is serialized straight to JSON bytes by pydantic-core.
+    Keep `response_model` on the route so the OpenAPI schema stays the same.
+
+    Example:
+        return ModelResponse(audio_files, List[AudioFullInfo])
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        model_type: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ):
+        """Initialize the response.
+
+        Args:
+            content (Any): Pydantic model or a collection of models
+            model_type (Any): Type describing the content
+            status_code (int, optional): HTTP status code. Defaults to 200.
+            headers (Mapping[str, str], optional): Extra response headers
+            background (BackgroundTask, optional): Task to run after sending
+        """
+        self._adapter = _get_adapter(model_type)
+        super().__init__(content, status_code, headers, background=background)
+
+    def render(self, content: Any) -> bytes:
+        """Serialize the content to JSON bytes.
+
+        Args:
+            content (Any): Pydantic model or a collection of models
+
+        Returns:
+            bytes: Encoded JSON
+        """
+        return self._adapter.dump_json(content)
+
+
+class MemoryFileResponse(Response):
+    """File download response for a body already held in memory.
+
+    Supports single `Range: bytes=...` requests like FileResponse, so
+    seeking in players works the same for cached and uncached files.
+    Multi-range requests and requests whose If-Range does not match the
+    ETag get the whole body.
+
+    Example:
+        return MemoryFileResponse(body, request.headers.get("range"), "song.mp3")
+    """
+
+    def __init__(
+        self,
+        body: bytes,
+        range_header: Optional[str],
+        filename: str,
+        headers: Mapping[str, str] | None = None,
+        if_range: Optional[str] = None,
+        media_type: Optional[str] = None,
+    ):
+        """Initialize the response.
+
+        Args:
+            body (bytes): Whole file body
+            range_header (str, optional): Value of the Range request header
+            filename (str): Filename offered to the client
+            headers (Mapping[str, str], optional): Extra response headers,
+                e.g. ETag and Last-Modified
+            if_range (str, optional): Value of the If-Range request header
+            media_type (str, optional): Content type. Guessed from
+                the filename by default.
+        """
+        headers = dict(headers or {})
+        headers["Accept-Ranges"] = "bytes"
+        headers["Content-Disposition"] = content_disposition(filename)
+        media_type = media_type or guess_type(filename)[0] or "application/octet-stream"
+
+        status_code = 200
+        byte_range = None
+        if range_header and (if_range is None or if_range == headers.get("ETag")):
+            byte_range = self.parse_range(range_header, len(body))
+        if byte_range == ():
+            status_code = 416
+            headers["Content-Range"] = f"bytes */{len(body)}"
+            body = b""
+        elif byte_range:
+            start, end = byte_range
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            body = body[start : end + 1]
+        super().__init__(body, status_code, headers, media_type)
+
+    @staticmethod
+    def parse_range(header: str, size: int) -> Optional[tuple]:
+        """Parse a single byte range.
+
+        Args:
+            header (str): Value of the Range header
+            size (int): Size of the body
+
+        Returns:
+            Optional[tuple]: Inclusive (start, end) offsets, an empty tuple
+                for an unsatisfiable range, or None to send the whole body
+        """
+        unit, _, ranges = header.partition("=")
+        if unit.strip().lower() != "bytes" or "," in ranges:
+            return None
+        first, _, last = ranges.strip().partition("-")
+        try:
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            elif last:
+                start, end = max(size - int(last), 0), size - 1
+            else:
+                return None
+        except ValueError:
+            return None
+        if start >= size or start > end:
+            return ()
+        return start, end
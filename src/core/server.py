@@ -0,0 +1,51 @@
+import importlib.util
+import os
+
+from src.settings import settings
+
+
+def _installed(module: str) -> bool:
+    """Check whether an optional module can be imported.
+
+    Args:
+        module (str): Module name
+
+    Returns:
+        bool: True if the module is installed
+    """
+    return importlib.util.find_spec(module) is not None
+
+
+def get_server_options() -> dict:
+    """Build uvicorn options for the configured SERVER_MODE.
+
+    In "production" mode the server runs SERVER_WORKERS processes
+    (one per CPU core when set to 0), uses uvloop and httptools when
+    they are installed and applies the tuned backlog and keep-alive.
+    Any other mode runs a single process with uvicorn defaults.
+    In both modes open requests get SHUTDOWN_TIMEOUT_SECONDS to finish
+    after SIGTERM before they are cancelled.
+
+    Returns:
+        dict: Keyword arguments for uvicorn.run
+    """
+    options = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "timeout_graceful_shutdown": settings.SHUTDOWN_TIMEOUT_SECONDS,
+    }
+
+    if settings.SERVER_MODE != "production":
+        return options
+
+    return {
+        **options,
+        "workers": settings.SERVER_WORKERS or os.cpu_count() or 1,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_TIMEOUT,
+        "proxy_headers": True,
+        "forwarded_allow_ips": "*",
+    }
@@ -1,4 +1,6 @@
 from src.crud.user import UserDAO
 from src.crud.audio import AudioDAO
+from src.crud.fingerprint import AudioFingerprintDAO
+from src.crud.job import JobDAO
 
-__all__ = ["UserDAO", "AudioDAO"]
+__all__ = ["UserDAO", "AudioDAO", "AudioFingerprintDAO", "JobDAO"]
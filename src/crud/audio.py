@@ -1,15 +1,731 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import bindparam, delete, func, insert, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.models import AudioInfo
 from src.crud.base import BaseDAO
+from src.core.db.batching import audio_insert_batcher
+from src.core.db.shards import DEFAULT_SHARD, shard_router
+from src.core.decorators import handle_db_errors
+
+T = TypeVar("T")
 
 
 class AudioDAO(BaseDAO):
     """Data Access Object for audio files.
 
     This class provides CRUD operations for audio files in the database.
-    Inherits all basic CRUD operations from BaseDAO.
+    Queries are routed to the shard of the owning user; queries without
+    a user run on every shard and their results are merged. The injected
+    session serves the default shard, sessions to other shards are opened
+    per call.
 
     Attributes:
         model (AudioInfo): SQLAlchemy model for audio files
+        LISTING_COLUMNS (dict): Columns of listing fields by field name
     """
 
     model = AudioInfo
+
+    LISTING_COLUMNS = {
+        "audio_id": AudioInfo.id,
+        "filename": AudioInfo.filename,
+        "user_filename": AudioInfo.user_filename,
+        "user_id": AudioInfo.user_id,
+        "path": AudioInfo.path,
+        "size": AudioInfo.size,
+        "is_deleted": AudioInfo.is_deleted,
+        "created_at": AudioInfo.created_at,
+        "tier": AudioInfo.tier,
+    }
+
+    def _listing_columns(self, fields: Optional[Sequence[str]] = None) -> list:
+        """Build the SELECT list for listing fields.
+
+        Args:
+            fields (Sequence[str], optional): Field names. Defaults to all.
+
+        Returns:
+            list: Labelled columns
+        """
+        names = fields or self.LISTING_COLUMNS
+        return [self.LISTING_COLUMNS[name].label(name) for name in names]
+
+    @asynccontextmanager
+    async def _shard_session(self, shard: str) -> AsyncIterator[AsyncSession]:
+        """Get a session to a shard.
+
+        Args:
+            shard (str): Shard name
+
+        Yields:
+            AsyncSession: The injected session for the default shard,
+                a new session for other shards
+        """
+        if shard == DEFAULT_SHARD:
+            yield self.session
+        else:
+            async with shard_router.session(shard) as session:
+                yield session
+
+    @asynccontextmanager
+    async def _user_session(self, user_id: int) -> AsyncIterator[AsyncSession]:
+        """Get a session to the shard of a user.
+
+        Args:
+            user_id (int): ID of the user
+
+        Yields:
+            AsyncSession: Session to the user's shard
+        """
+        shard = await shard_router.shard_for_user(user_id)
+        async with self._shard_session(shard) as session:
+            yield session
+
+    async def _scatter(
+        self, operation: Callable[[AsyncSession], Awaitable[T]]
+    ) -> list[T]:
+        """Run an operation on every shard concurrently.
+
+        Args:
+            operation (Callable[[AsyncSession], Awaitable[T]]): Operation
+                taking a session
+
+        Returns:
+            list[T]: Results by shard, the default shard first
+        """
+        if not shard_router.is_sharded:
+            return [await operation(self.session)]
+
+        async def run(shard: str) -> T:
+            async with self._shard_session(shard) as session:
+                return await operation(session)
+
+        return await asyncio.gather(*(run(shard) for shard in shard_router.names))
+
+    @staticmethod
+    def _merge_pages(pages: list[list[tuple]], limit: int) -> list[tuple]:
+        """Merge id-ordered pages from several shards into one page.
+
+        Rows of a user being moved may exist on two shards, they are
+        returned once.
+
+        Args:
+            pages (list[list[tuple]]): Pages whose rows start with the id
+            limit (int): Maximum number of rows
+
+        Returns:
+            list[tuple]: Rows ordered by id
+        """
+        rows = {row[0]: row for page in pages for row in page}
+        return [rows[audio_id] for audio_id in sorted(rows)][:limit]
+
+    async def _ensure_writable_ids(self, ids: list[int]) -> None:
+        """Reject writes to audio records of users being moved.
+
+        Args:
+            ids (list[int]): Audio IDs
+
+        Raises:
+            HTTPException: 503 if an owner of the records is being moved
+        """
+        if shard_router.is_sharded:
+            await shard_router.ensure_writable(*await self.find_user_ids(ids))
+
+    @handle_db_errors
+    async def _write(self, stmt, shard: Optional[str] = None) -> list:
+        """Execute a write statement on one shard or on every shard.
+
+        Args:
+            stmt: INSERT, UPDATE or DELETE statement with RETURNING
+            shard (str, optional): Shard name. Defaults to every shard.
+
+        Returns:
+            list: Returned rows of all shards
+        """
+
+        async def run(session: AsyncSession) -> list:
+            result = await session.execute(stmt)
+            rows = result.all()
+            await session.commit()
+            return rows
+
+        if shard is not None:
+            async with self._shard_session(shard) as session:
+                return await run(session)
+        return [row for rows in await self._scatter(run) for row in rows]
+
+    async def add(self, data: dict | BaseModel):
+        """Creates an audio record in the shard of its owner.
+
+        With INSERT_BATCH_ENABLED the record is written together with
+        other concurrent uploads in one transaction.
+
+        Args:
+            data (dict | BaseModel): Dictionary or Pydantic model
+                with data for creation
+
+        Returns:
+            AudioInfo: Created model instance
+
+        Raises:
+            HTTPException: 503 if the owner is being moved to another shard
+        """
+        if isinstance(data, BaseModel):
+            data = data.model_dump()
+        await shard_router.ensure_writable(data["user_id"])
+        shard = await shard_router.shard_for_user(data["user_id"])
+        if audio_insert_batcher.enabled:
+            return await self._add_batched(shard, data)
+        if shard != DEFAULT_SHARD and "id" not in data:
+            data = {**data, "id": (await shard_router.allocate_audio_ids(1))[0]}
+
+        query = insert(self.model).values(**data).returning(self.model)
+        return (await self._write(query, shard))[0][0]
+
+    @handle_db_errors
+    async def _add_batched(self, shard: str, data: dict):
+        """Create an audio record as part of a group commit.
+
+        Args:
+            shard (str): Shard name
+            data (dict): Data for creation
+
+        Returns:
+            AudioInfo: Created model instance
+        """
+        return await audio_insert_batcher.add(shard, data)
+
+    @handle_db_errors
+    async def find_one_or_none(self, **filter_by):
+        """Finds one audio record by given filters.
+
+        Searches the shard of `user_id` if it is given, all shards otherwise.
+
+        Args:
+            **filter_by: Arguments for WHERE condition
+                (example: id=1, is_deleted=False)
+
+        Returns:
+            AudioInfo | None: Found model object or None if not found
+        """
+        query = select(self.model).filter_by(**filter_by)
+        if "user_id" in filter_by:
+            async with self._user_session(filter_by["user_id"]) as session:
+                return (await session.execute(query)).scalar_one_or_none()
+
+        async def find(session: AsyncSession):
+            return (await session.execute(query)).scalar_one_or_none()
+
+        return next(
+            (audio for audio in await self._scatter(find) if audio is not None), None
+        )
+
+    @handle_db_errors
+    async def find_one(self, **filter_by):
+        """Finds one audio record by given filters.
+
+        Args:
+            **filter_by: Arguments for WHERE condition
+                (example: id=1, is_deleted=False)
+
+        Returns:
+            AudioInfo: Found model object
+
+        Raises:
+            HTTPException: 404 if the record is not found
+        """
+        audio = await self.find_one_or_none(**filter_by)
+        if not audio:
+            raise HTTPException(
+                status_code=404,
+                detail=f"{self.model.__name__} with filter {filter_by} not found",
+            )
+        return audio
+
+    @handle_db_errors
+    async def find_all(self, **filter_by):
+        """Finds all audio records by given filters.
+
+        Args:
+            **filter_by: Arguments for WHERE condition
+                (example: user_id=1, is_deleted=False)
+
+        Returns:
+            list[AudioInfo]: List of found model objects
+        """
+        query = select(self.model).filter_by(**filter_by)
+        if "user_id" in filter_by:
+            async with self._user_session(filter_by["user_id"]) as session:
+                return (await session.execute(query)).scalars().all()
+
+        async def find(session: AsyncSession):
+            return (await session.execute(query)).scalars().all()
+
+        found = {}
+        for audio_files in await self._scatter(find):
+            for audio in audio_files:
+                found.setdefault(audio.id, audio)
+        return list(found.values())
+
+    @handle_db_errors
+    async def _locate(self, audio_id: int) -> tuple[str, int]:
+        """Find the shard holding an audio record.
+
+        Args:
+            audio_id (int): ID of the audio record
+
+        Returns:
+            tuple[str, int]: Shard name and owner ID
+
+        Raises:
+            HTTPException: 404 if the record is not found
+        """
+        query = select(self.model.user_id).where(self.model.id == audio_id)
+
+        async def find(session: AsyncSession) -> Optional[int]:
+            return (await session.execute(query)).scalar_one_or_none()
+
+        for shard, user_id in zip(shard_router.names, await self._scatter(find)):
+            if user_id is not None:
+                return shard, user_id
+        raise HTTPException(
+            status_code=404,
+            detail=f"{self.model.__name__} with id {audio_id} not found",
+        )
+
+    async def delete(self, model_id: int):
+        """Deletes an audio record by ID.
+
+        Args:
+            model_id (int): Record ID to delete
+
+        Returns:
+            bool: True if deletion was successful
+
+        Raises:
+            HTTPException:
+                404 - If the record is not found
+                503 - If the owner is being moved to another shard
+        """
+        shard, user_id = await self._locate(model_id)
+        await shard_router.ensure_writable(user_id)
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == model_id)
+            .returning(self.model.id)
+        )
+        await self._write(stmt, shard)
+        return True
+
+    async def update(self, model_id: int, **update_data):
+        """Updates an audio record by ID.
+
+        Args:
+            model_id (int): Record ID to update
+            **update_data: Data to update
+                (example: is_deleted=True)
+
+        Returns:
+            list[AudioInfo]: Updated model objects
+
+        Raises:
+            HTTPException:
+                404 - If the record is not found
+                503 - If the owner is being moved to another shard
+        """
+        shard, user_id = await self._locate(model_id)
+        await shard_router.ensure_writable(user_id)
+        stmt = (
+            update(self.model)
+            .where(self.model.id == model_id)
+            .values(**update_data)
+            .returning(self.model)
+        )
+        return [row[0] for row in await self._write(stmt, shard)]
+
+    async def update_many(self, ids: list[int], values: dict, **filter_by):
+        """Updates several audio records by ID on every shard.
+
+        Args:
+            ids (list[int]): Record IDs to update
+            values (dict): Data to update
+                (example: {"is_deleted": True})
+            **filter_by: Extra WHERE conditions
+                (example: is_deleted=False)
+
+        Returns:
+            list[int]: IDs of the updated records
+
+        Raises:
+            HTTPException: 503 if an owner is being moved to another shard
+        """
+        await self._ensure_writable_ids(ids)
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .filter_by(**filter_by)
+            .values(**values)
+            .returning(self.model.id)
+        )
+        return [row[0] for row in await self._write(stmt)]
+
+    @handle_db_errors
+    async def has_upload(self, user_id: int, upload_id: str) -> bool:
+        """Check whether a direct upload has already been registered.
+
+        Stored names of direct uploads end with the upload id.
+
+        Args:
+            user_id (int): ID of the user
+            upload_id (str): Identifier from the upload slot
+
+        Returns:
+            bool: True if a record of the upload exists
+        """
+        query = select(self.model.id).where(
+            self.model.user_id == user_id,
+            self.model.filename.endswith(f"_{upload_id}", autoescape=True),
+        )
+        async with self._user_session(user_id) as session:
+            return (await session.execute(query.limit(1))).first() is not None
+
+    @handle_db_errors
+    async def find_listing(
+        self,
+        user_id: int,
+        include_deleted: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> list[dict]:
+        """Get a user's audio records selecting only the requested fields.
+
+        Args:
+            user_id (int): ID of the user
+            include_deleted (bool, optional): Whether to include deleted files.
+                Defaults to False.
+            fields (Sequence[str], optional): Listing fields to select.
+                Defaults to all.
+
+        Returns:
+            list[dict]: Records as field mappings
+        """
+        query = select(*self._listing_columns(fields)).where(
+            self.model.user_id == user_id
+        )
+        if not include_deleted:
+            query = query.where(self.model.is_deleted.is_(False))
+        async with self._user_session(user_id) as session:
+            result = await session.execute(query.order_by(self.model.id))
+            return [dict(row) for row in result.mappings().all()]
+
+    async def delete_many_with_paths(
+        self, ids: list[int] | None = None, user_ids: list[int] | None = None
+    ) -> list[tuple[int, str]]:
+        """Deletes audio records by ID or owner with one statement per shard.
+
+        Args:
+            ids (list[int], optional): Audio IDs to delete
+            user_ids (list[int], optional): Delete all audio of these users
+
+        Returns:
+            list[tuple[int, str]]: IDs and paths of the deleted records
+
+        Raises:
+            ValueError: If neither `ids` nor `user_ids` is given
+            HTTPException: 503 if an owner is being moved to another shard
+        """
+        if ids is None and user_ids is None:
+            raise ValueError("ids or user_ids is required")
+        if ids == [] or user_ids == []:
+            return []
+        if ids is not None:
+            await self._ensure_writable_ids(ids)
+        if user_ids is not None:
+            await shard_router.ensure_writable(*user_ids)
+
+        stmt = delete(self.model).returning(self.model.id, self.model.path)
+        if ids is not None:
+            stmt = stmt.where(self.model.id.in_(ids))
+        if user_ids is not None:
+            stmt = stmt.where(self.model.user_id.in_(user_ids))
+        return [tuple(row) for row in await self._write(stmt)]
+
+    @handle_db_errors
+    async def find_user_ids(self, ids: list[int]) -> set[int]:
+        """Get the owners of audio records.
+
+        Args:
+            ids (list[int]): Audio IDs
+
+        Returns:
+            set[int]: IDs of the users owning the records
+        """
+        query = select(self.model.user_id).where(self.model.id.in_(ids)).distinct()
+
+        async def find(session: AsyncSession) -> set[int]:
+            return set((await session.execute(query)).scalars().all())
+
+        return set().union(*await self._scatter(find))
+
+    @handle_db_errors
+    async def get_listing_version(self, user_id: int, include_deleted: bool = False):
+        """Get values identifying the current state of a user's audio listing.
+
+        Uploads change the maximum id, hard deletes change the count.
+        The latest deletion and update times are taken over all rows of
+        the user, deleted ones included, so soft deletes and updates such
+        as tier moves change them even when the row leaves the listing.
+
+        Args:
+            user_id (int): ID of the user
+            include_deleted (bool, optional): Whether the listing includes
+                deleted files. Defaults to False.
+
+        Returns:
+            tuple: Count, max id, latest creation, deletion and update times
+        """
+        listed = true() if include_deleted else self.model.is_deleted.is_(False)
+        query = select(
+            func.count(self.model.id).filter(listed),
+            func.max(self.model.id).filter(listed),
+            func.max(self.model.created_at).filter(listed),
+            func.max(self.model.deleted_at),
+            func.max(self.model.updated_at),
+        ).where(self.model.user_id == user_id)
+        async with self._user_session(user_id) as session:
+            result = await session.execute(query)
+            return tuple(result.one())
+
+    async def purge_deleted(
+        self, before: datetime, limit: int
+    ) -> list[tuple[int, str, int]]:
+        """Hard-delete a batch of audio soft-deleted before the given time.
+
+        Rows deleted before `deleted_at` was introduced fall back
+        to their `created_at`. Every shard deletes up to `limit` rows.
+
+        Args:
+            before (datetime): Purge rows deleted earlier than this time
+            limit (int): Maximum number of rows to delete per shard
+
+        Returns:
+            list[tuple[int, str, int]]: Ids, paths and owner ids of the deleted rows
+        """
+        expired = (
+            select(self.model.id)
+            .where(
+                self.model.is_deleted.is_(True),
+                func.coalesce(self.model.deleted_at, self.model.created_at) < before,
+            )
+            .limit(limit)
+        )
+        stmt = (
+            delete(self.model)
+            .where(self.model.id.in_(expired))
+            .returning(self.model.id, self.model.path, self.model.user_id)
+        )
+
+        async def run(session: AsyncSession) -> list[tuple[int, str, int]]:
+            result = await session.execute(stmt)
+            rows = [tuple(row) for row in result.all()]
+            await session.commit()
+            return rows
+
+        return self._merge_pages(await self._scatter(run), limit * len(shard_router.names))
+
+    async def find_paths_page(
+        self, after_id: int, limit: int
+    ) -> list[tuple[int, str]]:
+        """Get a page of audio ids and paths ordered by id.
+
+        Args:
+            after_id (int): Return rows with id greater than this one
+            limit (int): Maximum number of rows
+
+        Returns:
+            list[tuple[int, str]]: Ids and paths
+        """
+        query = (
+            select(self.model.id, self.model.path)
+            .where(self.model.id > after_id)
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+
+        async def find(session: AsyncSession) -> list[tuple[int, str]]:
+            return [tuple(row) for row in (await session.execute(query)).all()]
+
+        return self._merge_pages(await self._scatter(find), limit)
+
+    async def find_existing_paths(self, paths: list[str]) -> set[str]:
+        """Filter paths that belong to an audio record.
+
+        Args:
+            paths (list[str]): File paths to check
+
+        Returns:
+            set[str]: Paths that have a matching row
+        """
+        query = select(self.model.path).where(self.model.path.in_(paths))
+
+        async def find(session: AsyncSession) -> set[str]:
+            return set((await session.execute(query)).scalars().all())
+
+        return set().union(*await self._scatter(find))
+
+    async def stream_records(
+        self,
+        user_id: Optional[int] = None,
+        is_deleted: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        batch_size: int = 1000,
+        fields: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Stream audio records through a server-side cursor.
+
+        Rows are fetched `batch_size` at a time, so memory use does not
+        depend on the number of matching records. Without `user_id` the
+        shards are read one after another, records are ordered by id
+        within each shard.
+
+        Args:
+            user_id (int, optional): Only records of this user
+            is_deleted (bool, optional): Only records with this deleted state
+            created_from (datetime, optional): Only records created at or after
+            created_to (datetime, optional): Only records created before
+            batch_size (int, optional): Rows fetched per round trip.
+                Defaults to 1000.
+            fields (Sequence[str], optional): Listing fields to select.
+                Defaults to all.
+
+        Yields:
+            list[dict]: Batches of records as column mappings
+        """
+        query = select(*self._listing_columns(fields)).order_by(self.model.id)
+        if user_id is not None:
+            query = query.where(self.model.user_id == user_id)
+        if is_deleted is not None:
+            query = query.where(self.model.is_deleted.is_(is_deleted))
+        if created_from is not None:
+            query = query.where(self.model.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(self.model.created_at < created_to)
+        query = query.execution_options(yield_per=batch_size)
+
+        if user_id is not None:
+            shards = [await shard_router.shard_for_user(user_id)]
+        else:
+            shards = shard_router.names
+        for shard in shards:
+            async with self._shard_session(shard) as session:
+                result = await session.stream(query)
+                async for partition in result.mappings().partitions():
+                    yield [dict(row) for row in partition]
+
+    async def record_accesses(self, accesses: dict[int, datetime]) -> None:
+        """Store last access times of several audio files in one batch.
+
+        A time older than the stored one does not overwrite it. `updated_at`
+        is kept, since access times are not part of the listing. The batch
+        is applied on every shard, so both copies of a record being moved
+        stay equal.
+
+        Args:
+            accesses (dict[int, datetime]): Last access time by audio id
+        """
+        table = self.model.__table__
+        stmt = (
+            update(table)
+            .where(
+                table.c.id == bindparam("b_id"),
+                or_(
+                    table.c.last_accessed_at.is_(None),
+                    table.c.last_accessed_at < bindparam("b_accessed_at"),
+                ),
+            )
+            .values(
+                last_accessed_at=bindparam("b_accessed_at"),
+                updated_at=table.c.updated_at,
+            )
+        )
+        params = [
+            {"b_id": audio_id, "b_accessed_at": accessed_at}
+            for audio_id, accessed_at in accesses.items()
+        ]
+
+        async def run(session: AsyncSession) -> None:
+            await session.execute(stmt, params)
+            await session.commit()
+
+        await self._scatter(run)
+
+    async def find_demotion_candidates(
+        self, before: datetime, after_id: int, limit: int
+    ) -> list[tuple[int, str, str]]:
+        """Get a page of hot audio files not accessed since the given time.
+
+        Files never downloaded are judged by their upload time.
+
+        Args:
+            before (datetime): Files last accessed earlier are candidates
+            after_id (int): Return rows with id greater than this one
+            limit (int): Maximum number of files
+
+        Returns:
+            list[tuple[int, str, str]]: Ids, filenames and paths
+        """
+        query = (
+            select(self.model.id, self.model.filename, self.model.path)
+            .where(
+                self.model.id > after_id,
+                self.model.tier == "hot",
+                func.coalesce(self.model.last_accessed_at, self.model.created_at)
+                < before,
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+        )
+
+        async def find(session: AsyncSession) -> list[tuple[int, str, str]]:
+            return [tuple(row) for row in (await session.execute(query)).all()]
+
+        return self._merge_pages(await self._scatter(find), limit)
+
+    async def move_to_tier(
+        self, audio_id: int, old_path: str, new_path: str, tier: str
+    ) -> bool:
+        """Point an audio record to its copy in another tier.
+
+        The update only applies if the record still has `old_path`,
+        so concurrent moves of the same file cannot both succeed. It is
+        applied on every shard holding the record.
+
+        Args:
+            audio_id (int): ID of the audio file
+            old_path (str): Path the record is expected to have
+            new_path (str): Path of the file in the new tier
+            tier (str): The new tier
+
+        Returns:
+            bool: True if the record was updated
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id == audio_id, self.model.path == old_path)
+            .values(path=new_path, tier=tier)
+            .returning(self.model.id)
+        )
+
+        async def run(session: AsyncSession) -> bool:
+            result = await session.execute(stmt)
+            await session.commit()
+            return result.scalar_one_or_none() is not None
+
+        return any(await self._scatter(run))
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy import insert, delete, update
@@ -74,6 +76,30 @@ class BaseDAO:
             )
         return result
 
+    @handle_db_errors
+    async def find_one_fields(self, fields: Sequence[str], **filter_by) -> dict:
+        """Finds one record by given filters, selecting only some columns.
+
+        Args:
+            fields (Sequence[str]): Names of the columns to select
+            **filter_by: Arguments for WHERE condition
+                (example: username="john")
+
+        Returns:
+            dict: Selected column values by name
+        """
+        query = select(*(getattr(self.model, name) for name in fields)).filter_by(
+            **filter_by
+        )
+        res = await self.session.execute(query)
+        result = res.mappings().one_or_none()
+        if not result:
+            raise HTTPException(
+                status_code=404,
+                detail=f"{self.model.__name__} with filter {filter_by} not found",
+            )
+        return dict(result)
+
     @handle_db_errors
     async def find_one_or_none(self, **filter_by):
         """Finds one record by given filters.
@@ -158,3 +184,49 @@ class BaseDAO:
         await self.session.commit()
 
         return result.scalars().all()
+
+    @handle_db_errors
+    async def update_many(self, ids: list[int], values: dict, **filter_by):
+        """Updates several records by ID with one statement.
+
+        Args:
+            ids (list[int]): Record IDs to update
+            values (dict): Data to update
+                (example: {"is_active": False})
+            **filter_by: Extra WHERE conditions
+                (example: is_active=True)
+
+        Returns:
+            list[int]: IDs of the updated records
+        """
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(ids))
+            .filter_by(**filter_by)
+            .values(**values)
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalars().all()
+
+    @handle_db_errors
+    async def delete_many(self, ids: list[int], **filter_by):
+        """Deletes several records by ID with one statement.
+
+        Args:
+            ids (list[int]): Record IDs to delete
+            **filter_by: Extra WHERE conditions
+
+        Returns:
+            list[int]: IDs of the deleted records
+        """
+        stmt = (
+            delete(self.model)
+            .where(self.model.id.in_(ids))
+            .filter_by(**filter_by)
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalars().all()
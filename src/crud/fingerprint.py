@@ -0,0 +1,145 @@
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.orm import aliased
+
+from src.models import AudioFingerprint, AudioFingerprintHash, AudioInfo
+from src.crud.base import BaseDAO
+from src.core.decorators import handle_db_errors
+
+
+class AudioFingerprintDAO(BaseDAO):
+    """Data Access Object for acoustic fingerprints.
+
+    Attributes:
+        model (AudioFingerprint): SQLAlchemy model for fingerprints
+    """
+
+    model = AudioFingerprint
+
+    @handle_db_errors
+    async def save(
+        self,
+        audio_id: int,
+        user_id: int,
+        duration: float,
+        fingerprint: bytes,
+        hashes: list[int],
+    ) -> None:
+        """Store a fingerprint together with its lookup hashes.
+
+        An existing fingerprint of the same file is replaced.
+
+        Args:
+            audio_id (int): ID of the audio file
+            user_id (int): ID of the owner
+            duration (float): Duration of the audio in seconds
+            fingerprint (bytes): Packed sub-fingerprints
+            hashes (list[int]): Distinct sub-fingerprints for the lookup index
+        """
+        await self.session.execute(
+            delete(AudioFingerprintHash).where(AudioFingerprintHash.audio_id == audio_id)
+        )
+        await self.session.execute(
+            delete(self.model).where(self.model.audio_id == audio_id)
+        )
+        await self.session.execute(
+            insert(self.model).values(
+                audio_id=audio_id,
+                user_id=user_id,
+                duration=duration,
+                fingerprint=fingerprint,
+            )
+        )
+        if hashes:
+            await self.session.execute(
+                insert(AudioFingerprintHash),
+                [
+                    {"audio_id": audio_id, "user_id": user_id, "hash": value}
+                    for value in hashes
+                ],
+            )
+        await self.session.commit()
+
+    @handle_db_errors
+    async def find_candidate_pairs(
+        self, user_id: int, min_matches: int, duration_tolerance: float
+    ) -> set[tuple[int, int]]:
+        """Find pairs of a user's files that may be duplicates.
+
+        A pair is a candidate if the files share at least `min_matches`
+        sub-fingerprints or have nearly the same duration. Deleted files
+        are ignored.
+
+        Args:
+            user_id (int): ID of the user
+            min_matches (int): Minimum number of shared sub-fingerprints
+            duration_tolerance (float): Maximum duration difference in seconds
+
+        Returns:
+            set[tuple[int, int]]: Pairs of audio ids, newer id first
+        """
+        active = select(AudioInfo.id).where(
+            AudioInfo.user_id == user_id, AudioInfo.is_deleted.is_(False)
+        )
+
+        first, second = aliased(AudioFingerprintHash), aliased(AudioFingerprintHash)
+        by_hash = (
+            select(second.audio_id, first.audio_id)
+            .join(
+                second,
+                and_(
+                    second.user_id == first.user_id,
+                    second.hash == first.hash,
+                    second.audio_id > first.audio_id,
+                ),
+            )
+            .where(
+                first.user_id == user_id,
+                first.audio_id.in_(active),
+                second.audio_id.in_(active),
+            )
+            .group_by(first.audio_id, second.audio_id)
+            .having(func.count() >= min_matches)
+        )
+
+        older, newer = aliased(self.model), aliased(self.model)
+        by_duration = (
+            select(newer.audio_id, older.audio_id)
+            .join(
+                newer,
+                and_(
+                    newer.user_id == older.user_id,
+                    newer.audio_id > older.audio_id,
+                    newer.duration.between(
+                        older.duration - duration_tolerance,
+                        older.duration + duration_tolerance,
+                    ),
+                ),
+            )
+            .where(
+                older.user_id == user_id,
+                older.audio_id.in_(active),
+                newer.audio_id.in_(active),
+            )
+        )
+
+        pairs = set()
+        for query in (by_hash, by_duration):
+            result = await self.session.execute(query)
+            pairs.update(tuple(row) for row in result.all())
+        return pairs
+
+    @handle_db_errors
+    async def find_fingerprints(self, audio_ids: list[int]) -> dict[int, bytes]:
+        """Get stored fingerprints by audio id.
+
+        Args:
+            audio_ids (list[int]): IDs of the audio files
+
+        Returns:
+            dict[int, bytes]: Packed fingerprints by audio id
+        """
+        query = select(self.model.audio_id, self.model.fingerprint).where(
+            self.model.audio_id.in_(audio_ids)
+        )
+        result = await self.session.execute(query)
+        return dict(result.all())
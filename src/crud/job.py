@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, delete, insert, or_, select, update
+
+from src.models import Job
+from src.crud.base import BaseDAO
+from src.core.decorators import handle_db_errors
+
+
+class JobDAO(BaseDAO):
+    """Data Access Object for background jobs.
+
+    Jobs are claimed with `SELECT ... FOR UPDATE SKIP LOCKED`, so any number
+    of workers can poll the same table without taking each other's jobs.
+    A claimed job stays invisible until its visibility timeout expires;
+    if the worker dies before finishing it, the job is claimed again.
+
+    Attributes:
+        model (Job): SQLAlchemy model for jobs
+    """
+
+    model = Job
+
+    @handle_db_errors
+    async def enqueue(
+        self, kind: str, payload: dict, max_attempts: int, delay: float = 0
+    ) -> int:
+        """Add a job to the queue.
+
+        Args:
+            kind (str): Name of the job handler
+            payload (dict): JSON-serializable handler arguments
+            max_attempts (int): Number of attempts before the job is failed
+            delay (float, optional): Seconds before the job may run.
+                Defaults to 0.
+
+        Returns:
+            int: ID of the job
+        """
+        stmt = (
+            insert(self.model)
+            .values(
+                kind=kind,
+                payload=payload,
+                status="queued",
+                attempts=0,
+                max_attempts=max_attempts,
+                run_at=datetime.utcnow() + timedelta(seconds=delay),
+            )
+            .returning(self.model.id)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.scalar_one()
+
+    async def claim(self, limit: int, visibility_timeout: float) -> list[Job]:
+        """Claim due jobs and jobs whose visibility timeout expired.
+
+        Args:
+            limit (int): Maximum number of jobs to claim
+            visibility_timeout (float): Seconds the claimed jobs stay
+                invisible to other workers
+
+        Returns:
+            list[Job]: Claimed jobs with incremented attempt counters
+        """
+        now = datetime.utcnow()
+        claimable = (
+            select(self.model.id)
+            .where(
+                or_(
+                    and_(self.model.status == "queued", self.model.run_at <= now),
+                    and_(self.model.status == "running", self.model.locked_until < now),
+                )
+            )
+            .order_by(self.model.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(claimable.scalar_subquery()))
+            .values(
+                status="running",
+                attempts=self.model.attempts + 1,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+            )
+            .returning(self.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        jobs = list(result.scalars().all())
+        await self.session.commit()
+        return jobs
+
+    async def complete(self, job_id: int, attempt: int) -> None:
+        """Remove a finished job.
+
+        Nothing happens if the job has been claimed again after its
+        visibility timeout expired.
+
+        Args:
+            job_id (int): ID of the job
+            attempt (int): Attempt number the job was claimed with
+        """
+        await self.session.execute(
+            delete(self.model).where(
+                self.model.id == job_id, self.model.attempts == attempt
+            )
+        )
+        await self.session.commit()
+
+    async def fail(
+        self,
+        job_id: int,
+        attempt: int,
+        error: str,
+        retry_at: Optional[datetime] = None,
+    ) -> None:
+        """Record a failed attempt.
+
+        Args:
+            job_id (int): ID of the job
+            attempt (int): Attempt number the job was claimed with
+            error (str): Error description
+            retry_at (datetime, optional): When to retry. If not given,
+                the job is marked as failed for good.
+        """
+        values = {"last_error": error, "locked_until": None}
+        if retry_at is None:
+            values["status"] = "failed"
+        else:
+            values.update(status="queued", run_at=retry_at)
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == job_id, self.model.attempts == attempt)
+            .values(**values)
+        )
+        await self.session.commit()
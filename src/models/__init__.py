@@ -1,4 +1,14 @@
 from src.models.user import User
 from src.models.audio import AudioInfo
+from src.models.fingerprint import AudioFingerprint, AudioFingerprintHash
+from src.models.job import Job
+from src.models.shard import UserShard
 
-__all__ = ["User", "AudioInfo"]
+__all__ = [
+    "User",
+    "AudioInfo",
+    "AudioFingerprint",
+    "AudioFingerprintHash",
+    "Job",
+    "UserShard",
+]
@@ -17,6 +17,10 @@ class AudioInfo(Base):
         size (int): Size of the audio file in bytes
         user_id (int): Foreign key to the user who owns the file
         is_deleted (bool): Flag indicating if the file is deleted
+        deleted_at (datetime): Timestamp when the file was soft-deleted
+        tier (str): Storage tier holding the file, "hot" or "cold"
+        last_accessed_at (datetime): Timestamp of the last download
+        updated_at (datetime): Timestamp of the last change of the record
         created_at (datetime): Timestamp when the file was created
     """
 
@@ -31,4 +35,10 @@ class AudioInfo(Base):
         ForeignKey("user.id", ondelete="CASCADE"), nullable=False
     )
     is_deleted: Mapped[bool] = mapped_column(default=False)
+    deleted_at: Mapped[datetime] = mapped_column(nullable=True)
+    tier: Mapped[str] = mapped_column(default="hot", server_default="hot")
+    last_accessed_at: Mapped[datetime] = mapped_column(nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
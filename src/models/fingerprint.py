@@ -0,0 +1,53 @@
+from sqlalchemy import ForeignKey, Index, LargeBinary
+from sqlalchemy.orm import mapped_column, Mapped
+from src.models.base import Base
+
+
+class AudioFingerprint(Base):
+    """SQLAlchemy model for acoustic fingerprints of audio files.
+
+    Attributes:
+        audio_id (int): Primary key, foreign key to the audio file
+        user_id (int): ID of the user who owns the file
+        duration (float): Duration of the audio in seconds
+        fingerprint (bytes): Packed 32-bit sub-fingerprints
+    """
+
+    __tablename__ = "audio_fingerprint"
+    __table_args__ = (
+        Index("ix_audio_fingerprint_user_duration", "user_id", "duration"),
+    )
+
+    audio_id: Mapped[int] = mapped_column(
+        ForeignKey("audio_info.id", ondelete="CASCADE"), primary_key=True
+    )
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    duration: Mapped[float] = mapped_column(nullable=False)
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+
+class AudioFingerprintHash(Base):
+    """SQLAlchemy model for the sub-fingerprint lookup index.
+
+    Every distinct sub-fingerprint of a file is stored as a row, so files
+    sharing sub-fingerprints are found with an index lookup instead of
+    comparing every pair of files.
+
+    Attributes:
+        id (int): Primary key, auto-incrementing
+        audio_id (int): Foreign key to the audio file
+        user_id (int): ID of the user who owns the file
+        hash (int): Sub-fingerprint as a signed 32-bit integer
+    """
+
+    __tablename__ = "audio_fingerprint_hash"
+    __table_args__ = (
+        Index("ix_audio_fingerprint_hash_user_hash", "user_id", "hash"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    audio_id: Mapped[int] = mapped_column(
+        ForeignKey("audio_info.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id: Mapped[int] = mapped_column(nullable=False)
+    hash: Mapped[int] = mapped_column(nullable=False)
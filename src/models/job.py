@@ -0,0 +1,35 @@
+from sqlalchemy import JSON, Index
+from sqlalchemy.orm import mapped_column, Mapped
+from src.models.base import Base
+from datetime import datetime
+
+
+class Job(Base):
+    """SQLAlchemy model for background jobs.
+
+    Attributes:
+        id (int): Primary key, auto-incrementing
+        kind (str): Name of the job handler
+        payload (dict): Arguments passed to the handler
+        status (str): One of "queued", "running" or "failed"
+        attempts (int): Number of times the job has been claimed
+        max_attempts (int): Number of attempts before the job is failed
+        run_at (datetime): Earliest time the job may run
+        locked_until (datetime): End of the visibility timeout of a running job
+        last_error (str): Error of the last failed attempt
+        created_at (datetime): Timestamp when the job was enqueued
+    """
+
+    __tablename__ = "job"
+    __table_args__ = (Index("ix_job_status_run_at", "status", "run_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(nullable=False)
+    run_at: Mapped[datetime] = mapped_column(nullable=False, default=datetime.utcnow)
+    locked_until: Mapped[datetime] = mapped_column(nullable=True)
+    last_error: Mapped[str] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
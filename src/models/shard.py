@@ -0,0 +1,30 @@
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import mapped_column, Mapped
+from src.models.base import Base
+from datetime import datetime
+
+
+class UserShard(Base):
+    """SQLAlchemy model for the shard map of user audio data.
+
+    Users without a row keep their audio in the default database.
+
+    Attributes:
+        user_id (int): Primary key, foreign key to the user
+        shard (str): Name of the shard serving the user's audio
+        moving_to (str): Target shard while rows are being copied
+        moving_from (str): Previous shard while its copies are being removed
+        updated_at (datetime): Timestamp of the last change
+    """
+
+    __tablename__ = "user_shard"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[str] = mapped_column(nullable=False)
+    moving_to: Mapped[str] = mapped_column(nullable=True)
+    moving_from: Mapped[str] = mapped_column(nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -18,6 +18,8 @@ class User(Base):
         is_supervisor (bool): Whether the user has admin privileges
         created_at (datetime): Account creation timestamp
         updated_at (datetime): Last update timestamp
+        audio_changed_at (datetime): Last time audio records of the user were
+            hard-deleted; row timestamps cannot show such changes
     """
 
     __tablename__ = "user"
@@ -33,3 +35,4 @@ class User(Base):
     updated_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    audio_changed_at: Mapped[datetime] = mapped_column(nullable=True)
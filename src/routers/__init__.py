@@ -1,9 +1,18 @@
 from fastapi import APIRouter
 from src.routers.auth import router as auth
+from src.routers.health import router as health
+from src.routers.media import router as media
+from src.routers.metrics import router as metrics
+from src.routers.profiling import router as profiling
 from src.routers.supervisor import router as supervisor
+from src.routers.uploads import router as uploads
 from src.routers.user import router as user
 
 router = APIRouter(prefix="/api")
 router.include_router(auth, prefix="/auth", tags=["Authorization"])
+router.include_router(media, prefix="/media", tags=["Media"])
+router.include_router(metrics, prefix="/supervisor/metrics", tags=["Metrics"])
+router.include_router(profiling, prefix="/supervisor/profiles", tags=["Profiling"])
 router.include_router(supervisor, prefix="/supervisor", tags=["Supervisor"])
+router.include_router(uploads, prefix="/uploads", tags=["Uploads"])
 router.include_router(user, prefix="/user", tags=["User"])
@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
+
+from src.core.health import health_checker
+
+router = APIRouter()
+
+
+@router.get("/healthz")
+async def liveness() -> dict[str, str]:
+    """Report that the process is alive.
+
+    Does no I/O, so it answers as long as the event loop runs.
+
+    Returns:
+        dict[str, str]: Constant status
+    """
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readiness() -> ORJSONResponse:
+    """Report whether the worker should receive traffic.
+
+    Returns results of background checks cached in memory: database
+    reachability, MEDIA_DIR writability and free space, plus connection
+    pool saturation and shutdown state.
+
+    Returns:
+        ORJSONResponse: 200 if ready, 503 otherwise, with check details
+    """
+    ready, checks = health_checker.readiness()
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
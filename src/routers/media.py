@@ -0,0 +1,57 @@
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, Response
+
+from src.core.delivery import key_paths, offload_response
+from src.core.signing import verify_url
+from src.service.audio import FileStorage, LocalFileStorage
+from src.settings import settings
+
+router = APIRouter()
+
+
+@router.get("/{key:path}")
+async def download_signed_media(
+    key: str,
+    expires: int = Query(..., description="Unix time after which the URL is invalid"),
+    name: str = Query(..., description="Filename offered to the client"),
+    signature: str = Query(...),
+    storage: FileStorage = Depends(LocalFileStorage),
+) -> Response:
+    """Download an audio file by a signed URL.
+
+    No authentication is needed: the signature made by
+    `GET /api/user/audio-url/` proves access. If the reverse proxy
+    checks signatures itself, requests never reach this endpoint.
+
+    Args:
+        key (str): Storage key of the file
+        expires (int): Unix time after which the URL is invalid
+        name (str): Filename offered to the client
+        signature (str): URL signature
+        storage (FileStorage): Storage service for file operations
+
+    Returns:
+        Response: The audio file, or a response handing it to the proxy
+
+    Raises:
+        HTTPException:
+            403 - If the signature is invalid or the URL has expired
+            404 - If signed URLs are disabled or the file is not found
+    """
+    if not settings.SIGNED_URL_SECRET:
+        raise HTTPException(status_code=404, detail="Signed URLs are disabled")
+    if not verify_url(f"/api/media/{quote(key)}", expires, signature, name):
+        raise HTTPException(status_code=403, detail="Invalid or expired URL")
+
+    for path in key_paths(key):
+        try:
+            await storage.get_file_info(path)
+        except FileNotFoundError:
+            continue
+        response = offload_response(path, name)
+        if response is not None:
+            return response
+        return FileResponse(path, filename=name)
+    raise HTTPException(status_code=404, detail="Audio file content not found")
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from src.core.dependencies import get_admin_user
+from src.core.metrics import metrics
+from src.models import User
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_metrics(user: User = Depends(get_admin_user)) -> dict[str, dict]:
+    """Get metrics of the current worker process.
+
+    Args:
+        user (User): Current authenticated admin user
+
+    Returns:
+        dict[str, dict]: Metrics grouped by component name
+    """
+    return metrics.collect()
@@ -0,0 +1,47 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+
+from src.core.dependencies import get_admin_user
+from src.core.profiling import profile_store
+from src.models import User
+
+
+router = APIRouter()
+
+
+@router.get("/")
+async def list_profiles(user: User = Depends(get_admin_user)) -> List[str]:
+    """List stored request profiles.
+
+    Profiles are stored by the profiling middleware in "store" mode
+    and in sampled mode.
+
+    Args:
+        user (User): Current authenticated admin user
+
+    Returns:
+        List[str]: Stored profile ids, newest first
+    """
+    return profile_store.list()
+
+
+@router.get("/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    user: User = Depends(get_admin_user),
+) -> FileResponse:
+    """Download a stored request profile.
+
+    Args:
+        profile_id (str): Id of the profile to download
+        user (User): Current authenticated admin user
+
+    Returns:
+        FileResponse: Rendered profile
+
+    Raises:
+        HTTPException: 404 if profile not found
+    """
+    return FileResponse(profile_store.path(profile_id))
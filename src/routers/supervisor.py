@@ -1,64 +1,168 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from src.core.dependencies import get_admin_user
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from src.core.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from src.core.dependencies import SparseFields, get_admin_user
 from src.models import User
-from src.schemas import UserInfo, UpdateUserInfo, AudioFullInfo
-from src.service import SupervisorService
+from src.schemas import (
+    UserInfo,
+    UpdateUserInfo,
+    AudioFullInfo,
+    BulkIds,
+    BulkItemResult,
+)
+from src.service import AudioService, SupervisorService
 
 
 router = APIRouter()
 
 
-@router.get("/{user_id}")
+@router.get("/audio/export")
+async def export_audio_records(
+    user_id: Optional[int] = None,
+    is_deleted: Optional[bool] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    fields: Optional[tuple[str, ...]] = Depends(SparseFields(AudioFullInfo)),
+    supervisor_service: SupervisorService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> StreamingResponse:
+    """Export audio records as newline-delimited JSON.
+
+    Records are read through a server-side cursor and sent as they arrive,
+    so the export works for tables of any size.
+
+    Args:
+        user_id (int, optional): Only records of this user
+        is_deleted (bool, optional): Only records with this deleted state
+        created_from (datetime, optional): Only records created at or after
+        created_to (datetime, optional): Only records created before
+        fields (tuple[str, ...], optional): Fields of every record
+        supervisor_service (SupervisorService): Service for user management
+        user (User): Current authenticated admin user
+
+    Returns:
+        StreamingResponse: One JSON object per line
+    """
+    return StreamingResponse(
+        supervisor_service.export_audio_records(
+            user_id=user_id,
+            is_deleted=is_deleted,
+            created_from=created_from,
+            created_to=created_to,
+            fields=fields,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/{user_id}", response_model=UserInfo)
 async def get_user_info(
     user_id: int,
+    fields: Optional[tuple[str, ...]] = Depends(SparseFields(UserInfo)),
     supervisor_service: SupervisorService = Depends(),
     user: User = Depends(get_admin_user),
-) -> UserInfo:
+) -> Response:
     """Get user information.
 
     This endpoint allows administrators to retrieve information about any user.
+    With `fields`, only the listed fields are loaded and returned.
 
     Args:
         user_id (int): ID of the user to retrieve
+        fields (tuple[str, ...], optional): Fields to return
         supervisor_service (SupervisorService): Service for user management
         user (User): Current authenticated admin user
 
     Returns:
-        UserInfo: User information
+        Response: User information, only the requested fields with `fields`
 
     Raises:
         HTTPException: 404 if user not found
     """
+    if fields is not None:
+        return ORJSONResponse(
+            await supervisor_service.get_user_fields(user_id=user_id, fields=fields)
+        )
     return await supervisor_service.get_user(user_id=user_id)
 
 
-@router.get("/{user_id}/audio")
+@router.get("/{user_id}/audio", response_model=List[AudioFullInfo])
 async def get_user_audio(
     user_id: int,
+    request: Request,
     include_deleted: bool = False,
+    fields: Optional[tuple[str, ...]] = Depends(SparseFields(AudioFullInfo)),
     supervisor_service: SupervisorService = Depends(),
     user: User = Depends(get_admin_user),
-) -> List[AudioFullInfo]:
+) -> Response:
     """Get user's audio files.
 
     This endpoint allows administrators to retrieve all audio files
-    associated with a specific user.
+    associated with a specific user. The response carries ETag and
+    Last-Modified headers; conditional requests for an unchanged
+    listing get 304 without loading the listing. Serialized listings
+    are kept in an in-process cache until the user's audio changes.
+    With `fields`, only the listed fields are selected and returned.
 
     Args:
         user_id (int): ID of the user whose audio files to retrieve
+        request (Request): Incoming request with conditional headers
+        include_deleted (bool, optional): Whether to include deleted files
+        fields (tuple[str, ...], optional): Fields of every audio file
         supervisor_service (SupervisorService): Service for user management
         user (User): Current authenticated admin user
 
     Returns:
-        List[AudioFullInfo]: List of user's audio files
+        Response: JSON list of user's audio files
 
     Raises:
         HTTPException: 404 if user not found
     """
-    return await supervisor_service.get_user_audio(
+    etag, last_modified = await supervisor_service.get_user_audio_version(
         user_id=user_id, include_deleted=include_deleted
     )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    body = await supervisor_service.get_user_audio_json(
+        user_id=user_id, include_deleted=include_deleted, etag=etag, fields=fields
+    )
+    return Response(
+        body,
+        media_type="application/json",
+        headers=validator_headers(etag, last_modified),
+    )
+
+
+@router.get("/{user_id}/audio/export")
+async def export_user_audio(
+    user_id: int,
+    audio_service: AudioService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> StreamingResponse:
+    """Download all audio files of a user as a ZIP archive.
+
+    Args:
+        user_id (int): ID of the user whose audio files to export
+        audio_service (AudioService): Service for handling audio operations
+        user (User): Current authenticated admin user
+
+    Returns:
+        StreamingResponse: ZIP archive with the user's audio files
+    """
+    return StreamingResponse(
+        await audio_service.export_audio(user_id=user_id),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f'attachment; filename="user_{user_id}_audio.zip"'
+        },
+    )
 
 
 @router.put("/{user_id}")
@@ -139,3 +243,88 @@ async def activate_user(
         HTTPException: 404 if user not found
     """
     return await supervisor_service.activate_user(user_id=user_id)
+
+
+@router.post("/bulk/users/deactivate")
+async def bulk_deactivate_users(
+    bulk: BulkIds,
+    supervisor_service: SupervisorService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> List[BulkItemResult]:
+    """Deactivate several users at once.
+
+    Args:
+        bulk (BulkIds): IDs of the users to deactivate
+        supervisor_service (SupervisorService): Service for user management
+        user (User): Current authenticated admin user
+
+    Returns:
+        List[BulkItemResult]: Result for every requested user
+    """
+    return await supervisor_service.bulk_set_users_active(
+        user_ids=bulk.ids, is_active=False
+    )
+
+
+@router.post("/bulk/users/activate")
+async def bulk_activate_users(
+    bulk: BulkIds,
+    supervisor_service: SupervisorService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> List[BulkItemResult]:
+    """Activate several users at once.
+
+    Args:
+        bulk (BulkIds): IDs of the users to activate
+        supervisor_service (SupervisorService): Service for user management
+        user (User): Current authenticated admin user
+
+    Returns:
+        List[BulkItemResult]: Result for every requested user
+    """
+    return await supervisor_service.bulk_set_users_active(
+        user_ids=bulk.ids, is_active=True
+    )
+
+
+@router.post("/bulk/users/delete")
+async def bulk_delete_users(
+    bulk: BulkIds,
+    supervisor_service: SupervisorService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> List[BulkItemResult]:
+    """Permanently delete several users together with their audio files.
+
+    Args:
+        bulk (BulkIds): IDs of the users to delete
+        supervisor_service (SupervisorService): Service for user management
+        user (User): Current authenticated admin user
+
+    Returns:
+        List[BulkItemResult]: Result for every requested user
+    """
+    return await supervisor_service.bulk_delete_users(user_ids=bulk.ids)
+
+
+@router.post("/bulk/audio/delete")
+async def bulk_delete_audio(
+    bulk: BulkIds,
+    full_delete: bool = False,
+    supervisor_service: SupervisorService = Depends(),
+    user: User = Depends(get_admin_user),
+) -> List[BulkItemResult]:
+    """Delete several audio files at once.
+
+    Args:
+        bulk (BulkIds): IDs of the audio files to delete
+        full_delete (bool, optional): If True, permanently delete the files.
+            If False, only mark them as deleted. Defaults to False.
+        supervisor_service (SupervisorService): Service for user management
+        user (User): Current authenticated admin user
+
+    Returns:
+        List[BulkItemResult]: Result for every requested audio file
+    """
+    return await supervisor_service.bulk_delete_audio(
+        audio_ids=bulk.ids, full_delete=full_delete
+    )
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from src.core.signing import verify_url
+from src.service.audio import FileStorage, LocalFileStorage
+from src.settings import settings
+
+router = APIRouter()
+
+
+@router.put("/{user_id}/{upload_id}", status_code=201)
+async def receive_direct_upload(
+    user_id: int,
+    upload_id: str,
+    request: Request,
+    expires: int = Query(..., description="Unix time after which the URL is invalid"),
+    size: int = Query(..., description="Maximum accepted body size in bytes"),
+    signature: str = Query(...),
+    storage: FileStorage = Depends(LocalFileStorage),
+) -> None:
+    """Receive the body of a direct upload by a pre-signed URL.
+
+    The body is streamed to disk without multipart parsing or database
+    access. If the reverse proxy accepts PUT requests into the incoming
+    directory itself, requests never reach this endpoint.
+
+    Args:
+        user_id (int): ID of the uploading user
+        upload_id (str): Identifier from the upload slot
+        request (Request): Incoming request with the file body
+        expires (int): Unix time after which the URL is invalid
+        size (int): Maximum accepted body size in bytes
+        signature (str): URL signature
+        storage (FileStorage): Storage service for file operations
+
+    Raises:
+        HTTPException:
+            400 - If the Content-Length header is invalid
+            403 - If the signature is invalid or the URL has expired
+            404 - If signed URLs are disabled
+            413 - If the body is larger than the signed size
+    """
+    if not settings.SIGNED_URL_SECRET:
+        raise HTTPException(status_code=404, detail="Signed URLs are disabled")
+    uri = f"/api/uploads/{user_id}/{upload_id}"
+    if not verify_url(uri, expires, signature, str(size)):
+        raise HTTPException(status_code=403, detail="Invalid or expired URL")
+    try:
+        content_length = int(request.headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length header")
+    if content_length > size:
+        raise HTTPException(status_code=413, detail="File is too large")
+
+    try:
+        await storage.save_stream(
+            request.stream(), storage.get_incoming_path(user_id, upload_id), size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends, File, UploadFile
+from datetime import datetime
+from typing import List
 
+from fastapi import APIRouter, Depends, File, Request, UploadFile
+from fastapi.responses import FileResponse, StreamingResponse
+
+from src.core.conditional import (
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+)
+from src.core.delivery import offload_response
 from src.core.dependencies import get_current_user
+from src.core.events import event_broker
+from src.core.responses import MemoryFileResponse
 from src.models import User
-from src.schemas import AudioResponse
+from src.schemas import AudioDuplicate, AudioResponse, SignedUrl
+from src.schemas import UploadFinalize, UploadSlot, UploadSlotRequest
 from src.service import AudioService
 
 router = APIRouter()
@@ -38,6 +51,59 @@ async def upload_user_audio(
     return result
 
 
+@router.post("/upload-slots/")
+async def create_user_upload_slot(
+    request: UploadSlotRequest,
+    user: User = Depends(get_current_user),
+    audio_service: AudioService = Depends(AudioService),
+) -> UploadSlot:
+    """Get a pre-signed URL for uploading an audio file directly to storage.
+
+    The file body is sent with `PUT` to the returned URL, bypassing
+    the API workers, and registered with `POST /upload-slots/finalize/`.
+
+    Args:
+        request (UploadSlotRequest): Declared file name, type and size
+        user (User): Current authenticated user
+        audio_service (AudioService): Service for handling audio operations
+
+    Returns:
+        UploadSlot: Upload identifier and signed URL
+
+    Raises:
+        HTTPException:
+            400 - If the declared file fails validation
+            404 - If signed URLs are disabled
+    """
+    return audio_service.create_upload_slot(user=user, request=request)
+
+
+@router.post("/upload-slots/finalize/")
+async def finalize_user_upload(
+    request: UploadFinalize,
+    user: User = Depends(get_current_user),
+    audio_service: AudioService = Depends(AudioService),
+) -> AudioResponse:
+    """Register an audio file uploaded through an upload slot.
+
+    Args:
+        request (UploadFinalize): Upload identifier and user filename
+        user (User): Current authenticated user
+        audio_service (AudioService): Service for handling audio operations
+
+    Returns:
+        AudioResponse: Information about the uploaded file
+
+    Raises:
+        HTTPException:
+            400 - If the uploaded file fails validation
+            404 - If the file was not uploaded
+    """
+    return await audio_service.finalize_upload(
+        user=user, upload_id=request.upload_id, user_filename=request.user_filename
+    )
+
+
 @router.delete("/delete-audio/")
 async def delete_user_audio(
     audio_id: int,
@@ -69,3 +135,155 @@ async def delete_user_audio(
         audio_id=audio_id, full_delete=full_delete, user=user
     )
     return True
+
+
+@router.get("/download-audio/")
+async def download_user_audio(
+    audio_id: int,
+    request: Request,
+    audio_service: AudioService = Depends(AudioService),
+    user: User = Depends(get_current_user),
+) -> FileResponse:
+    """Download an audio file.
+
+    The response carries ETag and Last-Modified headers; conditional
+    requests for an unchanged file get 304 without any body transfer.
+    With FILE_DELIVERY_MODE set, the body is sent by the reverse proxy;
+    otherwise frequently downloaded files are served from memory.
+
+    Args:
+        audio_id (int): ID of the audio file to download
+        request (Request): Incoming request with conditional headers
+        audio_service (AudioService): Service for handling audio operations
+        user (User): Current authenticated user
+
+    Returns:
+        FileResponse: The audio file
+
+    Raises:
+        HTTPException:
+            403 - If user doesn't have permission to download the file
+            404 - If audio file not found
+    """
+    audio, etag, modified_at = await audio_service.get_download(
+        audio_id=audio_id, user=user
+    )
+    last_modified = datetime.utcfromtimestamp(modified_at)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
+    await audio_service.request_promotion(audio)
+    filename = audio_service.download_filename(audio)
+    headers = validator_headers(etag, last_modified)
+    response = offload_response(audio.path, filename, headers)
+    if response is not None:
+        return response
+    body = await audio_service.get_cached_body(audio)
+    if body is not None:
+        return MemoryFileResponse(
+            body,
+            request.headers.get("range"),
+            filename,
+            headers,
+            if_range=request.headers.get("if-range"),
+        )
+    return FileResponse(audio.path, filename=filename, headers=headers)
+
+
+@router.get("/audio-url/")
+async def get_user_audio_url(
+    audio_id: int,
+    audio_service: AudioService = Depends(AudioService),
+    user: User = Depends(get_current_user),
+) -> SignedUrl:
+    """Get an expiring download URL for an audio file.
+
+    The URL works without the auth cookie until it expires, e.g. in
+    an <audio> element or an external player.
+
+    Args:
+        audio_id (int): ID of the audio file
+        audio_service (AudioService): Service for handling audio operations
+        user (User): Current authenticated user
+
+    Returns:
+        SignedUrl: Signed URL and its expiry time
+
+    Raises:
+        HTTPException:
+            403 - If user doesn't have permission to download the file
+            404 - If audio file not found or signed URLs are disabled
+    """
+    return await audio_service.get_signed_url(audio_id=audio_id, user=user)
+
+
+@router.get("/export-audio/")
+async def export_user_audio(
+    audio_service: AudioService = Depends(AudioService),
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Download all audio files of the user as a ZIP archive.
+
+    The archive is generated while it is being sent, so libraries
+    of any size are exported without buffering.
+
+    Args:
+        audio_service (AudioService): Service for handling audio operations
+        user (User): Current authenticated user
+
+    Returns:
+        StreamingResponse: ZIP archive with the user's audio files
+    """
+    return StreamingResponse(
+        await audio_service.export_audio(user_id=user.id),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="audio.zip"'},
+    )
+
+
+@router.get("/events/")
+async def stream_user_events(
+    user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream upload and processing events of the user (server-sent events).
+
+    Events:
+        upload.progress - bytes of an upload received so far
+        upload.completed - an uploaded file was saved
+        processing.status - a post-upload job was queued, started,
+            completed or failed
+
+    The stream holds no database connection while open.
+
+    Args:
+        user (User): Current authenticated user
+
+    Returns:
+        StreamingResponse: Stream in the text/event-stream format
+    """
+    return StreamingResponse(
+        event_broker.stream(user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/audio-duplicates/")
+async def find_user_audio_duplicates(
+    audio_service: AudioService = Depends(AudioService),
+    user: User = Depends(get_current_user),
+) -> List[AudioDuplicate]:
+    """Find audio files that sound like other files of the user.
+
+    Files are compared by acoustic fingerprints, so re-encoded copies
+    of the same recording are found even when their bytes differ.
+    Only WAV and FLAC uploads are fingerprinted.
+
+    Args:
+        audio_service (AudioService): Service for handling audio operations
+        user (User): Current authenticated user
+
+    Returns:
+        List[AudioDuplicate]: Pairs of likely duplicates, most similar first
+    """
+    return await audio_service.find_duplicates(user_id=user.id)
@@ -1,6 +1,9 @@
-from src.schemas.audio import AudioInfo, AudioResponse, AudioFullInfo
+from src.schemas.audio import AudioInfo, AudioResponse, AudioFullInfo, SignedUrl
+from src.schemas.audio import UploadFinalize, UploadSlot, UploadSlotRequest
 from src.schemas.users import UserInfo, UpdateUserInfo
 from src.schemas.auth import AuthResponse, RedirectResponse
+from src.schemas.bulk import BulkIds, BulkItemResult
+from src.schemas.fingerprint import AudioDuplicate
 
 __all__ = [
     "AudioResponse",
@@ -10,4 +13,11 @@ __all__ = [
     "AuthResponse",
     "RedirectResponse",
     "AudioFullInfo",
+    "BulkIds",
+    "BulkItemResult",
+    "AudioDuplicate",
+    "SignedUrl",
+    "UploadFinalize",
+    "UploadSlot",
+    "UploadSlotRequest",
 ]
@@ -50,8 +50,64 @@ class AudioFullInfo(AudioInfo):
     Attributes:
         audio_id (int): Unique identifier of the audio file
         created_at (datetime): Timestamp when the file was created
+        tier (str): Storage tier holding the file, "hot" or "cold"
     """
 
     audio_id: int
     is_deleted: bool
     created_at: datetime
+    tier: str = "hot"
+
+
+class SignedUrl(BaseModel):
+    """Expiring download link that needs no authentication.
+
+    Attributes:
+        url (str): Signed URL of the file
+        expires_at (datetime): Time after which the URL is rejected
+    """
+
+    url: str
+    expires_at: datetime
+
+
+class UploadSlotRequest(BaseModel):
+    """Request for a direct upload URL.
+
+    Attributes:
+        filename (str): Original filename with extension
+        content_type (str): MIME type of the audio file
+        size (int): Size of the audio file in bytes
+    """
+
+    filename: str
+    content_type: str
+    size: int
+
+
+class UploadSlot(BaseModel):
+    """Pre-signed URL for uploading a file directly to storage.
+
+    Attributes:
+        upload_id (str): Identifier passed to the finalize endpoint
+        url (str): URL accepting a PUT request with the file body
+        max_size (int): Maximum accepted body size in bytes
+        expires_at (datetime): Time after which the URL is rejected
+    """
+
+    upload_id: str
+    url: str
+    max_size: int
+    expires_at: datetime
+
+
+class UploadFinalize(BaseModel):
+    """Request to register a directly uploaded file.
+
+    Attributes:
+        upload_id (str): Identifier from the upload slot
+        user_filename (str): Name given to the file by the user
+    """
+
+    upload_id: str
+    user_filename: str
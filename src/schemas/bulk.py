@@ -0,0 +1,27 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class BulkIds(BaseModel):
+    """Bulk operation request model.
+
+    Attributes:
+        ids (list[int]): IDs of the objects to process
+    """
+
+    ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class BulkItemResult(BaseModel):
+    """Result of a bulk operation for one object.
+
+    Attributes:
+        id (int): ID of the processed object
+        success (bool): Whether the operation succeeded for this object
+        detail (str, optional): Reason of the failure
+    """
+
+    id: int
+    success: bool
+    detail: Optional[str] = None
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class AudioDuplicate(BaseModel):
+    """Pair of audio files that sound alike.
+
+    Attributes:
+        audio_id (int): ID of the newer audio file
+        duplicate_of (int): ID of the older audio file
+        similarity (float): Share of matching fingerprint bits, from 0 to 1
+    """
+
+    audio_id: int
+    duplicate_of: int
+    similarity: float
@@ -0,0 +1,120 @@
+import io
+import logging
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator
+
+from src.models import AudioInfo
+from src.service.audio.file_storage import FileStorage
+
+logger = logging.getLogger(__name__)
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable buffer collecting ZIP output between drains.
+
+    Because the sink cannot seek, zipfile writes sizes and CRCs into data
+    descriptors after each entry instead of patching the local headers.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        """Return and forget the data written since the previous drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipArchiveStreamer:
+    """Builds a ZIP archive of audio files on the fly.
+
+    Entries are stored without compression, since audio is already
+    compressed. File contents are read through the storage layer in chunks
+    and every chunk is handed to the client as soon as it is written, so
+    memory use does not depend on the size of the library. ZIP64 records are
+    used automatically for large archives.
+
+    Attributes:
+        CHUNK_SIZE (int): Size of file chunks read from storage
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, storage: FileStorage):
+        """Initialize the streamer.
+
+        Args:
+            storage (FileStorage): Storage used to read the files
+        """
+        self._storage = storage
+
+    @staticmethod
+    def archive_names(audio_files: list[AudioInfo]) -> list[str]:
+        """Build unique archive entry names from user filenames.
+
+        Args:
+            audio_files (list[AudioInfo]): Audio records
+
+        Returns:
+            list[str]: Entry name for every record, in the same order
+        """
+        names = []
+        used = set()
+        for audio in audio_files:
+            extension = audio.filename.rsplit(".", 1)[-1]
+            stem = audio.user_filename.replace("/", "_").replace("\\", "_")
+            name = f"{stem}.{extension}"
+            counter = 2
+            while name in used:
+                name = f"{stem} ({counter}).{extension}"
+                counter += 1
+            used.add(name)
+            names.append(name)
+        return names
+
+    async def stream(self, audio_files: list[AudioInfo]) -> AsyncIterator[bytes]:
+        """Stream a ZIP archive of the given audio files.
+
+        Files missing from storage are skipped.
+
+        Args:
+            audio_files (list[AudioInfo]): Audio records to include
+
+        Yields:
+            bytes: Consecutive parts of the archive
+        """
+        sink = _ZipSink()
+        with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for audio, name in zip(audio_files, self.archive_names(audio_files)):
+                chunks = self._storage.read_file(audio.path, self.CHUNK_SIZE)
+                try:
+                    first_chunk = await anext(chunks)
+                except StopAsyncIteration:
+                    first_chunk = b""
+                except FileNotFoundError:
+                    logger.warning("Skipping missing file %s in export", audio.path)
+                    continue
+
+                created_at = max(audio.created_at, datetime(1980, 1, 1))
+                info = zipfile.ZipInfo(name, date_time=created_at.timetuple()[:6])
+                info.compress_type = zipfile.ZIP_STORED
+                info.file_size = audio.size
+
+                with archive.open(info, mode="w") as entry:
+                    entry.write(first_chunk)
+                    yield sink.drain()
+                    async for chunk in chunks:
+                        entry.write(chunk)
+                        yield sink.drain()
+                yield sink.drain()
+        yield sink.drain()
@@ -1,16 +1,36 @@
-import os
-
+import re
+import time
+from datetime import datetime
+from mimetypes import guess_type
+from typing import AsyncIterator, Optional
+from urllib.parse import quote, urlencode
 from uuid import uuid4
 
 from fastapi import Depends, HTTPException, UploadFile
 
-from src.crud import AudioDAO
-from src.models import User
-from src.schemas import AudioResponse, AudioInfo
+from src.core.cache import listing_cache
+from src.core.conditional import make_etag
+from src.core.delivery import storage_key
+from src.core.events import event_broker
+from src.core.signing import sign_url
+from src.crud import AudioDAO, JobDAO, UserDAO
+from src.models import User, AudioInfo as AudioInfoModel
+from src.schemas import AudioDuplicate, AudioResponse, AudioInfo, SignedUrl
+from src.schemas import UploadSlot, UploadSlotRequest
 from src.schemas import AudioInfo
 from src.service.audio import FileStorage, LocalFileStorage, FileValidator
+from src.service.audio.archive import ZipArchiveStreamer
+from src.service.audio.body_cache import file_body_cache
+from src.service.audio.duplicates import duplicate_detector
+from src.service.audio.tiering import tier_manager
+from src.service.jobs.handlers import DELETE_FILE, FINGERPRINT_AUDIO, PROMOTE_AUDIO
 from src.settings import settings
 
+UPLOAD_ID_PATTERN = re.compile(
+    r"(?P<uuid>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+    r"\.(?P<extension>[a-z0-9]+)"
+)
+
 
 class AudioService:
     """Service for handling audio file operations.
@@ -21,7 +41,7 @@ class AudioService:
     Attributes:
         _audio_dao (AudioDAO): Data access object for audio operations
         _storage (FileStorage): Storage service for file operations
-        _media_dir (str): Directory for storing media files
+        _job_dao (JobDAO): Data access object for background jobs
         MAX_FILENAME_LENGTH (int): Maximum allowed length for user filename
     """
 
@@ -31,17 +51,21 @@ class AudioService:
         self,
         audio_dao: AudioDAO = Depends(),
         storage: FileStorage = Depends(LocalFileStorage),
+        job_dao: JobDAO = Depends(),
+        user_dao: UserDAO = Depends(),
     ):
         """Initialize the audio service.
 
         Args:
             audio_dao (AudioDAO): Data access object for audio operations
             storage (FileStorage): Storage service for file operations
+            job_dao (JobDAO): Data access object for background jobs
+            user_dao (UserDAO): Data access object for users
         """
         self._audio_dao = audio_dao
         self._storage = storage
-        self._media_dir = settings.MEDIA_DIR
-        os.makedirs(self._media_dir, exist_ok=True)
+        self._job_dao = job_dao
+        self._user_dao = user_dao
 
     def _process_filename(self, filename: str) -> str:
         """Process and validate filename.
@@ -63,11 +87,99 @@ class AudioService:
 
         return filename
 
+    async def _get_accessible_audio(
+        self, audio_id: int, user: User, action: str
+    ) -> AudioInfoModel:
+        """Get a non-deleted audio file the user is allowed to access.
+
+        Args:
+            audio_id (int): ID of the audio file
+            user (User): The user requesting access
+            action (str): Action name used in the error message
+
+        Returns:
+            AudioInfoModel: The audio file record
+
+        Raises:
+            HTTPException:
+                403 - If user doesn't own the file and is not a supervisor
+                404 - If audio file not found
+        """
+        audio = await self._audio_dao.find_one(id=audio_id, is_deleted=False)
+
+        if (audio.user_id != user.id) and not (user.is_supervisor):
+            raise HTTPException(
+                status_code=403,
+                detail=f"You don't have permission to {action} this audio file",
+            )
+        return audio
+
+    async def _register_upload(
+        self,
+        user: User,
+        unique_filename: str,
+        user_filename: str,
+        file_path: str,
+        file_size: int,
+    ) -> AudioInfoModel:
+        """Save the record of a stored upload and queue its fingerprinting.
+
+        Subscribers of the user's event stream are notified about
+        the completed upload and the queued processing.
+
+        Args:
+            user (User): The user who uploaded the file
+            unique_filename (str): Stored name of the file
+            user_filename (str): Processed name given by the user
+            file_path (str): Path of the stored file
+            file_size (int): Size of the file in bytes
+
+        Returns:
+            AudioInfoModel: Created audio record
+        """
+        audio_info = AudioInfo(
+            filename=unique_filename,
+            user_filename=user_filename,
+            user_id=user.id,
+            path=file_path,
+            size=file_size,
+        )
+        audio = await self._audio_dao.add(audio_info)
+        listing_cache.invalidate(user.id)
+        await event_broker.publish(
+            user.id,
+            "upload.completed",
+            {
+                "audio_id": audio.id,
+                "filename": unique_filename,
+                "user_filename": user_filename,
+                "size": file_size,
+            },
+        )
+
+        if settings.FINGERPRINT_ENABLED and duplicate_detector.is_supported(
+            unique_filename
+        ):
+            await self._job_dao.enqueue(
+                FINGERPRINT_AUDIO,
+                {"audio_id": audio.id, "user_id": user.id, "path": file_path},
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+            )
+            await event_broker.publish(
+                user.id,
+                "processing.status",
+                {"audio_id": audio.id, "task": FINGERPRINT_AUDIO, "status": "queued"},
+            )
+        return audio
+
     async def upload_audio(
         self, user: User, file: UploadFile, user_filename: str
     ) -> AudioResponse:
         """Upload an audio file and save its information to the database.
 
+        The response is returned once the file and its row are stored.
+        Fingerprinting of WAV and FLAC files is queued as a background job.
+
         Args:
             user (User): The user uploading the file
             file (UploadFile): The audio file to upload
@@ -85,26 +197,138 @@ class AudioService:
 
         file_extension = file.filename.split(".")[-1]
         unique_filename = f"user_{processed_filename}_{uuid4()}.{file_extension}"
-        file_path = os.path.join(self._media_dir, unique_filename)
+        file_path = self._storage.get_path(unique_filename)
 
         content = await file.read()
         file_size = len(content)
 
         await self._storage.save_file(file, file_path, content)
 
-        audio_info = AudioInfo(
+        await self._register_upload(
+            user, unique_filename, processed_filename, file_path, file_size
+        )
+
+        return AudioResponse(
             filename=unique_filename,
             user_filename=processed_filename,
-            user_id=user.id,
+            content_type=file.content_type,
             path=file_path,
             size=file_size,
         )
-        await self._audio_dao.add(audio_info)
 
+    def create_upload_slot(self, user: User, request: UploadSlotRequest) -> UploadSlot:
+        """Create a pre-signed URL for uploading a file directly to storage.
+
+        The client PUTs the file body to the URL and then calls
+        `finalize_upload`. The URL is limited to the declared size and
+        expires after DIRECT_UPLOAD_TTL_SECONDS.
+
+        Args:
+            user (User): The user uploading the file
+            request (UploadSlotRequest): Declared file name, type and size
+
+        Returns:
+            UploadSlot: Upload identifier and signed URL
+
+        Raises:
+            HTTPException:
+                400 - If the declared file fails validation
+                404 - If signed URLs are disabled
+        """
+        if not settings.SIGNED_URL_SECRET:
+            raise HTTPException(status_code=404, detail="Signed URLs are disabled")
+        FileValidator.validate_metadata(
+            request.filename, request.content_type, request.size
+        )
+
+        file_extension = request.filename.split(".")[-1].lower()
+        upload_id = f"{uuid4()}.{file_extension}"
+        expires = int(time.time()) + settings.DIRECT_UPLOAD_TTL_SECONDS
+        uri = f"/api/uploads/{user.id}/{upload_id}"
+        query = urlencode(
+            {
+                "expires": expires,
+                "size": request.size,
+                "signature": sign_url(uri, expires, str(request.size)),
+            }
+        )
+        return UploadSlot(
+            upload_id=upload_id,
+            url=f"{settings.SIGNED_URL_BASE.rstrip('/')}{uri}?{query}",
+            max_size=request.size,
+            expires_at=datetime.utcfromtimestamp(expires),
+        )
+
+    async def finalize_upload(
+        self, user: User, upload_id: str, user_filename: str
+    ) -> AudioResponse:
+        """Register a file uploaded through an upload slot.
+
+        The uploaded file is checked for size and format signature, moved
+        into the media directory and saved like a regular upload. An upload
+        slot can be finalized once; a body uploaded again to the same slot
+        URL is discarded.
+
+        Args:
+            user (User): The user who uploaded the file
+            upload_id (str): Identifier from the upload slot
+            user_filename (str): Name given to the file by the user
+
+        Returns:
+            AudioResponse: Information about the uploaded file
+
+        Raises:
+            HTTPException:
+                400 - If the upload id is malformed or the file fails validation
+                404 - If no uploaded file exists for the upload id
+                409 - If the upload has already been finalized
+        """
+        match = UPLOAD_ID_PATTERN.fullmatch(upload_id)
+        if match is None:
+            raise HTTPException(status_code=400, detail="Invalid upload id")
+        processed_filename = self._process_filename(user_filename)
+
+        incoming_path = self._storage.get_incoming_path(user.id, upload_id)
+        if await self._audio_dao.has_upload(user.id, upload_id):
+            await self._storage.delete_file(incoming_path)
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+        try:
+            file_size, _ = await self._storage.get_file_info(incoming_path)
+            header = b""
+            async for chunk in self._storage.read_file(
+                incoming_path, FileValidator.HEADER_SIZE
+            ):
+                header = chunk
+                break
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Uploaded file not found")
+
+        try:
+            FileValidator.validate_metadata(upload_id, None, file_size)
+            FileValidator.validate_header(upload_id, header)
+        except HTTPException:
+            await self._storage.delete_file(incoming_path)
+            raise
+
+        unique_filename = (
+            f"user_{processed_filename}_{match['uuid']}.{match['extension']}"
+        )
+        file_path = self._storage.get_path(unique_filename)
+        try:
+            await self._storage.move_file(incoming_path, file_path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Uploaded file not found")
+        except FileExistsError:
+            await self._storage.delete_file(incoming_path)
+            raise HTTPException(status_code=409, detail="Upload already finalized")
+
+        await self._register_upload(
+            user, unique_filename, processed_filename, file_path, file_size
+        )
         return AudioResponse(
             filename=unique_filename,
             user_filename=processed_filename,
-            content_type=file.content_type,
+            content_type=guess_type(unique_filename)[0] or "application/octet-stream",
             path=file_path,
             size=file_size,
         )
@@ -114,6 +338,9 @@ class AudioService:
     ) -> None:
         """Delete an audio file and its information from the database.
 
+        If the file cannot be removed right away, its removal is queued
+        as a background job.
+
         Args:
             audio_id (int): ID of the audio file to delete
             user (User): The user requesting the deletion
@@ -125,16 +352,169 @@ class AudioService:
                 403 - If user doesn't have permission to delete the file
                 404 - If audio file not found
         """
-        audio = await self._audio_dao.find_one(id=audio_id, is_deleted=False)
-
-        if (audio.user_id != user.id) and not (user.is_supervisor):
-            raise HTTPException(
-                status_code=403,
-                detail="You don't have permission to delete this audio file",
-            )
+        audio = await self._get_accessible_audio(audio_id, user, action="delete")
 
         if full_delete:
-            await self._storage.delete_file(audio.path)
             await self._audio_dao.delete(audio_id)
+            await self._user_dao.update(
+                model_id=audio.user_id, audio_changed_at=datetime.utcnow()
+            )
+            file_body_cache.invalidate(audio.path)
+            try:
+                await self._storage.delete_file(audio.path)
+            except OSError:
+                await self._job_dao.enqueue(
+                    DELETE_FILE,
+                    {"path": audio.path},
+                    max_attempts=settings.JOB_MAX_ATTEMPTS,
+                )
         else:
-            await self._audio_dao.update(model_id=audio_id, is_deleted=True)
+            await self._audio_dao.update(
+                model_id=audio_id, is_deleted=True, deleted_at=datetime.utcnow()
+            )
+        listing_cache.invalidate(audio.user_id)
+
+    async def export_audio(self, user_id: int) -> AsyncIterator[bytes]:
+        """Prepare a streaming ZIP export of a user's audio library.
+
+        The list of files is loaded before streaming starts, so the database
+        session is not held while the archive is being sent.
+
+        Args:
+            user_id (int): ID of the user whose audio files to export
+
+        Returns:
+            AsyncIterator[bytes]: Parts of the ZIP archive
+        """
+        audio_files = await self._audio_dao.find_all(user_id=user_id, is_deleted=False)
+        return ZipArchiveStreamer(self._storage).stream(list(audio_files))
+
+    async def get_download(
+        self, audio_id: int, user: User
+    ) -> tuple[AudioInfoModel, str, float]:
+        """Get an audio file for download with its cache validators.
+
+        The ETag is derived from the file id, size and modification time,
+        so it can be checked without reading the file. The download is
+        recorded for storage tiering; a file in the cold tier is served
+        from there, see `request_promotion`.
+
+        Args:
+            audio_id (int): ID of the audio file
+            user (User): The user requesting the download
+
+        Returns:
+            tuple[AudioInfoModel, str, float]: Audio record, ETag and
+                modification timestamp of the file
+
+        Raises:
+            HTTPException:
+                403 - If user doesn't have permission to download the file
+                404 - If audio file or its content not found
+        """
+        audio = await self._get_accessible_audio(audio_id, user, action="download")
+        try:
+            size, modified_at = await self._storage.get_file_info(audio.path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Audio file content not found")
+        tier_manager.record_access(audio.id)
+        return audio, make_etag("file", audio.id, size, modified_at), modified_at
+
+    async def request_promotion(self, audio: AudioInfoModel) -> None:
+        """Queue a cold audio file to move back to the hot tier.
+
+        Call it only when the body is served, not for 304 responses.
+        Repeated downloads of the same file queue one job per
+        TIER_PROMOTION_RETRY_SECONDS.
+
+        Args:
+            audio (AudioInfoModel): Downloaded audio record
+        """
+        if audio.tier != "cold" or not tier_manager.claim_promotion(audio.id):
+            return
+        try:
+            await self._job_dao.enqueue(
+                PROMOTE_AUDIO,
+                {"audio_id": audio.id},
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+            )
+        except Exception:
+            tier_manager.release_promotion(audio.id)
+            raise
+
+    async def get_cached_body(self, audio: AudioInfoModel) -> Optional[bytes]:
+        """Get the body of a popular audio file from memory.
+
+        Args:
+            audio (AudioInfoModel): Audio record
+
+        Returns:
+            Optional[bytes]: File body, or None if the file should be
+                streamed from storage
+        """
+        try:
+            return await file_body_cache.get(self._storage, audio.path, audio.size)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Audio file content not found")
+
+    async def get_signed_url(self, audio_id: int, user: User) -> SignedUrl:
+        """Create an expiring download URL for an audio file.
+
+        The URL is checked by its signature only, so it can be handed
+        to players or a CDN that cannot send the auth cookie. It names
+        the file by its tier-independent storage key and stays valid
+        while the file moves between tiers.
+
+        Args:
+            audio_id (int): ID of the audio file
+            user (User): The user requesting the URL
+
+        Returns:
+            SignedUrl: URL valid for SIGNED_URL_TTL_SECONDS
+
+        Raises:
+            HTTPException:
+                403 - If user doesn't have permission to download the file
+                404 - If audio file not found or signed URLs are disabled
+        """
+        if not settings.SIGNED_URL_SECRET:
+            raise HTTPException(status_code=404, detail="Signed URLs are disabled")
+        audio = await self._get_accessible_audio(audio_id, user, action="download")
+        key = storage_key(audio.path)
+        if key is None:
+            raise HTTPException(status_code=404, detail="Audio file content not found")
+        tier_manager.record_access(audio.id)
+
+        expires = int(time.time()) + settings.SIGNED_URL_TTL_SECONDS
+        uri = f"/api/media/{quote(key)}"
+        name = self.download_filename(audio)
+        query = urlencode(
+            {"expires": expires, "name": name, "signature": sign_url(uri, expires, name)}
+        )
+        return SignedUrl(
+            url=f"{settings.SIGNED_URL_BASE.rstrip('/')}{uri}?{query}",
+            expires_at=datetime.utcfromtimestamp(expires),
+        )
+
+    async def find_duplicates(self, user_id: int) -> list[AudioDuplicate]:
+        """Find near-duplicate audio files of a user.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            list[AudioDuplicate]: Pairs of likely duplicates
+        """
+        return await duplicate_detector.find_duplicates(user_id)
+
+    @staticmethod
+    def download_filename(audio: AudioInfoModel) -> str:
+        """Build the filename offered to the client for an audio file.
+
+        Args:
+            audio (AudioInfoModel): Audio record
+
+        Returns:
+            str: User filename with the original extension
+        """
+        return f"{audio.user_filename}.{audio.filename.rsplit('.', 1)[-1]}"
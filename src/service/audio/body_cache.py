@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from typing import Optional
+
+from src.core.cache import BytesLRUCache
+from src.core.metrics import metrics
+from src.service.audio.file_storage import FileStorage
+from src.settings import settings
+
+
+class FileBodyCache:
+    """In-memory cache of whole audio file bodies.
+
+    Stored files never change in place, so bodies are keyed by path and
+    only need to be dropped when a file is deleted or moved. A file is
+    admitted after FILE_CACHE_MIN_REQUESTS downloads, so one-off downloads
+    do not push popular files out; among admitted files the least recently
+    used are evicted once FILE_CACHE_MAX_BYTES is reached. Files larger
+    than FILE_CACHE_MAX_ENTRY_BYTES are always served from storage.
+    Download counts are kept for the MAX_TRACKED_FILES most recently
+    requested files.
+    """
+
+    MAX_TRACKED_FILES = 10_000
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int, min_requests: int):
+        """Initialize the cache.
+
+        Args:
+            max_bytes (int): Total size of cached bodies
+            max_entry_bytes (int): Size limit of a single body
+            min_requests (int): Downloads of a file before it is cached
+        """
+        self._cache = BytesLRUCache(max_bytes, max_entry_bytes)
+        self._min_requests = min_requests
+        self._requests: OrderedDict[str, int] = OrderedDict()
+        self._bytes_served = 0
+
+    async def get(
+        self, storage: FileStorage, path: str, size: int
+    ) -> Optional[bytes]:
+        """Get a file body from memory, loading it if it became popular.
+
+        Args:
+            storage (FileStorage): Storage to load the file from
+            path (str): Path of the file
+            size (int): Size of the file in bytes
+
+        Returns:
+            Optional[bytes]: File body, or None if it should be served
+                from storage
+
+        Raises:
+            FileNotFoundError: If the file is admitted but missing
+        """
+        body = self._cache.get(path)
+        if body is not None:
+            self._bytes_served += len(body)
+            return body
+        if size > self._cache.max_entry_bytes:
+            return None
+
+        self._requests[path] = self._requests.get(path, 0) + 1
+        self._requests.move_to_end(path)
+        if len(self._requests) > self.MAX_TRACKED_FILES:
+            self._requests.popitem(last=False)
+        if self._requests[path] < self._min_requests:
+            return None
+
+        body = b"".join([chunk async for chunk in storage.read_file(path, size or 1)])
+        self._requests.pop(path, None)
+        self._cache.put(path, body)
+        return body
+
+    def invalidate(self, *paths: str) -> None:
+        """Drop cached bodies of deleted or moved files.
+
+        Args:
+            *paths (str): Paths of the files
+        """
+        for path in paths:
+            self._cache.pop(path)
+            self._requests.pop(path, None)
+
+    def get_metrics(self) -> dict:
+        """Get cache metrics.
+
+        Returns:
+            dict: Size, usage and hit counters
+        """
+        return {**self._cache.get_metrics(), "bytes_served": self._bytes_served}
+
+
+file_body_cache = FileBodyCache(
+    max_bytes=settings.FILE_CACHE_MAX_BYTES,
+    max_entry_bytes=settings.FILE_CACHE_MAX_ENTRY_BYTES,
+    min_requests=settings.FILE_CACHE_MIN_REQUESTS,
+)
+metrics.register("file_cache", file_body_cache.get_metrics)
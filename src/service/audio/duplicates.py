@@ -0,0 +1,151 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core import fingerprint
+from src.core.db.shards import shard_router
+from src.core.metrics import metrics
+from src.crud import AudioFingerprintDAO
+from src.schemas import AudioDuplicate
+from src.settings import settings
+
+
+class DuplicateDetector:
+    """Fingerprints uploaded audio and finds near-duplicates.
+
+    Decoding and comparing audio is CPU bound, so it runs in a pool of
+    FINGERPRINT_WORKERS processes instead of the event loop. The pool is
+    created on first use and uses the spawn start method, since forking
+    a process with a running event loop and threads is unsafe. The worker
+    functions live in src.core.fingerprint, which only depends on NumPy,
+    so unpickling a task does not import the application. Spawn does
+    re-import the parent's `__main__` module in every worker, though:
+    under main.py or worker.py each worker loads the application once at
+    start-up, which is why both keep their start-up code behind
+    `if __name__ == "__main__"`.
+    """
+
+    def __init__(self):
+        """Initialize the detector."""
+        self._pool = None
+        self._fingerprinted = 0
+        self._failed = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """Get the process pool, creating it on first use.
+
+        Returns:
+            ProcessPoolExecutor: The worker pool
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.FINGERPRINT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    @staticmethod
+    def is_supported(filename: str) -> bool:
+        """Check whether a file can be fingerprinted.
+
+        Args:
+            filename (str): Name of the stored file
+
+        Returns:
+            bool: True for supported formats
+        """
+        extension = filename.rsplit(".", 1)[-1].lower()
+        return extension in fingerprint.SUPPORTED_EXTENSIONS
+
+    async def process(self, audio_id: int, user_id: int, path: str) -> None:
+        """Compute and store the fingerprint of an uploaded file.
+
+        Args:
+            audio_id (int): ID of the audio file
+            user_id (int): ID of the owner
+            path (str): Path to the stored file
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            duration, packed = await loop.run_in_executor(
+                self._get_pool(),
+                fingerprint.compute_fingerprint,
+                path,
+                settings.FINGERPRINT_MAX_SECONDS,
+            )
+            shard = await shard_router.shard_for_user(user_id)
+            async with shard_router.session(shard) as session:
+                await AudioFingerprintDAO(session).save(
+                    audio_id=audio_id,
+                    user_id=user_id,
+                    duration=duration,
+                    fingerprint=packed,
+                    hashes=fingerprint.index_hashes(packed),
+                )
+        except Exception:
+            self._failed += 1
+            raise
+        self._fingerprinted += 1
+
+    async def find_duplicates(self, user_id: int) -> list[AudioDuplicate]:
+        """Find near-duplicate files in a user's library.
+
+        Candidate pairs come from the fingerprint indexes, only those are
+        compared bit by bit in the worker pool.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            list[AudioDuplicate]: Pairs above FINGERPRINT_SIMILARITY_THRESHOLD,
+                most similar first
+        """
+        shard = await shard_router.shard_for_user(user_id)
+        async with shard_router.session(shard) as session:
+            dao = AudioFingerprintDAO(session)
+            pairs = await dao.find_candidate_pairs(
+                user_id=user_id,
+                min_matches=settings.FINGERPRINT_MIN_HASH_MATCHES,
+                duration_tolerance=settings.FINGERPRINT_DURATION_TOLERANCE,
+            )
+            if not pairs:
+                return []
+            fingerprints = await dao.find_fingerprints(
+                list({audio_id for pair in pairs for audio_id in pair})
+            )
+
+        loop = asyncio.get_running_loop()
+        scores = await loop.run_in_executor(
+            self._get_pool(),
+            fingerprint.compare_pairs,
+            [
+                (newer, older, fingerprints[newer], fingerprints[older])
+                for newer, older in sorted(pairs)
+            ],
+        )
+        duplicates = [
+            AudioDuplicate(
+                audio_id=newer, duplicate_of=older, similarity=round(score, 4)
+            )
+            for newer, older, score in scores
+            if score >= settings.FINGERPRINT_SIMILARITY_THRESHOLD
+        ]
+        return sorted(duplicates, key=lambda item: item.similarity, reverse=True)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def get_metrics(self) -> dict:
+        """Get fingerprinting counters.
+
+        Returns:
+            dict: Numbers of fingerprinted and failed files
+        """
+        return {"fingerprinted": self._fingerprinted, "failed": self._failed}
+
+
+duplicate_detector = DuplicateDetector()
+metrics.register("fingerprints", duplicate_detector.get_metrics)
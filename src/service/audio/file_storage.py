@@ -1,7 +1,43 @@
 from abc import ABC, abstractmethod
+import asyncio
+import hashlib
+import logging
 import os
+import shutil
+import time
+from typing import AsyncIterator
+
+import aiofiles
+import aiofiles.os
 from fastapi import UploadFile
 
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+INCOMING_DIR = ".incoming"
+PARTIAL_SUFFIX = ".part"
+
+
+def sharded_path(media_dir: str, filename: str, depth: int) -> str:
+    """Build a fan-out path for a file.
+
+    The file is placed into `depth` nested directories named after
+    two-character hex prefixes of the filename hash, e.g.
+    media/3f/a2/<filename> for depth 2.
+
+    Args:
+        media_dir (str): Root media directory
+        filename (str): Name of the file
+        depth (int): Number of directory levels
+
+    Returns:
+        str: Path of the file inside media_dir
+    """
+    digest = hashlib.sha1(filename.encode()).hexdigest()
+    prefixes = [digest[level * 2 : level * 2 + 2] for level in range(depth)]
+    return os.path.join(media_dir, *prefixes, filename)
+
 
 class FileStorage(ABC):
     """Abstract base class for file storage implementations.
@@ -10,10 +46,45 @@ class FileStorage(ABC):
     Concrete implementations must provide methods for saving and deleting files.
 
     Methods:
+        get_path: Build the storage path for a new file
+        get_incoming_path: Build the path for a direct upload
         save_file: Save a file to storage
+        save_stream: Save a file from a stream of chunks
+        read_file: Read a file from storage in chunks
+        get_file_info: Get size and modification time of a file
+        copy_file: Copy a file to another path, e.g. another tier
+        move_file: Move a file to another path
         delete_file: Delete a file from storage
+        remove_partial_files: Delete leftovers of interrupted writes
     """
 
+    @abstractmethod
+    def get_path(self, filename: str, tier: str = "hot") -> str:
+        """Build the storage path for a new file.
+
+        Args:
+            filename (str): Unique name of the file
+            tier (str, optional): Storage tier, "hot" or "cold".
+                Defaults to "hot".
+
+        Returns:
+            str: Path where the file should be saved
+        """
+        pass
+
+    @abstractmethod
+    def get_incoming_path(self, user_id: int, filename: str) -> str:
+        """Build the path a direct upload is written to before finalizing.
+
+        Args:
+            user_id (int): ID of the uploading user
+            filename (str): Unique name of the file
+
+        Returns:
+            str: Path of the uploaded file
+        """
+        pass
+
     @abstractmethod
     async def save_file(
         self, file: UploadFile, file_path: str, content: bytes = None
@@ -27,6 +98,85 @@ class FileStorage(ABC):
         """
         pass
 
+    @abstractmethod
+    async def save_stream(
+        self, chunks: AsyncIterator[bytes], file_path: str, max_size: int
+    ) -> int:
+        """Save a file from a stream of chunks.
+
+        Args:
+            chunks (AsyncIterator[bytes]): File content
+            file_path (str): Path where the file should be saved
+            max_size (int): Maximum allowed size in bytes
+
+        Returns:
+            int: Size of the saved file
+
+        Raises:
+            ValueError: If the content is larger than max_size
+        """
+        pass
+
+    @abstractmethod
+    def read_file(self, file_path: str, chunk_size: int) -> AsyncIterator[bytes]:
+        """Read a file from storage in chunks.
+
+        Args:
+            file_path (str): Path to the file
+            chunk_size (int): Maximum size of one chunk in bytes
+
+        Yields:
+            bytes: Consecutive chunks of the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def get_file_info(self, file_path: str) -> tuple[int, float]:
+        """Get size and modification time of a file.
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            tuple[int, float]: Size in bytes and modification timestamp
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def copy_file(self, source_path: str, target_path: str) -> None:
+        """Copy a file, keeping its modification time.
+
+        The target appears complete or not at all.
+
+        Args:
+            source_path (str): Path of the file to copy
+            target_path (str): Path of the copy
+
+        Raises:
+            FileNotFoundError: If the source file does not exist
+        """
+        pass
+
+    @abstractmethod
+    async def move_file(self, source_path: str, target_path: str) -> None:
+        """Move a file to another path without overwriting an existing file.
+
+        Args:
+            source_path (str): Path of the file to move
+            target_path (str): New path of the file
+
+        Raises:
+            FileNotFoundError: If the source file does not exist
+            FileExistsError: If a file already exists at the target path
+        """
+        pass
+
     @abstractmethod
     async def delete_file(self, file_path: str) -> None:
         """Delete a file from storage.
@@ -36,22 +186,77 @@ class FileStorage(ABC):
         """
         pass
 
+    @abstractmethod
+    async def remove_partial_files(self, max_age: float) -> int:
+        """Delete files left by writes that were interrupted.
+
+        Args:
+            max_age (float): Minimum age in seconds of a removed file,
+                so writes still running in other processes are kept
+
+        Returns:
+            int: Number of removed files
+        """
+        pass
+
 
 class LocalFileStorage(FileStorage):
     """Implementation of FileStorage for local file system.
 
     This class provides methods for saving and deleting files on the local file system.
+    Files are spread over hash-prefixed subdirectories of settings.MEDIA_DIR,
+    or of settings.COLD_MEDIA_DIR for the cold tier.
 
     Methods:
+        get_path: Build the sharded path for a new file
+        get_incoming_path: Build the path for a direct upload
         save_file: Save a file to local storage
+        save_stream: Save a file from a stream of chunks
+        read_file: Read a file from local storage in chunks
+        get_file_info: Get size and modification time of a local file
+        copy_file: Copy a local file, e.g. to another tier
+        move_file: Move a local file
         delete_file: Delete a file from local storage
+        remove_partial_files: Delete leftover *.part files
     """
 
+    def get_path(self, filename: str, tier: str = "hot") -> str:
+        """Build the sharded path for a new file.
+
+        Args:
+            filename (str): Unique name of the file
+            tier (str, optional): Storage tier, "hot" or "cold".
+                Defaults to "hot".
+
+        Returns:
+            str: Path inside settings.MEDIA_DIR or settings.COLD_MEDIA_DIR
+        """
+        media_dir = settings.COLD_MEDIA_DIR if tier == "cold" else settings.MEDIA_DIR
+        return sharded_path(media_dir, filename, settings.MEDIA_SHARD_DEPTH)
+
+    def get_incoming_path(self, user_id: int, filename: str) -> str:
+        """Build the path a direct upload is written to before finalizing.
+
+        Direct uploads are kept in a per-user directory inside
+        settings.MEDIA_DIR, so finalizing is a rename on the same disk.
+
+        Args:
+            user_id (int): ID of the uploading user
+            filename (str): Unique name of the file
+
+        Returns:
+            str: Path inside settings.MEDIA_DIR/.incoming
+        """
+        return os.path.join(settings.MEDIA_DIR, INCOMING_DIR, str(user_id), filename)
+
     async def save_file(
         self, file: UploadFile, file_path: str, content: bytes = None
     ) -> None:
         """Save a file to local storage.
 
+        The content is written to a temporary name and renamed into place,
+        so a worker killed mid-write leaves no truncated file behind.
+
         Args:
             file (UploadFile): The file to save
             file_path (str): Path where the file should be saved
@@ -59,8 +264,126 @@ class LocalFileStorage(FileStorage):
         """
         if content is None:
             content = await file.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        await aiofiles.os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}{PARTIAL_SUFFIX}"
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                await f.write(content)
+            await aiofiles.os.replace(temp_path, file_path)
+        finally:
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+
+    async def save_stream(
+        self, chunks: AsyncIterator[bytes], file_path: str, max_size: int
+    ) -> int:
+        """Save a file from a stream of chunks.
+
+        The content is written to a temporary name and renamed into place
+        once complete, so an interrupted upload never looks finished.
+
+        Args:
+            chunks (AsyncIterator[bytes]): File content
+            file_path (str): Path where the file should be saved
+            max_size (int): Maximum allowed size in bytes
+
+        Returns:
+            int: Size of the saved file
+
+        Raises:
+            ValueError: If the content is larger than max_size
+        """
+        await aiofiles.os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        temp_path = f"{file_path}{PARTIAL_SUFFIX}"
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as f:
+                async for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_size:
+                        raise ValueError(f"File is larger than {max_size} bytes")
+                    await f.write(chunk)
+            await aiofiles.os.replace(temp_path, file_path)
+        finally:
+            if await aiofiles.os.path.exists(temp_path):
+                await aiofiles.os.remove(temp_path)
+        return size
+
+    async def read_file(self, file_path: str, chunk_size: int) -> AsyncIterator[bytes]:
+        """Read a file from local storage in chunks.
+
+        Args:
+            file_path (str): Path to the file
+            chunk_size (int): Maximum size of one chunk in bytes
+
+        Yields:
+            bytes: Consecutive chunks of the file
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        async with aiofiles.open(file_path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                yield chunk
+
+    async def get_file_info(self, file_path: str) -> tuple[int, float]:
+        """Get size and modification time of a local file.
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            tuple[int, float]: Size in bytes and modification timestamp
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        stat_result = await aiofiles.os.stat(file_path)
+        return stat_result.st_size, stat_result.st_mtime
+
+    async def copy_file(self, source_path: str, target_path: str) -> None:
+        """Copy a local file, keeping its modification time.
+
+        The copy is written to a temporary name and renamed into place,
+        so a partially copied file is never visible under `target_path`.
+
+        Args:
+            source_path (str): Path of the file to copy
+            target_path (str): Path of the copy
+
+        Raises:
+            FileNotFoundError: If the source file does not exist
+        """
+
+        def copy() -> None:
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            temp_path = f"{target_path}{PARTIAL_SUFFIX}"
+            try:
+                shutil.copy2(source_path, temp_path)
+                os.replace(temp_path, target_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        await asyncio.to_thread(copy)
+
+    async def move_file(self, source_path: str, target_path: str) -> None:
+        """Move a local file on the same file system.
+
+        The file is hard-linked to the target path and then unlinked from
+        the source, so an existing file is never replaced.
+
+        Args:
+            source_path (str): Path of the file to move
+            target_path (str): New path of the file
+
+        Raises:
+            FileNotFoundError: If the source file does not exist
+            FileExistsError: If a file already exists at the target path
+        """
+        await aiofiles.os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        await aiofiles.os.link(source_path, target_path)
+        await aiofiles.os.unlink(source_path)
 
     async def delete_file(self, file_path: str) -> None:
         """Delete a file from local storage.
@@ -68,5 +391,40 @@ class LocalFileStorage(FileStorage):
         Args:
             file_path (str): Path to the file to delete
         """
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
+
+    async def remove_partial_files(self, max_age: float) -> int:
+        """Delete leftover *.part files from the media directories.
+
+        Args:
+            max_age (float): Minimum age in seconds of a removed file,
+                so writes still running in other processes are kept
+
+        Returns:
+            int: Number of removed files
+        """
+
+        def remove() -> int:
+            deadline = time.time() - max_age
+            removed = 0
+            for media_dir in (settings.MEDIA_DIR, settings.COLD_MEDIA_DIR):
+                if not media_dir:
+                    continue
+                for root, _, files in os.walk(media_dir):
+                    for name in files:
+                        if not name.endswith(PARTIAL_SUFFIX):
+                            continue
+                        path = os.path.join(root, name)
+                        try:
+                            if os.stat(path).st_mtime < deadline:
+                                os.remove(path)
+                                removed += 1
+                        except FileNotFoundError:
+                            pass
+            return removed
+
+        removed = await asyncio.to_thread(remove)
+        if removed:
+            logger.warning("Removed %d partial files of interrupted writes", removed)
+        return removed
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from fastapi import HTTPException, UploadFile, status
 
 
@@ -10,10 +12,12 @@ class FileValidator:
     Attributes:
         ALLOWED_EXTENSIONS (set[str]): Set of allowed file extensions
         MAX_FILE_SIZE (int): Maximum allowed file size in bytes
+        HEADER_SIZE (int): Number of leading bytes needed to check the format
     """
 
     ALLOWED_EXTENSIONS = {"mp3", "wav", "ogg", "m4a", "flac"}
     MAX_FILE_SIZE = 50 * 1024 * 1024
+    HEADER_SIZE = 12
 
     @classmethod
     def validate_audio(cls, file: UploadFile) -> None:
@@ -27,15 +31,72 @@ class FileValidator:
         Raises:
             HTTPException: 400 if file is not an audio file or has unsupported format
         """
-        if not file.content_type.startswith("audio/"):
+        cls.validate_metadata(file.filename, file.content_type or "")
+
+    @classmethod
+    def validate_metadata(
+        cls, filename: str, content_type: Optional[str], size: Optional[int] = None
+    ) -> None:
+        """Validate the declared type, name and size of an audio file.
+
+        Args:
+            filename (str): Original filename with extension
+            content_type (str, optional): MIME type of the file.
+                Not checked if None.
+            size (int, optional): Size of the file in bytes
+
+        Raises:
+            HTTPException: 400 if file is not an audio file, has unsupported
+                format or is empty or too large
+        """
+        if content_type is not None and not content_type.startswith("audio/"):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Only audio files are allowed",
             )
 
-        file_extension = file.filename.split(".")[-1].lower()
+        file_extension = filename.split(".")[-1].lower()
         if file_extension not in cls.ALLOWED_EXTENSIONS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Unsupported file format. Allowed formats: {', '.join(cls.ALLOWED_EXTENSIONS)}",
             )
+
+        if size is not None and not 0 < size <= cls.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File size must be between 1 and {cls.MAX_FILE_SIZE} bytes",
+            )
+
+    @classmethod
+    def validate_header(cls, filename: str, header: bytes) -> None:
+        """Check that the file content matches its extension.
+
+        Args:
+            filename (str): Filename with extension
+            header (bytes): First HEADER_SIZE bytes of the file
+
+        Raises:
+            HTTPException: 400 if the content is not in the declared format
+        """
+        file_extension = filename.split(".")[-1].lower()
+        if file_extension == "mp3":
+            valid = header.startswith(b"ID3") or (
+                len(header) >= 2 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0
+            )
+        elif file_extension == "wav":
+            valid = header[:4] == b"RIFF" and header[8:12] == b"WAVE"
+        elif file_extension == "ogg":
+            valid = header.startswith(b"OggS")
+        elif file_extension == "flac":
+            valid = header.startswith(b"fLaC")
+        elif file_extension == "m4a":
+            valid = header[4:8] == b"ftyp"
+        else:
+            valid = False
+
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File content is not a valid {file_extension} file",
+            )
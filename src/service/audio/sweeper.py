@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from typing import Iterator
+
+from src.core.db.database import advisory_lock, async_session
+from src.core.metrics import metrics
+from src.crud import AudioDAO, UserDAO
+from src.service.audio.body_cache import file_body_cache
+from src.service.audio.file_storage import FileStorage, LocalFileStorage
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def scan_media_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively iterate over files of a media directory.
+
+    Args:
+        directory (str): Directory to scan
+
+    Yields:
+        os.DirEntry: Entries of regular files
+    """
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def _changed_before(path: str, deadline: float) -> bool:
+    """Check whether a file exists and its inode was last changed before a time.
+
+    Args:
+        path (str): File path
+        deadline (float): Unix timestamp
+
+    Returns:
+        bool: False for missing or recently changed files
+    """
+    try:
+        return os.stat(path).st_ctime < deadline
+    except FileNotFoundError:
+        return False
+
+
+class RetentionSweeper:
+    """Background cleanup of soft-deleted audio and storage drift.
+
+    Each run hard-deletes audio soft-deleted more than RETENTION_DAYS ago in
+    batches (the row first, then the file through the storage layer) and
+    reconciles MEDIA_DIR with the database: files without a row older than
+    SWEEPER_ORPHAN_GRACE_SECONDS are reported and, with
+    SWEEPER_DELETE_ORPHANS, removed; rows without a file are reported.
+    File age is the inode change time: tiering copies, finalized uploads
+    and the media layout migration create files that keep an old mtime
+    before their row points to them, but never an old ctime.
+    A pause of SWEEPER_PAUSE_SECONDS between batches keeps the sweeper
+    from competing with foreground I/O. With several workers only the one
+    holding a Postgres advisory lock runs a sweep.
+
+    Attributes:
+        _storage (FileStorage): Storage used to delete files
+    """
+
+    ADVISORY_LOCK_KEY = 0x5E3E9
+
+    def __init__(self, storage: FileStorage | None = None):
+        """Initialize the sweeper.
+
+        Args:
+            storage (FileStorage, optional): Storage used to delete files.
+                Defaults to LocalFileStorage.
+        """
+        self._storage = storage or LocalFileStorage()
+        self._batch_size = settings.SWEEPER_BATCH_SIZE
+        self._pause = settings.SWEEPER_PAUSE_SECONDS
+        self._purged = 0
+        self._orphan_files = 0
+        self._orphan_files_deleted = 0
+        self._missing_files = 0
+        self._last_run = None
+
+    async def purge_expired(self) -> int:
+        """Hard-delete audio soft-deleted longer than the retention period.
+
+        Returns:
+            int: Number of purged audio records
+        """
+        before = datetime.utcnow() - timedelta(days=settings.RETENTION_DAYS)
+        purged = 0
+        while True:
+            async with async_session() as session:
+                rows = await AudioDAO(session).purge_deleted(
+                    before=before, limit=self._batch_size
+                )
+                if rows:
+                    await UserDAO(session).update_many(
+                        list({user_id for _, _, user_id in rows}),
+                        {"audio_changed_at": datetime.utcnow()},
+                    )
+            for _, path, _ in rows:
+                file_body_cache.invalidate(path)
+                await self._storage.delete_file(path)
+
+            purged += len(rows)
+            self._purged += len(rows)
+            if len(rows) < self._batch_size:
+                return purged
+            await asyncio.sleep(self._pause)
+
+    async def find_orphan_files(self) -> list[str]:
+        """Find files in MEDIA_DIR and COLD_MEDIA_DIR that have no audio record.
+
+        Returns:
+            list[str]: Paths of orphan files
+        """
+        grace_deadline = time.time() - settings.SWEEPER_ORPHAN_GRACE_SECONDS
+        entries = chain.from_iterable(
+            scan_media_files(directory)
+            for directory in (settings.MEDIA_DIR, settings.COLD_MEDIA_DIR)
+            if directory
+        )
+        orphans = []
+        while True:
+            scanned, batch = await asyncio.to_thread(
+                self._next_old_files, entries, grace_deadline
+            )
+            if not scanned:
+                return orphans
+
+            if batch:
+                async with async_session() as session:
+                    known = await AudioDAO(session).find_existing_paths(batch)
+                orphans.extend(path for path in batch if path not in known)
+            await asyncio.sleep(self._pause)
+
+    def _next_old_files(
+        self, entries: Iterator[os.DirEntry], deadline: float
+    ) -> tuple[int, list[str]]:
+        """Scan the next batch of files and keep those older than a deadline.
+
+        A batch of only recent files is not the end of the scan, so the
+        number of scanned entries is returned separately.
+
+        Args:
+            entries (Iterator[os.DirEntry]): Remaining directory entries
+            deadline (float): Keep files changed before this timestamp
+
+        Returns:
+            tuple[int, list[str]]: Number of scanned entries and paths
+                of the old files among them
+        """
+        scanned = 0
+        paths = []
+        for entry in islice(entries, self._batch_size):
+            scanned += 1
+            try:
+                if entry.stat().st_ctime < deadline:
+                    paths.append(entry.path)
+            except FileNotFoundError:
+                continue
+        return scanned, paths
+
+    async def delete_orphan_files(self, paths: list[str]) -> int:
+        """Delete orphan files that are still orphans.
+
+        A file reported by the scan may have gained its row since, e.g. by
+        a tier move, so every batch is checked against the database and
+        the grace period again right before it is deleted.
+
+        Args:
+            paths (list[str]): Paths found by `find_orphan_files`
+
+        Returns:
+            int: Number of deleted files
+        """
+        deleted = 0
+        for start in range(0, len(paths), self._batch_size):
+            batch = paths[start : start + self._batch_size]
+            grace_deadline = time.time() - settings.SWEEPER_ORPHAN_GRACE_SECONDS
+            batch = await asyncio.to_thread(
+                lambda: [path for path in batch if _changed_before(path, grace_deadline)]
+            )
+            if not batch:
+                continue
+            async with async_session() as session:
+                known = await AudioDAO(session).find_existing_paths(batch)
+            for path in batch:
+                if path not in known:
+                    await self._storage.delete_file(path)
+                    deleted += 1
+            await asyncio.sleep(self._pause)
+        return deleted
+
+    async def find_missing_files(self) -> list[int]:
+        """Find audio records whose file does not exist.
+
+        Returns:
+            list[int]: Ids of records without a file
+        """
+        missing = []
+        last_id = 0
+        while True:
+            async with async_session() as session:
+                rows = await AudioDAO(session).find_paths_page(
+                    after_id=last_id, limit=self._batch_size
+                )
+            if not rows:
+                return missing
+
+            last_id = rows[-1][0]
+            exists = await asyncio.to_thread(
+                lambda: [os.path.exists(path) for _, path in rows]
+            )
+            missing.extend(
+                audio_id for (audio_id, _), found in zip(rows, exists) if not found
+            )
+            await asyncio.sleep(self._pause)
+
+    async def reconcile(self) -> dict:
+        """Compare MEDIA_DIR with the database.
+
+        Returns:
+            dict: Orphan file paths and ids of records without a file
+        """
+        orphans = await self.find_orphan_files()
+        self._orphan_files += len(orphans)
+        if orphans:
+            logger.warning("Found %d files without audio records", len(orphans))
+        if settings.SWEEPER_DELETE_ORPHANS:
+            self._orphan_files_deleted += await self.delete_orphan_files(orphans)
+
+        missing = await self.find_missing_files()
+        self._missing_files += len(missing)
+        if missing:
+            logger.warning(
+                "Found %d audio records without files: %s", len(missing), missing
+            )
+        return {"orphan_files": orphans, "missing_files": missing}
+
+    async def run_once(self) -> None:
+        """Run one sweep if no other worker is running it."""
+        async with advisory_lock(self.ADVISORY_LOCK_KEY) as acquired:
+            if not acquired:
+                return
+            purged = await self.purge_expired()
+            logger.info("Purged %d expired audio records", purged)
+            await self.reconcile()
+            self._last_run = datetime.utcnow()
+
+    async def run_forever(self) -> None:
+        """Run sweeps every SWEEPER_INTERVAL_SECONDS until cancelled."""
+        while True:
+            await asyncio.sleep(settings.SWEEPER_INTERVAL_SECONDS)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Retention sweep failed")
+
+    def get_metrics(self) -> dict:
+        """Get sweeper metrics.
+
+        Returns:
+            dict: Counters accumulated since the process start
+        """
+        return {
+            "purged": self._purged,
+            "orphan_files": self._orphan_files,
+            "orphan_files_deleted": self._orphan_files_deleted,
+            "missing_files": self._missing_files,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+        }
+
+
+retention_sweeper = RetentionSweeper()
+metrics.register("retention_sweeper", retention_sweeper.get_metrics)
@@ -0,0 +1,235 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from src.core.db.database import advisory_lock, async_session
+from src.core.metrics import metrics
+from src.crud import AudioDAO
+from src.service.audio.body_cache import file_body_cache
+from src.service.audio.file_storage import FileStorage, LocalFileStorage
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TierManager:
+    """Moves audio files between the hot and the cold storage tier.
+
+    Downloads are recorded in memory and written to `last_accessed_at`
+    in one batch every ACCESS_FLUSH_INTERVAL_SECONDS, so tracking costs no
+    query per request. Every TIER_INTERVAL_SECONDS files not accessed for
+    TIER_DEMOTE_AFTER_DAYS are moved to COLD_MEDIA_DIR; a cold file is
+    moved back when it is downloaded. A move copies the file, switches
+    the record to the new path and only then removes the old copy. With
+    several workers only the one holding a Postgres advisory lock demotes.
+    A cold file is queued for promotion at most once per
+    TIER_PROMOTION_RETRY_SECONDS, however often it is downloaded.
+
+    Attributes:
+        _storage (FileStorage): Storage used to move files
+    """
+
+    ADVISORY_LOCK_KEY = 0x5E3EA
+    MAX_PENDING_PROMOTIONS = 10_000
+
+    def __init__(self, storage: FileStorage | None = None):
+        """Initialize the tier manager.
+
+        Args:
+            storage (FileStorage, optional): Storage used to move files.
+                Defaults to LocalFileStorage.
+        """
+        self._storage = storage or LocalFileStorage()
+        self._accesses: dict[int, datetime] = {}
+        self._promotions: OrderedDict[int, float] = OrderedDict()
+        self._last_demotion = None
+        self._demoted = 0
+        self._promoted = 0
+        self._accesses_flushed = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a cold tier is configured."""
+        return settings.COLD_MEDIA_DIR is not None
+
+    def record_access(self, audio_id: int) -> None:
+        """Remember that an audio file has been accessed.
+
+        Args:
+            audio_id (int): ID of the audio file
+        """
+        self._accesses[audio_id] = datetime.utcnow()
+
+    def claim_promotion(self, audio_id: int) -> bool:
+        """Check whether a cold file should be queued for promotion now.
+
+        Claims expire after TIER_PROMOTION_RETRY_SECONDS, so a promotion
+        whose job failed is requested again by a later download.
+
+        Args:
+            audio_id (int): ID of the audio file
+
+        Returns:
+            bool: True if no promotion was requested recently; the caller
+                then queues it
+        """
+        now = time.monotonic()
+        while self._promotions:
+            oldest_id, requested_at = next(iter(self._promotions.items()))
+            if now - requested_at < settings.TIER_PROMOTION_RETRY_SECONDS:
+                break
+            del self._promotions[oldest_id]
+        if audio_id in self._promotions:
+            return False
+        self._promotions[audio_id] = now
+        if len(self._promotions) > self.MAX_PENDING_PROMOTIONS:
+            self._promotions.popitem(last=False)
+        return True
+
+    def release_promotion(self, audio_id: int) -> None:
+        """Forget a promotion claim whose job could not be queued.
+
+        Args:
+            audio_id (int): ID of the audio file
+        """
+        self._promotions.pop(audio_id, None)
+
+    async def flush_accesses(self) -> int:
+        """Write buffered access times to the database.
+
+        Returns:
+            int: Number of written access times
+        """
+        if not self._accesses:
+            return 0
+        accesses, self._accesses = self._accesses, {}
+        try:
+            async with async_session() as session:
+                await AudioDAO(session).record_accesses(accesses)
+        except Exception:
+            for audio_id, accessed_at in accesses.items():
+                self._accesses.setdefault(audio_id, accessed_at)
+            raise
+        self._accesses_flushed += len(accesses)
+        return len(accesses)
+
+    async def _move(self, audio_id: int, filename: str, path: str, tier: str) -> bool:
+        """Move an audio file to another tier.
+
+        Args:
+            audio_id (int): ID of the audio file
+            filename (str): Stored name of the file
+            path (str): Current path of the file
+            tier (str): Target tier
+
+        Returns:
+            bool: True if the file was moved
+        """
+        new_path = self._storage.get_path(filename, tier)
+        try:
+            await self._storage.copy_file(path, new_path)
+        except FileNotFoundError:
+            logger.warning("Cannot move audio %s, file %s is missing", audio_id, path)
+            return False
+
+        async with async_session() as session:
+            moved = await AudioDAO(session).move_to_tier(
+                audio_id=audio_id, old_path=path, new_path=new_path, tier=tier
+            )
+        if moved:
+            file_body_cache.invalidate(path)
+        await self._storage.delete_file(path if moved else new_path)
+        return moved
+
+    async def demote_inactive(self) -> int:
+        """Move files not accessed for TIER_DEMOTE_AFTER_DAYS to the cold tier.
+
+        Returns:
+            int: Number of demoted files
+        """
+        before = datetime.utcnow() - timedelta(days=settings.TIER_DEMOTE_AFTER_DAYS)
+        demoted = 0
+        last_id = 0
+        while True:
+            async with async_session() as session:
+                rows = await AudioDAO(session).find_demotion_candidates(
+                    before=before, after_id=last_id, limit=settings.TIER_BATCH_SIZE
+                )
+            if not rows:
+                return demoted
+
+            last_id = rows[-1][0]
+            for audio_id, filename, path in rows:
+                if await self._move(audio_id, filename, path, "cold"):
+                    demoted += 1
+                    self._demoted += 1
+            await asyncio.sleep(settings.TIER_PAUSE_SECONDS)
+
+    async def promote(self, audio_id: int) -> None:
+        """Move a cold audio file back to the hot tier.
+
+        Does nothing if the file is already hot or has been deleted.
+
+        Args:
+            audio_id (int): ID of the audio file
+        """
+        async with async_session() as session:
+            audio = await AudioDAO(session).find_one_or_none(id=audio_id)
+        if audio is None or audio.tier != "cold":
+            return
+        if await self._move(audio.id, audio.filename, audio.path, "hot"):
+            self._promoted += 1
+
+    async def run_once(self) -> None:
+        """Flush access times and, when due, demote inactive files."""
+        await self.flush_accesses()
+        if not self.enabled:
+            return
+        if (
+            self._last_demotion is not None
+            and time.monotonic() - self._last_demotion < settings.TIER_INTERVAL_SECONDS
+        ):
+            return
+        self._last_demotion = time.monotonic()
+        async with advisory_lock(self.ADVISORY_LOCK_KEY) as acquired:
+            if acquired:
+                demoted = await self.demote_inactive()
+                logger.info("Demoted %d audio files to the cold tier", demoted)
+
+    async def run_forever(self) -> None:
+        """Run every ACCESS_FLUSH_INTERVAL_SECONDS until cancelled.
+
+        Buffered access times are flushed once more on cancellation.
+        """
+        try:
+            while True:
+                await asyncio.sleep(settings.ACCESS_FLUSH_INTERVAL_SECONDS)
+                try:
+                    await self.run_once()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Storage tiering run failed")
+        finally:
+            await self.flush_accesses()
+
+    def get_metrics(self) -> dict:
+        """Get tiering metrics.
+
+        Returns:
+            dict: Counters accumulated since the process start
+        """
+        return {
+            "enabled": self.enabled,
+            "pending_accesses": len(self._accesses),
+            "pending_promotions": len(self._promotions),
+            "accesses_flushed": self._accesses_flushed,
+            "demoted": self._demoted,
+            "promoted": self._promoted,
+        }
+
+
+tier_manager = TierManager()
+metrics.register("tiering", tier_manager.get_metrics)
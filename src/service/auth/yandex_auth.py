@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException
 import httpx
 from passlib.context import CryptContext
+from src.core.db.shards import shard_router
 from src.crud.user import UserDAO
 from src.models import User
 from src.settings import settings
@@ -95,4 +96,5 @@ class YandexAuthService:
             "last_name": yandex_data.get("last_name"),
         }
         created_user = await self._user_dao.add(user_data)
+        await shard_router.assign(created_user.id)
         return created_user
@@ -0,0 +1,4 @@
+from src.service.jobs.registry import job_registry
+from src.service.jobs.worker import JobWorker, job_worker
+
+__all__ = ["job_registry", "JobWorker", "job_worker"]
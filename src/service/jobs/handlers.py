@@ -0,0 +1,58 @@
+from src.core.events import event_broker
+from src.service.audio.duplicates import duplicate_detector
+from src.service.audio.file_storage import LocalFileStorage
+from src.service.audio.tiering import tier_manager
+from src.service.jobs.registry import job_registry
+
+FINGERPRINT_AUDIO = "fingerprint_audio"
+DELETE_FILE = "delete_file"
+PROMOTE_AUDIO = "promote_audio"
+
+
+@job_registry.handler(FINGERPRINT_AUDIO)
+async def fingerprint_audio(audio_id: int, user_id: int, path: str) -> None:
+    """Compute and store the acoustic fingerprint of an uploaded file.
+
+    Status changes are published to the owner's event stream.
+
+    Args:
+        audio_id (int): ID of the audio file
+        user_id (int): ID of the owner
+        path (str): Path to the stored file
+    """
+    status = {"audio_id": audio_id, "task": FINGERPRINT_AUDIO}
+    await event_broker.publish(
+        user_id, "processing.status", {**status, "status": "running"}
+    )
+    try:
+        await duplicate_detector.process(audio_id=audio_id, user_id=user_id, path=path)
+    except Exception as e:
+        await event_broker.publish(
+            user_id,
+            "processing.status",
+            {**status, "status": "failed", "error": type(e).__name__},
+        )
+        raise
+    await event_broker.publish(
+        user_id, "processing.status", {**status, "status": "completed"}
+    )
+
+
+@job_registry.handler(DELETE_FILE)
+async def delete_file(path: str) -> None:
+    """Remove a file whose audio record has been deleted.
+
+    Args:
+        path (str): Path to the file
+    """
+    await LocalFileStorage().delete_file(path)
+
+
+@job_registry.handler(PROMOTE_AUDIO)
+async def promote_audio(audio_id: int) -> None:
+    """Move a downloaded cold audio file back to the hot tier.
+
+    Args:
+        audio_id (int): ID of the audio file
+    """
+    await tier_manager.promote(audio_id)
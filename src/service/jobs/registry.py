@@ -0,0 +1,48 @@
+from typing import Awaitable, Callable
+
+JobHandler = Callable[..., Awaitable[None]]
+
+
+class JobRegistry:
+    """Maps job kinds to their handlers.
+
+    Handlers are async functions receiving the job payload as keyword
+    arguments. A handler raising an exception makes the job retried.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._handlers: dict[str, JobHandler] = {}
+
+    def handler(self, kind: str) -> Callable[[JobHandler], JobHandler]:
+        """Register a handler for a job kind.
+
+        Args:
+            kind (str): Name of the job kind
+
+        Returns:
+            Callable: Decorator registering the function
+        """
+
+        def decorator(func: JobHandler) -> JobHandler:
+            self._handlers[kind] = func
+            return func
+
+        return decorator
+
+    def get(self, kind: str) -> JobHandler:
+        """Get the handler of a job kind.
+
+        Args:
+            kind (str): Name of the job kind
+
+        Returns:
+            JobHandler: The registered handler
+
+        Raises:
+            KeyError: If no handler is registered for the kind
+        """
+        return self._handlers[kind]
+
+
+job_registry = JobRegistry()
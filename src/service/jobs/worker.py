@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import random
+from contextlib import suppress
+from datetime import datetime, timedelta
+
+from src.core.db.database import async_session
+from src.core.metrics import metrics
+from src.crud import JobDAO
+from src.models import Job
+from src.service.jobs import handlers  # noqa: F401 - registers the handlers
+from src.service.jobs.registry import job_registry
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Runs queued jobs at a bounded concurrency.
+
+    The worker polls the job table every JOB_POLL_INTERVAL_SECONDS while
+    the queue is empty and claims only as many jobs as it has free slots,
+    so JOB_WORKER_CONCURRENCY limits the load it puts on the database and
+    the file system. Failed jobs are retried with exponential backoff and
+    jitter until JOB_MAX_ATTEMPTS is reached. A job running longer than
+    JOB_VISIBILITY_TIMEOUT_SECONDS is cancelled, since another worker may
+    claim it by then.
+    """
+
+    def __init__(self, concurrency: int | None = None):
+        """Initialize the worker.
+
+        Args:
+            concurrency (int, optional): Maximum number of jobs run at once.
+                Defaults to JOB_WORKER_CONCURRENCY.
+        """
+        self._concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self._running: set[asyncio.Task] = set()
+        self._stopping: asyncio.Event | None = None
+        self._completed = 0
+        self._retried = 0
+        self._failed = 0
+
+    @staticmethod
+    def retry_delay(attempt: int) -> float:
+        """Get the backoff before retrying a failed attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting at 1
+
+        Returns:
+            float: Delay in seconds
+        """
+        delay = min(
+            settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempt - 1),
+            settings.JOB_RETRY_MAX_SECONDS,
+        )
+        return delay * random.uniform(0.5, 1)
+
+    async def _record_failure(self, job: Job, error: str, retry: bool) -> None:
+        """Schedule a retry of a failed job or mark it as failed.
+
+        Args:
+            job (Job): The failed job
+            error (str): Error description
+            retry (bool): Whether the job may be retried
+        """
+        retry_at = None
+        if retry and job.attempts < job.max_attempts:
+            retry_at = datetime.utcnow() + timedelta(
+                seconds=self.retry_delay(job.attempts)
+            )
+            self._retried += 1
+            logger.warning("Job %s (%s) failed, retrying: %s", job.id, job.kind, error)
+        else:
+            self._failed += 1
+            logger.error("Job %s (%s) failed: %s", job.id, job.kind, error)
+        async with async_session() as session:
+            await JobDAO(session).fail(job.id, job.attempts, error, retry_at)
+
+    async def _execute(self, job: Job) -> None:
+        """Run one claimed job and record its outcome.
+
+        Args:
+            job (Job): The claimed job
+        """
+        if job.attempts > job.max_attempts:
+            await self._record_failure(
+                job, "Visibility timeout expired on the last attempt", retry=False
+            )
+            return
+        try:
+            handler = job_registry.get(job.kind)
+        except KeyError:
+            await self._record_failure(job, f"Unknown job kind {job.kind}", retry=False)
+            return
+
+        try:
+            await asyncio.wait_for(
+                handler(**job.payload), timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            await self._record_failure(job, f"{type(e).__name__}: {e}", retry=True)
+            return
+
+        async with async_session() as session:
+            await JobDAO(session).complete(job.id, job.attempts)
+        self._completed += 1
+
+    async def run_once(self, limit: int) -> int:
+        """Claim up to `limit` jobs and start them.
+
+        Args:
+            limit (int): Maximum number of jobs to claim
+
+        Returns:
+            int: Number of claimed jobs
+        """
+        async with async_session() as session:
+            jobs = await JobDAO(session).claim(
+                limit=limit, visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+            )
+        for job in jobs:
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(jobs)
+
+    async def run_forever(self) -> None:
+        """Process jobs until `stop` is called.
+
+        After stopping, running jobs get JOB_SHUTDOWN_TIMEOUT_SECONDS to
+        finish. Jobs cancelled at that point are claimed again once their
+        visibility timeout expires.
+        """
+        self._stopping = asyncio.Event()
+        while not self._stopping.is_set():
+            free = self._concurrency - len(self._running)
+            claimed = 0
+            if free > 0:
+                try:
+                    claimed = await self.run_once(free)
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+            if free > 0 and claimed == free:
+                continue
+
+            stop_waiter = asyncio.create_task(self._stopping.wait())
+            await asyncio.wait(
+                {stop_waiter, *self._running},
+                timeout=settings.JOB_POLL_INTERVAL_SECONDS,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            stop_waiter.cancel()
+
+        if self._running:
+            _, pending = await asyncio.wait(
+                set(self._running), timeout=settings.JOB_SHUTDOWN_TIMEOUT_SECONDS
+            )
+            for task in pending:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+
+    def stop(self) -> None:
+        """Stop claiming new jobs."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    def get_metrics(self) -> dict:
+        """Get job counters of this process.
+
+        Returns:
+            dict: Running, completed, retried and failed jobs
+        """
+        return {
+            "running": len(self._running),
+            "completed": self._completed,
+            "retried": self._retried,
+            "failed": self._failed,
+        }
+
+
+job_worker = JobWorker()
+metrics.register("job_worker", job_worker.get_metrics)
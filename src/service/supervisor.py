@@ -1,7 +1,19 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+
+import orjson
 from fastapi import Depends
+from src.core.cache import listing_cache
+from src.core.conditional import make_etag
+from src.core.db.database import async_session
+from src.core.responses import render_model_json
 from src.crud import UserDAO, AudioDAO
 from src.models import User
-from src.schemas import UserInfo, UpdateUserInfo, AudioFullInfo
+from src.schemas import UserInfo, UpdateUserInfo, AudioFullInfo, BulkItemResult
+from src.service.audio import FileStorage, LocalFileStorage
+from src.service.audio.body_cache import file_body_cache
+from src.settings import settings
 
 
 class SupervisorService:
@@ -13,17 +25,25 @@ class SupervisorService:
     Attributes:
         _user_dao (UserDAO): Data access object for user operations
         _audio_dao (AudioDAO): Data access object for audio file operations
+        _storage (FileStorage): Storage service for file operations
     """
 
-    def __init__(self, user_dao: UserDAO = Depends(), audio_dao: AudioDAO = Depends()):
+    def __init__(
+        self,
+        user_dao: UserDAO = Depends(),
+        audio_dao: AudioDAO = Depends(),
+        storage: FileStorage = Depends(LocalFileStorage),
+    ):
         """Initialize the supervisor service.
 
         Args:
             user_dao (UserDAO): Data access object for user operations
             audio_dao (AudioDAO): Data access object for audio file operations
+            storage (FileStorage): Storage service for file operations
         """
         self._user_dao = user_dao
         self._audio_dao = audio_dao
+        self._storage = storage
 
     async def process_user_info(self, user: User) -> UserInfo:
         """Convert User model to UserInfo schema.
@@ -61,6 +81,23 @@ class SupervisorService:
         result = await self._user_dao.find_one(id=user_id)
         return await self.process_user_info(result)
 
+    async def get_user_fields(self, user_id: int, fields: tuple[str, ...]) -> dict:
+        """Get selected fields of a user.
+
+        Only the requested columns are loaded from the database.
+
+        Args:
+            user_id (int): ID of the user to retrieve
+            fields (tuple[str, ...]): UserInfo fields to return
+
+        Returns:
+            dict: Requested fields
+
+        Raises:
+            HTTPException: 404 if user not found
+        """
+        return await self._user_dao.find_one_fields(fields, id=user_id)
+
     async def update_user(self, user_id: int, update_data: UpdateUserInfo) -> UserInfo:
         """Update user information.
 
@@ -86,6 +123,10 @@ class SupervisorService:
     async def delete_user(self, user_id: int, full_delete: bool = False) -> bool:
         """Delete or deactivate a user.
 
+        A full delete also removes the user's audio records and files.
+        The audio tables of other shards have no foreign key to the user,
+        so the records are deleted explicitly.
+
         Args:
             user_id (int): ID of the user to delete
             full_delete (bool, optional): If True, permanently delete the user.
@@ -95,13 +136,19 @@ class SupervisorService:
             bool: True if operation was successful
 
         Raises:
-            HTTPException: 404 if user not found or inactive
+            HTTPException: 404 if user not found or inactive,
+                503 if the user is being moved to another shard
         """
         if full_delete:
+            await self._user_dao.find_one(id=user_id)
+            audio = await self._audio_dao.delete_many_with_paths(user_ids=[user_id])
             await self._user_dao.delete(model_id=user_id)
+            file_body_cache.invalidate(*(path for _, path in audio))
+            await self._delete_files([path for _, path in audio])
         else:
             await self._user_dao.find_one(id=user_id, is_active=True)
             await self._user_dao.update(model_id=user_id, is_active=False)
+        listing_cache.invalidate(user_id)
         return True
 
     async def activate_user(self, user_id: int) -> bool:
@@ -119,13 +166,68 @@ class SupervisorService:
         await self._user_dao.update(model_id=user_id, is_active=True)
         return True
 
-    async def get_user_audio(
+    async def get_user_audio_version(
         self, user_id: int, include_deleted: bool = False
+    ) -> tuple[str, Optional[datetime]]:
+        """Get the ETag and last modification time of a user's audio listing.
+
+        Uses a single aggregate query instead of loading the listing.
+
+        Args:
+            user_id (int): ID of the user whose audio files are listed
+            include_deleted (bool, optional): Whether the listing includes
+                deleted files. Defaults to False.
+
+        Returns:
+            tuple[str, Optional[datetime]]: ETag and last modification time
+
+        Raises:
+            HTTPException: 404 if user not found or inactive
+        """
+        user = await self._user_dao.find_one(id=user_id, is_active=True)
+        count, max_id, max_created, max_deleted, max_updated = (
+            await self._audio_dao.get_listing_version(
+                user_id=user_id, include_deleted=include_deleted
+            )
+        )
+        etag = make_etag(
+            "audio",
+            user_id,
+            include_deleted,
+            count,
+            max_id,
+            max_created,
+            max_deleted,
+            max_updated,
+            user.audio_changed_at,
+        )
+        last_modified = max(
+            (
+                value
+                for value in (
+                    max_created,
+                    max_deleted,
+                    max_updated,
+                    user.audio_changed_at,
+                )
+                if value
+            ),
+            default=None,
+        )
+        return etag, last_modified
+
+    async def get_user_audio(
+        self, user_id: int, include_deleted: bool = False, check_user: bool = True
     ) -> list[AudioFullInfo]:
         """Get list of user's audio files.
 
         Args:
             user_id (int): ID of the user whose audio files to retrieve
+            include_deleted (bool, optional): Whether to include deleted files.
+                Defaults to False.
+            check_user (bool, optional): Whether to check that the user exists
+                and is active. Pass False if the caller already did it.
+                Defaults to True.
 
         Returns:
             list[AudioFullInfo]: List of user's audio files
@@ -133,7 +235,8 @@ class SupervisorService:
         Raises:
             HTTPException: 404 if user not found or inactive
         """
-        await self._user_dao.find_one(id=user_id, is_active=True)
+        if check_user:
+            await self._user_dao.find_one(id=user_id, is_active=True)
         if include_deleted:
             audio_files = await self._audio_dao.find_all(user_id=user_id)
         else:
@@ -150,6 +253,212 @@ class SupervisorService:
                 path=audio.path,
                 size=audio.size,
                 created_at=audio.created_at,
+                tier=audio.tier,
             )
             for audio in audio_files
         ]
+
+    async def get_user_audio_json(
+        self,
+        user_id: int,
+        include_deleted: bool,
+        etag: str,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> bytes:
+        """Get the serialized audio listing of a user, using the listing cache.
+
+        The ETag from `get_user_audio_version` is part of the cache key,
+        so a listing changed by another worker process is loaded again.
+        With `fields`, only those columns are selected and serialized.
+
+        Args:
+            user_id (int): ID of the user whose audio files to retrieve
+            include_deleted (bool): Whether to include deleted files
+            etag (str): Current ETag of the listing
+            fields (tuple[str, ...], optional): AudioFullInfo fields to return.
+                Defaults to all.
+
+        Returns:
+            bytes: JSON list of audio files
+        """
+        variant = (include_deleted, fields, etag)
+        body = listing_cache.get(user_id, variant)
+        if body is not None:
+            return body
+
+        if fields is None:
+            audio_files = await self.get_user_audio(
+                user_id=user_id, include_deleted=include_deleted, check_user=False
+            )
+            body = render_model_json(audio_files, List[AudioFullInfo])
+        else:
+            rows = await self._audio_dao.find_listing(
+                user_id=user_id, include_deleted=include_deleted, fields=fields
+            )
+            body = orjson.dumps(rows)
+        listing_cache.put(user_id, variant, body)
+        return body
+
+    async def export_audio_records(
+        self,
+        user_id: Optional[int] = None,
+        is_deleted: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        fields: Optional[tuple[str, ...]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream audio records as newline-delimited JSON.
+
+        Uses its own database session, since the request session is closed
+        before a streaming response starts.
+
+        Args:
+            user_id (int, optional): Only records of this user
+            is_deleted (bool, optional): Only records with this deleted state
+            created_from (datetime, optional): Only records created at or after
+            created_to (datetime, optional): Only records created before
+            fields (tuple[str, ...], optional): Fields of every record.
+                Defaults to all.
+
+        Yields:
+            bytes: NDJSON lines, one batch of records per chunk
+        """
+        async with async_session() as session:
+            batches = AudioDAO(session).stream_records(
+                user_id=user_id,
+                is_deleted=is_deleted,
+                created_from=created_from,
+                created_to=created_to,
+                batch_size=settings.EXPORT_BATCH_SIZE,
+                fields=fields,
+            )
+            async for batch in batches:
+                yield b"".join(orjson.dumps(record) + b"\n" for record in batch)
+
+    @staticmethod
+    def _bulk_results(
+        ids: list[int], processed: list[int], failure: str
+    ) -> list[BulkItemResult]:
+        """Build per-id results of a bulk operation.
+
+        Args:
+            ids (list[int]): Requested IDs
+            processed (list[int]): IDs affected by the operation
+            failure (str): Detail for IDs that were not affected
+
+        Returns:
+            list[BulkItemResult]: Result for every requested ID
+        """
+        processed = set(processed)
+        return [
+            BulkItemResult(id=item_id, success=True)
+            if item_id in processed
+            else BulkItemResult(id=item_id, success=False, detail=failure)
+            for item_id in dict.fromkeys(ids)
+        ]
+
+    async def _delete_files(self, paths: list[str]) -> set[str]:
+        """Delete files concurrently with a bounded limit.
+
+        Args:
+            paths (list[str]): Paths of the files to delete
+
+        Returns:
+            set[str]: Paths that could not be deleted
+        """
+        semaphore = asyncio.Semaphore(settings.BULK_FILE_CONCURRENCY)
+        failed = set()
+
+        async def delete(path: str) -> None:
+            async with semaphore:
+                try:
+                    await self._storage.delete_file(path)
+                except Exception:
+                    failed.add(path)
+
+        await asyncio.gather(*(delete(path) for path in paths))
+        return failed
+
+    async def bulk_set_users_active(
+        self, user_ids: list[int], is_active: bool
+    ) -> list[BulkItemResult]:
+        """Activate or deactivate several users with one statement.
+
+        Args:
+            user_ids (list[int]): IDs of the users
+            is_active (bool): New activity state
+
+        Returns:
+            list[BulkItemResult]: Result for every requested user
+        """
+        updated = await self._user_dao.update_many(
+            user_ids, {"is_active": is_active}, is_active=not is_active
+        )
+        state = "active" if is_active else "inactive"
+        return self._bulk_results(
+            user_ids, updated, f"User not found or already {state}"
+        )
+
+    async def bulk_delete_users(self, user_ids: list[int]) -> list[BulkItemResult]:
+        """Permanently delete several users together with their audio files.
+
+        Args:
+            user_ids (list[int]): IDs of the users
+
+        Returns:
+            list[BulkItemResult]: Result for every requested user
+        """
+        audio = await self._audio_dao.delete_many_with_paths(user_ids=user_ids)
+        deleted = await self._user_dao.delete_many(user_ids)
+        listing_cache.invalidate(*user_ids)
+        file_body_cache.invalidate(*(path for _, path in audio))
+        await self._delete_files([path for _, path in audio])
+        return self._bulk_results(user_ids, deleted, "User not found")
+
+    async def bulk_delete_audio(
+        self, audio_ids: list[int], full_delete: bool = False
+    ) -> list[BulkItemResult]:
+        """Delete or mark as deleted several audio files.
+
+        Args:
+            audio_ids (list[int]): IDs of the audio files
+            full_delete (bool, optional): If True, permanently delete the files.
+                If False, only mark them as deleted. Defaults to False.
+
+        Returns:
+            list[BulkItemResult]: Result for every requested audio file
+        """
+        owner_ids = await self._audio_dao.find_user_ids(audio_ids)
+        if not full_delete:
+            updated = await self._audio_dao.update_many(
+                audio_ids,
+                {"is_deleted": True, "deleted_at": datetime.utcnow()},
+                is_deleted=False,
+            )
+            listing_cache.invalidate(*owner_ids)
+            return self._bulk_results(
+                audio_ids, updated, "Audio not found or already deleted"
+            )
+
+        rows = await self._audio_dao.delete_many_with_paths(ids=audio_ids)
+        if rows:
+            await self._user_dao.update_many(
+                list(owner_ids), {"audio_changed_at": datetime.utcnow()}
+            )
+        listing_cache.invalidate(*owner_ids)
+        file_body_cache.invalidate(*(path for _, path in rows))
+        failed = await self._delete_files([path for _, path in rows])
+        results = {
+            item.id: item
+            for item in self._bulk_results(
+                audio_ids, [audio_id for audio_id, _ in rows], "Audio not found"
+            )
+        }
+        for audio_id, path in rows:
+            if path in failed:
+                results[audio_id] = BulkItemResult(
+                    id=audio_id,
+                    success=False,
+                    detail="Record deleted, but the file could not be removed",
+                )
+        return list(results.values())
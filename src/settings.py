@@ -1,3 +1,5 @@
+from typing import Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +17,115 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
     MEDIA_DIR: str
+    MEDIA_SHARD_DEPTH: int = 2
+
+    DB_ECHO: bool = True
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_WARMUP: int = 5
+
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_WRITE_TIMEOUT_SECONDS: float = 30
+
+    DATABASE_SHARDS: dict[str, str] = {}
+    SHARD_PLACEMENT: list[str] = ["default"]
+    SHARD_MAP_CACHE_SECONDS: float = 30
+    SHARD_MOVE_BATCH_SIZE: int = 1000
+
+    INSERT_BATCH_ENABLED: bool = False
+    INSERT_BATCH_WINDOW_SECONDS: float = 0.005
+    INSERT_BATCH_MAX_SIZE: int = 100
+
+    SERVER_MODE: str = "development"
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_TIMEOUT: int = 15
+    SERVER_ACCESS_LOG: bool = True
+
+    UPLOAD_MAX_CONCURRENT: int = 16
+    UPLOAD_MAX_BYTES_IN_FLIGHT: int = 512 * 1024 * 1024
+    UPLOAD_RETRY_AFTER_SECONDS: int = 5
+    UPLOAD_USER_BURST: int = 10
+    UPLOAD_USER_RATE_PER_SECOND: float = 0.5
+    UPLOAD_USER_BYTES_BURST: int = 500 * 1024 * 1024
+    UPLOAD_USER_BYTES_PER_SECOND: int = 5 * 1024 * 1024
+    SHUTDOWN_TIMEOUT_SECONDS: int = 30
+    PARTIAL_FILE_MAX_AGE_SECONDS: int = 3600
+
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    HEALTH_MIN_FREE_BYTES: int = 1024 * 1024 * 1024
+    HEALTH_MIN_FREE_RATIO: float = 0.05
+    HEALTH_POOL_SATURATION: float = 1.0
+
+    RETENTION_DAYS: int = 30
+    SWEEPER_ENABLED: bool = True
+    SWEEPER_INTERVAL_SECONDS: int = 3600
+    SWEEPER_BATCH_SIZE: int = 500
+    SWEEPER_PAUSE_SECONDS: float = 0.5
+    SWEEPER_ORPHAN_GRACE_SECONDS: int = 3600
+    SWEEPER_DELETE_ORPHANS: bool = False
+
+    COLD_MEDIA_DIR: Optional[str] = None
+    TIER_DEMOTE_AFTER_DAYS: int = 7
+    TIER_INTERVAL_SECONDS: int = 3600
+    TIER_BATCH_SIZE: int = 100
+    TIER_PAUSE_SECONDS: float = 0.5
+    TIER_PROMOTION_RETRY_SECONDS: float = 300
+    ACCESS_FLUSH_INTERVAL_SECONDS: float = 30
+
+    LISTING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    FILE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    FILE_CACHE_MAX_ENTRY_BYTES: int = 20 * 1024 * 1024
+    FILE_CACHE_MIN_REQUESTS: int = 2
+
+    FILE_DELIVERY_MODE: Literal["app", "x-accel-redirect", "x-sendfile"] = "app"
+    FILE_DELIVERY_INTERNAL_PREFIX: str = "/protected/"
+    SIGNED_URL_SECRET: Optional[str] = None
+    SIGNED_URL_TTL_SECONDS: int = 300
+    SIGNED_URL_BASE: str = ""
+    DIRECT_UPLOAD_TTL_SECONDS: int = 900
+
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_KEEPALIVE_SECONDS: float = 15
+    EVENTS_CLIENT_RETRY_MS: int = 3000
+    EVENTS_RECONNECT_SECONDS: float = 5
+    UPLOAD_PROGRESS_INTERVAL_SECONDS: float = 0.5
+
+    BULK_FILE_CONCURRENCY: int = 16
+    EXPORT_BATCH_SIZE: int = 1000
+
+    FINGERPRINT_ENABLED: bool = True
+    FINGERPRINT_WORKERS: int = 2
+    FINGERPRINT_MAX_SECONDS: float = 120
+    FINGERPRINT_SIMILARITY_THRESHOLD: float = 0.7
+    FINGERPRINT_MIN_HASH_MATCHES: int = 3
+    FINGERPRINT_DURATION_TOLERANCE: float = 1.0
+
+    JOB_WORKER_IN_APP: bool = False
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 300
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5
+    JOB_RETRY_MAX_SECONDS: float = 600
+    JOB_SHUTDOWN_TIMEOUT_SECONDS: float = 30
+
+    DEBUG: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_LOG_TOP: int = 5
+    N_PLUS_ONE_THRESHOLD: int = 5
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_STORED: int = 100
+    PROFILING_SAMPLE_ROUTE: Optional[str] = None
+    PROFILING_SAMPLE_RATE: int = 0
 
     class Config:
         env_file = ".env"
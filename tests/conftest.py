@@ -0,0 +1,144 @@
+import os
+import tempfile
+
+_TMP_DIR = tempfile.mkdtemp(prefix="audio-api-tests-")
+
+os.environ.update(
+    {
+        "ACCESS_SECRET_KEY": "test-access-secret-key-with-32-bytes",
+        "REFRESH_SECRET_KEY": "test-refresh-secret-key-with-32-bytes",
+        "ALGORITHM": "HS256",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+        "REFRESH_TOKEN_EXPIRE_MINUTES": "60",
+        "YANDEX_CLIENT_ID": "test",
+        "YANDEX_CLIENT_SECRET": "test",
+        "YANDEX_REDIRECT_URL": "http://testserver/api/auth/yandex/callback",
+        "DATABASE_URL": f"sqlite+aiosqlite:///{_TMP_DIR}/test.db",
+        "MEDIA_DIR": os.path.join(_TMP_DIR, "media"),
+        "DB_ECHO": "false",
+    }
+)
+
+import pytest  # noqa: E402
+
+from src.settings import settings  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """Create the tables in the test database and drop them afterwards.
+
+    Yields:
+        AsyncEngine: Engine of the test database
+    """
+    from src.core.db.database import engine
+    from src.models.base import Base
+    import src.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield engine
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.fixture
+def media_dir(tmp_path, monkeypatch) -> str:
+    """Point MEDIA_DIR to an empty temporary directory.
+
+    Returns:
+        str: Path of the media directory
+    """
+    path = tmp_path / "media"
+    path.mkdir()
+    monkeypatch.setattr(settings, "MEDIA_DIR", str(path))
+    return str(path)
+
+
+@pytest.fixture
+def make_user(db):
+    """Create users in the test database.
+
+    Returns:
+        Callable: Coroutine function taking User column values
+    """
+    from src.core.db.database import async_session
+    from src.models import User
+
+    created = 0
+
+    async def make(**values):
+        nonlocal created
+        created += 1
+        values.setdefault("yandex_id", f"yandex-{created}")
+        async with async_session() as session:
+            user = User(**values)
+            session.add(user)
+            await session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+def make_audio(db, media_dir):
+    """Create audio records with files in the test database.
+
+    Returns:
+        Callable: Coroutine function taking the owner and AudioInfo values
+    """
+    from src.core.db.database import async_session
+    from src.models import AudioInfo
+
+    async def make(user, body: bytes = b"ID3audio", **values):
+        filename = values.pop("filename", f"{os.urandom(4).hex()}.mp3")
+        path = os.path.join(media_dir, filename)
+        with open(path, "wb") as f:
+            f.write(body)
+        values.setdefault("user_filename", "song.mp3")
+        async with async_session() as session:
+            audio = AudioInfo(
+                filename=filename,
+                path=path,
+                size=len(body),
+                user_id=user.id,
+                **values,
+            )
+            session.add(audio)
+            await session.commit()
+        return audio
+
+    return make
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP client calling the application in process.
+
+    Yields:
+        httpx.AsyncClient: Client with a `login(user)` helper
+    """
+    import httpx
+
+    from main import app
+    from src.core.cache import listing_cache
+    from src.service.auth.payload import PayloadService
+
+    def login(user) -> None:
+        tokens = PayloadService.generate_tokens(user)
+        http_client.cookies.set("access_token", tokens["access_token"])
+
+    listing_cache.clear()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://testserver"
+    ) as http_client:
+        http_client.login = login
+        yield http_client
@@ -0,0 +1,203 @@
+import math
+
+import pytest
+
+from src.core import admission
+from src.core.admission import (
+    AdmissionRejected,
+    TokenBucket,
+    UploadAdmissionController,
+    UploadAdmissionMiddleware,
+)
+from src.settings import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def controller(monkeypatch, clock) -> UploadAdmissionController:
+    monkeypatch.setattr(settings, "UPLOAD_MAX_CONCURRENT", 2)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_BYTES_IN_FLIGHT", 100)
+    monkeypatch.setattr(settings, "UPLOAD_USER_BURST", 3)
+    monkeypatch.setattr(settings, "UPLOAD_USER_RATE_PER_SECOND", 1.0)
+    monkeypatch.setattr(settings, "UPLOAD_USER_BYTES_BURST", 1000)
+    monkeypatch.setattr(settings, "UPLOAD_USER_BYTES_PER_SECOND", 100)
+    return UploadAdmissionController()
+
+
+def test_bucket_starts_full(clock):
+    bucket = TokenBucket(capacity=5, refill_rate=1)
+
+    assert bucket.wait_time(5) == 0
+    assert bucket.is_full
+
+
+def test_bucket_wait_time_is_missing_tokens_over_rate(clock):
+    bucket = TokenBucket(capacity=10, refill_rate=2)
+    bucket.consume(10)
+
+    assert bucket.wait_time(4) == pytest.approx(2.0)
+
+
+def test_bucket_refills_with_time_up_to_capacity(clock):
+    bucket = TokenBucket(capacity=10, refill_rate=2)
+    bucket.consume(10)
+
+    clock.now += 3
+    assert bucket.wait_time(6) == 0
+    assert bucket.tokens == pytest.approx(6)
+
+    clock.now += 100
+    bucket.refill()
+    assert bucket.tokens == 10
+
+
+def test_bucket_clamps_requests_larger_than_capacity(clock):
+    bucket = TokenBucket(capacity=10, refill_rate=1)
+
+    assert bucket.wait_time(50) == 0
+    bucket.consume(50)
+    assert bucket.tokens == 0
+
+
+def test_bucket_without_refill_waits_forever(clock):
+    bucket = TokenBucket(capacity=1, refill_rate=0)
+    bucket.consume(1)
+
+    assert bucket.wait_time(1) == math.inf
+
+
+def test_burst_then_rate_limit(controller, clock):
+    for _ in range(3):
+        controller.acquire("user:1", 10)
+        controller.release(10)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("user:1", 10)
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 1
+
+    controller.acquire("user:2", 10)
+    clock.now += 1
+    controller.acquire("user:1", 10)
+
+
+def test_bytes_rate_limit_reports_wait(controller, clock):
+    controller.acquire("user:1", 900)
+    controller.release(900)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("user:1", 900)
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 8
+
+
+def test_concurrency_limit(controller):
+    controller.acquire("user:1", 1)
+    controller.acquire("user:2", 1)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("user:3", 1)
+    assert rejected.value.status_code == 503
+
+    controller.release(1)
+    controller.acquire("user:3", 1)
+
+
+def test_bytes_in_flight_limit(controller):
+    controller.acquire("user:1", 60)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("user:2", 60)
+    assert rejected.value.status_code == 503
+
+    controller.acquire("user:2", 40)
+    assert controller.bytes_in_flight == 100
+
+
+def test_single_upload_larger_than_bytes_limit_is_admitted(controller):
+    controller.acquire("user:1", 500)
+
+    assert controller.active == 1
+
+
+def test_draining_rejects_uploads(controller):
+    controller.start_draining()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.acquire("user:1", 1)
+    assert rejected.value.status_code == 503
+
+
+async def _call(middleware, content_length: bytes) -> list[dict]:
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/upload",
+        "raw_path": b"/upload",
+        "query_string": b"",
+        "headers": [(b"content-length", content_length)],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+        "scheme": "http",
+        "root_path": "",
+        "http_version": "1.1",
+    }
+    await middleware(scope, receive, send)
+    return sent
+
+
+@pytest.fixture
+def middleware(controller):
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(controller.bytes_in_flight)
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = UploadAdmissionMiddleware(app, {"/upload"}, max_size=1000)
+    middleware.controller = controller
+    middleware.seen = seen
+    return middleware
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("content_length", [b"abc", b"-5", b"1.5"])
+async def test_invalid_content_length_is_rejected(middleware, content_length):
+    sent = await _call(middleware, content_length)
+
+    assert sent[0]["status"] == 400
+    assert middleware.seen == []
+    assert middleware.controller.active == 0
+
+
+@pytest.mark.anyio
+async def test_admitted_upload_is_released(middleware):
+    sent = await _call(middleware, b"10")
+
+    assert sent[0]["status"] == 201
+    assert middleware.seen == [10]
+    assert middleware.controller.active == 0
+    assert middleware.controller.bytes_in_flight == 0
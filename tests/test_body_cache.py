@@ -0,0 +1,131 @@
+import pytest
+
+from src.core.responses import MemoryFileResponse
+from src.service.audio.body_cache import FileBodyCache
+
+BODY = bytes(range(100))
+ETAG = '"v1"'
+
+
+class FakeStorage:
+    def __init__(self):
+        self.reads = []
+
+    async def read_file(self, path: str, chunk_size: int):
+        self.reads.append(path)
+        yield path.encode()
+
+
+@pytest.fixture
+def cache(monkeypatch) -> FileBodyCache:
+    monkeypatch.setattr(FileBodyCache, "MAX_TRACKED_FILES", 3)
+    return FileBodyCache(max_bytes=1000, max_entry_bytes=100, min_requests=2)
+
+
+@pytest.mark.anyio
+async def test_file_is_cached_after_min_requests(cache):
+    storage = FakeStorage()
+
+    assert await cache.get(storage, "a", 1) is None
+    assert await cache.get(storage, "a", 1) == b"a"
+    assert await cache.get(storage, "a", 1) == b"a"
+    assert storage.reads == ["a"]
+
+
+@pytest.mark.anyio
+async def test_large_files_are_never_cached(cache):
+    storage = FakeStorage()
+
+    for _ in range(3):
+        assert await cache.get(storage, "big", 101) is None
+    assert storage.reads == []
+
+
+@pytest.mark.anyio
+async def test_tracking_new_files_keeps_recent_counts(cache):
+    storage = FakeStorage()
+    await cache.get(storage, "hot", 1)
+    for path in ("b", "c"):
+        await cache.get(storage, path, 1)
+    await cache.get(storage, "d", 1)
+
+    assert list(cache._requests) == ["b", "c", "d"]
+    assert await cache.get(storage, "d", 1) == b"d"
+
+
+@pytest.mark.anyio
+async def test_recently_requested_file_keeps_its_count(monkeypatch):
+    monkeypatch.setattr(FileBodyCache, "MAX_TRACKED_FILES", 3)
+    cache = FileBodyCache(max_bytes=1000, max_entry_bytes=100, min_requests=3)
+    storage = FakeStorage()
+    for path in ("hot", "b", "c", "hot", "d"):
+        assert await cache.get(storage, path, 1) is None
+
+    assert list(cache._requests) == ["c", "hot", "d"]
+    assert await cache.get(storage, "hot", 1) == b"hot"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=90-200", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=-200", (0, 99)),
+        ("BYTES = 5-5", (5, 5)),
+        ("bytes=100-", ()),
+        ("bytes=10-5", ()),
+        ("bytes=-0", ()),
+        ("bytes=0-1,5-6", None),
+        ("items=0-9", None),
+        ("bytes=-", None),
+        ("bytes=a-b", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert MemoryFileResponse.parse_range(header, len(BODY)) == expected
+
+
+def test_whole_body_without_range():
+    response = MemoryFileResponse(BODY, None, "song.mp3", {"ETag": ETAG})
+
+    assert response.status_code == 200
+    assert response.body == BODY
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-type"] == "audio/mpeg"
+
+
+def test_partial_body():
+    response = MemoryFileResponse(BODY, "bytes=10-19", "song.mp3", {"ETag": ETAG})
+
+    assert response.status_code == 206
+    assert response.body == BODY[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+    assert response.headers["content-length"] == "10"
+
+
+def test_unsatisfiable_range():
+    response = MemoryFileResponse(BODY, "bytes=500-", "song.mp3", {"ETag": ETAG})
+
+    assert response.status_code == 416
+    assert response.body == b""
+    assert response.headers["content-range"] == "bytes */100"
+
+
+def test_matching_if_range_serves_the_range():
+    response = MemoryFileResponse(
+        BODY, "bytes=0-9", "song.mp3", {"ETag": ETAG}, if_range=ETAG
+    )
+
+    assert response.status_code == 206
+
+
+@pytest.mark.parametrize("if_range", ['"v0"', "Wed, 01 May 2024 12:30:15 GMT"])
+def test_stale_if_range_serves_the_whole_body(if_range):
+    response = MemoryFileResponse(
+        BODY, "bytes=0-9", "song.mp3", {"ETag": ETAG}, if_range=if_range
+    )
+
+    assert response.status_code == 200
+    assert response.body == BODY
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+from starlette.requests import Request
+
+from src.core.conditional import is_not_modified, make_etag, validator_headers
+
+MODIFIED = datetime(2024, 5, 1, 12, 30, 15, 250000)
+MODIFIED_HTTP = "Wed, 01 May 2024 12:30:15 GMT"
+
+
+def _request(**headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_etag_is_quoted_and_depends_on_every_part():
+    etag = make_etag("audio", 1, 3)
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("audio", 1, 3)
+    assert etag != make_etag("audio", 1, 4)
+
+
+def test_validator_headers_format_last_modified_as_http_date():
+    headers = validator_headers('"abc"', MODIFIED)
+
+    assert headers == {"ETag": '"abc"', "Last-Modified": MODIFIED_HTTP}
+    assert validator_headers('"abc"', None) == {"ETag": '"abc"'}
+
+
+@pytest.mark.parametrize(
+    "if_none_match, expected",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"old", "abc"', True),
+        ("*", True),
+        ('"old"', False),
+    ],
+)
+def test_if_none_match(if_none_match, expected):
+    request = _request(if_none_match=if_none_match)
+
+    assert is_not_modified(request, '"abc"', MODIFIED) is expected
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = _request(if_none_match='"old"', if_modified_since=MODIFIED_HTTP)
+
+    assert not is_not_modified(request, '"abc"', MODIFIED)
+
+
+@pytest.mark.parametrize(
+    "since, expected",
+    [
+        (MODIFIED_HTTP, True),
+        ("Wed, 01 May 2024 12:30:16 GMT", True),
+        ("Wed, 01 May 2024 12:30:14 GMT", False),
+        ("not a date", False),
+    ],
+)
+def test_if_modified_since(since, expected):
+    request = _request(if_modified_since=since)
+
+    assert is_not_modified(request, '"abc"', MODIFIED) is expected
+
+
+def test_without_validators_the_resource_is_modified():
+    assert not is_not_modified(_request(), '"abc"', MODIFIED)
+    assert not is_not_modified(
+        _request(if_modified_since=MODIFIED_HTTP), '"abc"', None
+    )
+
+
+@pytest.mark.anyio
+class TestAudioListing:
+    CREATED = datetime.utcnow() - timedelta(days=30)
+
+    @pytest.fixture
+    async def owner(self, client, make_user, make_audio):
+        admin = await make_user(is_supervisor=True)
+        owner = await make_user()
+        self.audio = [
+            await make_audio(owner, created_at=self.CREATED, updated_at=self.CREATED)
+            for _ in range(2)
+        ]
+        client.login(admin)
+        return owner
+
+    async def _get(self, client, owner, **headers):
+        return await client.get(
+            f"/api/supervisor/{owner.id}/audio",
+            headers={name.replace("_", "-"): value for name, value in headers.items()},
+        )
+
+    async def test_unchanged_listing_is_not_modified(self, client, owner):
+        response = await self._get(client, owner)
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+        etag = response.headers["etag"]
+        last_modified = response.headers["last-modified"]
+        assert (await self._get(client, owner, if_none_match=etag)).status_code == 304
+        assert (
+            await self._get(client, owner, if_modified_since=last_modified)
+        ).status_code == 304
+
+    @pytest.mark.parametrize("full_delete", [False, True])
+    async def test_delete_moves_last_modified_forward(
+        self, client, owner, full_delete
+    ):
+        last_modified = (await self._get(client, owner)).headers["last-modified"]
+
+        client.login(owner)
+        response = await client.delete(
+            "/api/user/delete-audio/",
+            params={"audio_id": self.audio[0].id, "full_delete": full_delete},
+        )
+        assert response.status_code == 200
+
+        client.login(await self._admin())
+        response = await self._get(client, owner, if_modified_since=last_modified)
+        assert response.status_code == 200
+        assert [item["audio_id"] for item in response.json()] == [self.audio[1].id]
+        assert response.headers["last-modified"] != last_modified
+
+    async def _admin(self):
+        from src.core.db.database import async_session
+        from src.crud import UserDAO
+
+        async with async_session() as session:
+            return await UserDAO(session).find_one(is_supervisor=True)
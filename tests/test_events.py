@@ -0,0 +1,28 @@
+import pytest
+
+from src.core.events import EventBroker
+from src.settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_stream_starts_with_configured_retry(monkeypatch):
+    monkeypatch.setattr(settings, "EVENTS_CLIENT_RETRY_MS", 1500)
+    stream = EventBroker(queue_size=10).stream(user_id=1)
+
+    assert await stream.__anext__() == b"retry: 1500\n\n"
+    await stream.aclose()
+
+
+async def test_stream_delivers_published_events():
+    broker = EventBroker(queue_size=10)
+    stream = broker.stream(user_id=1)
+    await stream.__anext__()
+
+    broker.deliver(1, "upload.completed", {"audio_id": 5})
+    broker.deliver(2, "upload.completed", {"audio_id": 6})
+
+    assert await stream.__anext__() == (
+        b'event: upload.completed\ndata: {"audio_id":5}\n\n'
+    )
+    await stream.aclose()
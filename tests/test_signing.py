@@ -0,0 +1,136 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from src.core.signing import sign_url, verify_url
+from src.settings import settings
+
+URI = "/api/media/ab/cd/file.mp3"
+EXPIRES = 2_000_000_000
+
+
+@pytest.fixture(autouse=True)
+def secret(monkeypatch):
+    monkeypatch.setattr(settings, "SIGNED_URL_SECRET", "test-signing-secret")
+    monkeypatch.setattr(settings, "SIGNED_URL_BASE", "")
+
+
+def test_valid_url_is_accepted():
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+
+    assert verify_url(URI, EXPIRES, signature, "song.mp3", now=EXPIRES - 1)
+    assert verify_url(URI, EXPIRES, signature, "song.mp3", now=EXPIRES)
+
+
+def test_signature_is_unpadded_urlsafe_base64():
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+
+    assert len(signature) == 43
+    assert not set(signature) & set("+/=")
+
+
+def test_expired_url_is_rejected():
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+
+    assert not verify_url(URI, EXPIRES, signature, "song.mp3", now=EXPIRES + 1)
+
+
+def test_extended_expiry_is_rejected():
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+
+    assert not verify_url(URI, EXPIRES + 3600, signature, "song.mp3", now=EXPIRES)
+
+
+@pytest.mark.parametrize(
+    "uri, values",
+    [
+        (URI, ("other.mp3",)),
+        (URI, ()),
+        (URI, ("song.mp3", "extra")),
+        ("/api/media/ab/cd/other.mp3", ("song.mp3",)),
+    ],
+)
+def test_tampered_url_is_rejected(uri, values):
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+
+    assert not verify_url(uri, EXPIRES, signature, *values, now=EXPIRES - 1)
+
+
+def test_tampered_size_is_rejected():
+    uri = "/api/uploads/1/upload.mp3"
+    signature = sign_url(uri, EXPIRES, "1000")
+
+    assert not verify_url(uri, EXPIRES, signature, "1000000", now=EXPIRES - 1)
+
+
+@pytest.mark.parametrize("signature", ["", "x" * 43, "ä" * 43])
+def test_wrong_signature_is_rejected(signature):
+    assert not verify_url(URI, EXPIRES, signature, "song.mp3", now=EXPIRES - 1)
+
+
+def test_signature_depends_on_the_secret(monkeypatch):
+    signature = sign_url(URI, EXPIRES, "song.mp3")
+    monkeypatch.setattr(settings, "SIGNED_URL_SECRET", "another-secret")
+
+    assert not verify_url(URI, EXPIRES, signature, "song.mp3", now=EXPIRES - 1)
+
+
+@pytest.mark.anyio
+class TestSignedEndpoints:
+    @pytest.fixture
+    async def owner(self, client, make_user):
+        owner = await make_user()
+        client.login(owner)
+        return owner
+
+    async def test_media_url(self, client, owner, make_audio):
+        audio = await make_audio(owner, body=b"ID3signed")
+        response = await client.get(
+            "/api/user/audio-url/", params={"audio_id": audio.id}
+        )
+        assert response.status_code == 200
+        url = urlsplit(response.json()["url"])
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        client.cookies.clear()
+
+        response = await client.get(url.path, params=query)
+        assert response.status_code == 200
+        assert response.content == b"ID3signed"
+
+        for name, value in (
+            ("name", "other.mp3"),
+            ("signature", "x" + query["signature"][1:]),
+            ("expires", str(int(query["expires"]) + 60)),
+        ):
+            response = await client.get(url.path, params={**query, name: value})
+            assert response.status_code == 403, name
+
+        response = await client.get(
+            url.path, params={**query, "expires": int(time.time()) - 1}
+        )
+        assert response.status_code == 403
+
+    async def test_upload_url(self, client, owner):
+        response = await client.post(
+            "/api/user/upload-slots/",
+            json={"filename": "song.mp3", "content_type": "audio/mpeg", "size": 4},
+        )
+        assert response.status_code == 200
+        url = urlsplit(response.json()["url"])
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        client.cookies.clear()
+
+        response = await client.put(
+            url.path, params={**query, "size": 10**9}, content=b"ID3!"
+        )
+        assert response.status_code == 403
+        response = await client.put(
+            url.path.replace(f"/{owner.id}/", f"/{owner.id + 1}/"),
+            params=query,
+            content=b"ID3!",
+        )
+        assert response.status_code == 403
+
+        response = await client.put(url.path, params=query, content=b"ID3!")
+        assert response.status_code == 201
@@ -0,0 +1,41 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def users(client, make_user):
+    admin = await make_user(is_supervisor=True)
+    user = await make_user(first_name="Ada", last_name="Lovelace", email="ada@x.org")
+    client.login(admin)
+    return admin, user
+
+
+async def test_user_info(client, users):
+    _, user = users
+
+    response = await client.get(f"/api/supervisor/{user.id}")
+
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Ada"
+    assert response.json()["email"] == "ada@x.org"
+
+
+async def test_user_info_with_fields(client, users):
+    _, user = users
+
+    response = await client.get(
+        f"/api/supervisor/{user.id}", params={"fields": "first_name,email"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"first_name": "Ada", "email": "ada@x.org"}
+
+
+async def test_user_info_schema_is_documented(client):
+    schema = (await client.get("/openapi.json")).json()
+
+    content = schema["paths"]["/api/supervisor/{user_id}"]["get"]["responses"]["200"]
+    assert content["content"]["application/json"]["schema"] == {
+        "$ref": "#/components/schemas/UserInfo"
+    }
@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+from src.core.db.database import async_session
+from src.models import AudioInfo, User
+from src.service.audio.sweeper import RetentionSweeper
+from src.settings import settings
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sweeper(monkeypatch, media_dir) -> RetentionSweeper:
+    monkeypatch.setattr(settings, "COLD_MEDIA_DIR", None)
+    monkeypatch.setattr(settings, "SWEEPER_ORPHAN_GRACE_SECONDS", -60)
+    sweeper = RetentionSweeper()
+    sweeper._batch_size = 2
+    sweeper._pause = 0
+    return sweeper
+
+
+def _create_file(media_dir: str, name: str) -> str:
+    path = os.path.join(media_dir, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"ID3")
+    return path
+
+
+async def _add_record(path: str) -> None:
+    async with async_session() as session:
+        user = User(yandex_id="1")
+        session.add(user)
+        await session.flush()
+        session.add(
+            AudioInfo(
+                filename=os.path.basename(path),
+                user_filename="song",
+                path=path,
+                size=3,
+                user_id=user.id,
+            )
+        )
+        await session.commit()
+
+
+async def test_files_without_records_are_orphans(
+    db, sweeper, media_dir, monkeypatch
+):
+    orphan = _create_file(media_dir, "aa/orphan.mp3")
+    known = _create_file(media_dir, "bb/known.mp3")
+    await _add_record(known)
+
+    assert await sweeper.find_orphan_files() == [orphan]
+
+    monkeypatch.setattr(settings, "SWEEPER_ORPHAN_GRACE_SECONDS", 3600)
+    assert await sweeper.find_orphan_files() == []
+
+
+async def test_file_that_gains_its_row_before_delete_is_kept(db, sweeper, media_dir):
+    moved = _create_file(media_dir, "cold/moved.mp3")
+    orphan = _create_file(media_dir, "aa/orphan.mp3")
+    orphans = await sweeper.find_orphan_files()
+    assert sorted(orphans) == sorted([moved, orphan])
+
+    await _add_record(moved)
+    deleted = await sweeper.delete_orphan_files(orphans)
+
+    assert deleted == 1
+    assert os.path.exists(moved)
+    assert not os.path.exists(orphan)
+
+
+async def test_file_changed_after_scan_is_kept(db, sweeper, media_dir, monkeypatch):
+    linked = _create_file(media_dir, "aa/linked.mp3")
+    orphans = await sweeper.find_orphan_files()
+    assert orphans == [linked]
+
+    monkeypatch.setattr(settings, "SWEEPER_ORPHAN_GRACE_SECONDS", 3600)
+    deleted = await sweeper.delete_orphan_files(orphans)
+
+    assert deleted == 0
+    assert os.path.exists(linked)
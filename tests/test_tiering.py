@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.service.audio import tiering
+from src.service.audio.audio import AudioService
+from src.service.audio.tiering import TierManager
+from src.settings import settings
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeJobDAO:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.jobs = []
+
+    async def enqueue(self, kind: str, payload: dict, max_attempts: int) -> None:
+        if self.fail:
+            raise RuntimeError("database is down")
+        self.jobs.append((kind, payload))
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(tiering.time, "monotonic", fake)
+    monkeypatch.setattr(settings, "TIER_PROMOTION_RETRY_SECONDS", 60)
+    return fake
+
+
+@pytest.fixture
+def manager(monkeypatch) -> TierManager:
+    manager = TierManager()
+    monkeypatch.setattr(tiering, "tier_manager", manager)
+    monkeypatch.setattr("src.service.audio.audio.tier_manager", manager)
+    return manager
+
+
+def test_promotion_is_claimed_once_per_retry_interval(clock, manager):
+    assert manager.claim_promotion(1)
+    assert not manager.claim_promotion(1)
+    assert manager.claim_promotion(2)
+
+    clock.now += 61
+    assert manager.claim_promotion(1)
+
+
+def test_promotion_claims_are_bounded(clock, manager, monkeypatch):
+    monkeypatch.setattr(TierManager, "MAX_PENDING_PROMOTIONS", 2)
+    for audio_id in range(5):
+        assert manager.claim_promotion(audio_id)
+
+    assert list(manager._promotions) == [3, 4]
+
+
+@pytest.mark.anyio
+async def test_repeated_cold_downloads_queue_one_promotion(clock, manager):
+    job_dao = FakeJobDAO()
+    service = AudioService(audio_dao=None, storage=None, job_dao=job_dao)
+    cold = SimpleNamespace(id=7, tier="cold")
+    hot = SimpleNamespace(id=8, tier="hot")
+
+    for _ in range(3):
+        await service.request_promotion(cold)
+        await service.request_promotion(hot)
+
+    assert job_dao.jobs == [("promote_audio", {"audio_id": 7})]
+
+
+@pytest.mark.anyio
+async def test_failed_enqueue_releases_the_claim(clock, manager):
+    service = AudioService(audio_dao=None, storage=None, job_dao=FakeJobDAO(fail=True))
+    cold = SimpleNamespace(id=7, tier="cold")
+
+    with pytest.raises(RuntimeError):
+        await service.request_promotion(cold)
+    assert manager.claim_promotion(7)
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import signal
+from contextlib import suppress
+
+from src.core.db.database import engine
+from src.core.db.shards import shard_router
+from src.service.audio.duplicates import duplicate_detector
+from src.service.jobs import job_worker
+
+
+async def run_worker():
+    """Run the background job worker until SIGINT or SIGTERM.
+
+    On a signal the worker stops claiming jobs and waits for running ones
+    to finish before exiting.
+    """
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with suppress(NotImplementedError):
+            loop.add_signal_handler(sig, job_worker.stop)
+
+    try:
+        await job_worker.run_forever()
+    finally:
+        duplicate_detector.shutdown()
+        await shard_router.dispose()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    asyncio.run(run_worker())